@@ -0,0 +1,146 @@
+"""Benchmark JSON codecs on large RPC and Birdeye payloads.
+
+Usage:
+    python scripts/bench_json_decode.py [--payloads DIR] [--rounds N]
+
+DIR should contain recorded response bodies named after the payload kind
+(signatures*.json, transactions*.json, birdeye_txs*.json). Without it,
+payloads with the same shape and size as live responses are synthesized.
+"""
+import argparse
+import json
+import random
+import string
+import sys
+import time
+from pathlib import Path
+from typing import Callable, Dict, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from data.decoders import decode_signatures, decode_rpc_batch, decode_birdeye_transactions
+from utils.json_codec import CODEC_FACTORIES, load_codec, set_codec
+
+BASE58 = "".join(c for c in string.ascii_letters + string.digits if c not in "0OIl")
+
+def _b58(length: int) -> str:
+    return "".join(random.choice(BASE58) for _ in range(length))
+
+def synthesize_payloads() -> Dict[str, List[bytes]]:
+    """Build bodies shaped like getSignaturesForAddress(limit=1000), a 100-tx getTransaction batch and Birdeye txs"""
+    random.seed(7)
+    signatures = {
+        "jsonrpc": "2.0",
+        "id": 1,
+        "result": [
+            {
+                "signature": _b58(88),
+                "slot": 250000000 + i,
+                "err": None,
+                "memo": None,
+                "blockTime": 1700000000 + i,
+                "confirmationStatus": "finalized"
+            }
+            for i in range(1000)
+        ]
+    }
+    transactions = [
+        {
+            "jsonrpc": "2.0",
+            "id": i,
+            "result": {
+                "slot": 250000000 + i,
+                "blockTime": 1700000000 + i,
+                "meta": {
+                    "fee": 5000,
+                    "preBalances": [random.randint(0, 10**12) for _ in range(12)],
+                    "postBalances": [random.randint(0, 10**12) for _ in range(12)],
+                    "logMessages": [f"Program {_b58(44)} invoke [1]" for _ in range(20)],
+                    "err": None
+                },
+                "transaction": {
+                    "signatures": [_b58(88)],
+                    "message": {
+                        "accountKeys": [_b58(44) for _ in range(12)],
+                        "recentBlockhash": _b58(44),
+                        "instructions": [
+                            {"programIdIndex": 3, "accounts": [0, 1, 2], "data": _b58(64)}
+                            for _ in range(4)
+                        ]
+                    }
+                }
+            }
+        }
+        for i in range(100)
+    ]
+    birdeye_txs = {
+        "success": True,
+        "data": {
+            "items": [
+                {
+                    "txHash": _b58(88),
+                    "blockUnixTime": 1700000000 + i,
+                    "owner": _b58(44),
+                    "side": random.choice(["buy", "sell"]),
+                    "source": "raydium",
+                    "from": {"symbol": "SOL", "address": _b58(44), "uiAmount": random.random() * 10},
+                    "to": {"symbol": "TKN", "address": _b58(44), "uiAmount": random.random() * 1e6}
+                }
+                for i in range(100)
+            ]
+        }
+    }
+    return {
+        "signatures": [json.dumps(signatures).encode()],
+        "transactions": [json.dumps(transactions).encode()],
+        "birdeye_txs": [json.dumps(birdeye_txs).encode()]
+    }
+
+def load_payloads(directory: Path) -> Dict[str, List[bytes]]:
+    payloads: Dict[str, List[bytes]] = {"signatures": [], "transactions": [], "birdeye_txs": []}
+    for kind in payloads:
+        for path in sorted(directory.glob(f"{kind}*.json")):
+            payloads[kind].append(path.read_bytes())
+    return payloads
+
+DECODERS: Dict[str, Callable] = {
+    "signatures": decode_signatures,
+    "transactions": decode_rpc_batch,
+    "birdeye_txs": decode_birdeye_transactions
+}
+
+def bench(fn: Callable, bodies: List[bytes], rounds: int) -> float:
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for body in bodies:
+            fn(body)
+    return (time.perf_counter() - start) / (rounds * len(bodies))
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--payloads", type=Path, help="directory of recorded response bodies")
+    parser.add_argument("--rounds", type=int, default=50)
+    args = parser.parse_args()
+
+    payloads = load_payloads(args.payloads) if args.payloads else synthesize_payloads()
+
+    available = []
+    for name in CODEC_FACTORIES:
+        try:
+            load_codec(name)
+            available.append(name)
+        except ImportError:
+            print(f"{name:8s} not installed, skipping")
+
+    for kind, bodies in payloads.items():
+        if not bodies:
+            continue
+        size = sum(len(body) for body in bodies) / len(bodies)
+        print(f"\n{kind} ({len(bodies)} payloads, avg {size / 1024:.0f} KiB)")
+        for name in available:
+            set_codec(name)
+            seconds = bench(DECODERS[kind], bodies, args.rounds)
+            print(f"  {name:8s} {seconds * 1000:8.3f} ms/payload  {size / seconds / 2**20:8.1f} MiB/s")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""Compare sentiment backends for accuracy and throughput on a labelled corpus.
+
+Usage:
+    python scripts/compare_sentiment_backends.py [--corpus FILE] [--backends textblob,lexicon]
+        [--neutral-band 0.1] [--repeat N]
+
+FILE is JSON lines of {"text": ..., "label": -1|0|1}; it defaults to the
+fixture corpus in tests/fixtures. A polarity within the neutral band counts
+as label 0. Throughput is measured over the corpus repeated N times, in
+one batch per backend, as TextScorer would hand it over.
+"""
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "src"))
+
+from agents.sentiment_agent import SENTIMENT_BACKENDS, make_backend
+
+def load_corpus(path: Path) -> List[Dict]:
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+def label(polarity: float, neutral_band: float) -> int:
+    if polarity >= neutral_band:
+        return 1
+    if polarity <= -neutral_band:
+        return -1
+    return 0
+
+def evaluate(name: str, corpus: List[Dict], neutral_band: float, repeat: int) -> Dict:
+    backend = make_backend(name)
+    texts = [row["text"] for row in corpus]
+
+    # The first call also pays for imports and lazy initialization
+    start = time.perf_counter()
+    scores = backend.score_batch(texts)
+    first_call = time.perf_counter() - start
+
+    start = time.perf_counter()
+    backend.score_batch(texts * repeat)
+    elapsed = time.perf_counter() - start
+
+    predicted = [label(polarity, neutral_band) for polarity, _ in scores]
+    per_label = {}
+    for value in (-1, 0, 1):
+        rows = [i for i, row in enumerate(corpus) if row["label"] == value]
+        per_label[str(value)] = sum(predicted[i] == value for i in rows) / len(rows) if rows else None
+    return {
+        "backend": name,
+        "texts": len(corpus),
+        "accuracy": sum(p == row["label"] for p, row in zip(predicted, corpus)) / len(corpus),
+        "accuracy_by_label": per_label,
+        "first_call_seconds": round(first_call, 4),
+        "texts_per_second": round(len(texts) * repeat / elapsed) if elapsed else None
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--corpus", type=Path, default=ROOT / "tests" / "fixtures" / "sentiment_corpus.jsonl")
+    parser.add_argument("--backends", default=",".join(SENTIMENT_BACKENDS))
+    parser.add_argument("--neutral-band", type=float, default=0.1)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    corpus = load_corpus(args.corpus)
+    for name in args.backends.split(","):
+        print(json.dumps(evaluate(name, corpus, args.neutral_band, args.repeat)))
+
+if __name__ == "__main__":
+    main()
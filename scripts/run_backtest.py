@@ -0,0 +1,80 @@
+"""Backtest risk scoring settings against stored candles and transactions.
+
+Usage:
+    python scripts/run_backtest.py [--candles DIR] [--transactions DIR]
+        [--sentiment DIR] [--window N] [--horizon N] [--step N] [--workers N]
+        [--thresholds 60,70,80] [--min-confidence 0,0.6]
+        [--weights 1:1:1,0.3:0.4:0.3] [--buy-sentiment 0.5]
+
+Every stored token is replayed once through the live analyzers in a process
+pool, then each combination of threshold, min confidence and
+transaction:chart:sentiment weights is scored over all samples. Sentiment
+replays from the history the agent records as it applies scores; samples
+without recent stored sentiment replay as neutral and cannot pass the
+--buy-sentiment gate.
+"""
+import argparse
+import itertools
+import json
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from agents.backtester import Backtester, BacktestConfig
+
+def _floats(value: str):
+    return [float(item) for item in value.split(",") if item]
+
+def _weights(value: str):
+    return [tuple(float(part) for part in item.split(":")) for item in value.split(",") if item]
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--candles", default="data/candles")
+    parser.add_argument("--transactions", default="data/transactions")
+    parser.add_argument("--sentiment", default="data/sentiment")
+    parser.add_argument("--interval", default="1H")
+    parser.add_argument("--window", type=int, default=24)
+    parser.add_argument("--horizon", type=int, default=6)
+    parser.add_argument("--step", type=int, default=1)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--thresholds", type=_floats, default=[70])
+    parser.add_argument("--min-confidence", type=_floats, default=[0.0])
+    parser.add_argument("--weights", type=_weights, default=[(1, 1, 1)])
+    parser.add_argument("--buy-sentiment", type=float, default=0.5)
+    args = parser.parse_args()
+
+    backtester = Backtester(BacktestConfig(
+        candle_path=args.candles,
+        transaction_path=args.transactions,
+        sentiment_path=args.sentiment,
+        interval=args.interval,
+        window=args.window,
+        horizon=args.horizon,
+        step=args.step
+    ))
+    samples = backtester.replay(workers=args.workers)
+    token_days = backtester.token_days()
+    minutes = backtester.replay_seconds / 60
+    print(f"Replayed {len(backtester.samples)} tokens, {samples} samples, {token_days:.1f} token-days "
+          f"in {backtester.replay_seconds:.1f}s ({token_days / minutes if minutes else 0:.0f} token-days/min)")
+    if samples and not backtester.sentiment_samples:
+        print(f"No stored sentiment under {args.sentiment}: no sample can be a BUY, so min confidence has no effect")
+
+    grid = [
+        {
+            "risk_threshold": threshold,
+            "min_confidence": min_confidence,
+            "transaction_weight": weights[0],
+            "chart_weight": weights[1],
+            "sentiment_weight": weights[2],
+            "buy_sentiment": args.buy_sentiment
+        }
+        for threshold, min_confidence, weights in itertools.product(args.thresholds, args.min_confidence, args.weights)
+    ]
+    for result in backtester.sweep(grid):
+        print(json.dumps(result))
+
+if __name__ == "__main__":
+    main()
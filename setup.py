@@ -37,6 +37,9 @@ setup(
     packages=find_packages(),
     python_requires='>=3.13',
     install_requires=install_requires,
+    extras_require={
+        "fast": ["orjson>=3.9.0"],
+    },
     classifiers=[
         'Programming Language :: Python :: 3.13',
         'Programming Language :: Python :: 3 :: Only',
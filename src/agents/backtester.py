@@ -0,0 +1,184 @@
+import asyncio
+import logging
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, List, Optional
+import numpy as np
+from models.token import Token
+from analyzers.transaction_analyzer import TransactionAnalyzer
+from analyzers.chart_analyzer import ChartAnalyzer
+from analyzers.risk_scorer import BatchRiskScorer, RiskInputs, SIGNALS, WAIT, BUY, SELL
+from data.candle_store import CandleStore
+from data.transaction_log import TransactionLog, to_records
+from data.sentiment_history import SentimentHistory
+from utils.cache import interval_to_seconds
+
+logger = logging.getLogger(__name__)
+
+@dataclass
+class BacktestConfig:
+    candle_path: str = "data/candles"
+    transaction_path: str = "data/transactions"
+    sentiment_path: str = "data/sentiment"
+    interval: str = "1H"
+    window: int = 24  # candles per analysis, as in TradingAgent.price_window
+    horizon: int = 6  # candles ahead used to judge a signal
+    step: int = 1  # candles between simulated analyses
+    transaction_window: float = 24 * 3600
+    sentiment_max_age: float = 3600  # older stored sentiment replays as neutral
+
+@dataclass
+class TokenSamples:
+    """Analysis inputs and outcomes at every simulated analysis time of one token"""
+    address: str
+    times: np.ndarray
+    inputs: RiskInputs
+    confidence: np.ndarray
+    forward_returns: np.ndarray
+    sentiment_known: int = 0
+
+    def __len__(self) -> int:
+        return len(self.times)
+
+async def _replay_token(address: str, config: BacktestConfig) -> Optional[TokenSamples]:
+    candles = CandleStore(config.candle_path, config.interval).read(address)
+    if len(candles) < config.window + config.horizon:
+        return None
+    rows = TransactionLog(config.transaction_path).since(address, 0)
+    tx_times = np.asarray(rows["timestamp"])
+    transactions = to_records(rows)
+
+    # The agent only sees a token from its first candle or trade
+    first_seen = min(candles.time[0], tx_times[0]) if len(tx_times) else candles.time[0]
+    token = Token(address=address, name=address, creator_address="Unknown")
+    token.creation_time = datetime.fromtimestamp(float(first_seen))
+
+    transaction_analyzer = TransactionAnalyzer()
+    chart_analyzer = ChartAnalyzer(render_images=False)
+    close, volume = np.asarray(candles.close), np.asarray(candles.volume)
+    samples, times, confidence, returns = [], [], [], []
+
+    ends = np.arange(config.window, len(candles) - config.horizon + 1, config.step)
+    # Simulated "now" is the open of candle `end`: everything before it has closed
+    sentiment = SentimentHistory(config.sentiment_path).at(
+        address, np.asarray(candles.time)[ends], config.sentiment_max_age
+    )
+    for step, end in enumerate(ends):
+        now = float(candles.time[end])
+        lo = np.searchsorted(tx_times, now - config.transaction_window, side="left")
+        hi = np.searchsorted(tx_times, now, side="left")
+        if hi > lo:
+            transaction_analysis = await transaction_analyzer.analyze_transactions(token, transactions[lo:hi])
+        else:
+            transaction_analysis = {"sniper_count": 0, "bot_count": 0, "insider_count": 0}
+        chart_analysis = await chart_analyzer.analyze_series(close[end - config.window:end], volume[end - config.window:end])
+
+        samples.append({
+            "sniper_count": transaction_analysis["sniper_count"],
+            "bot_count": transaction_analysis["bot_count"],
+            "insider_count": transaction_analysis["insider_count"],
+            "natural_chart": chart_analysis["natural_chart"],
+            "pump_and_dump": chart_analysis["patterns"].count("pump_and_dump"),
+            "wash_trading": chart_analysis["patterns"].count("wash_trading"),
+            "sentiment": float(sentiment["score"][step])
+        })
+        times.append(now)
+        confidence.append(chart_analysis.get("confidence", 1.0))
+        entry = close[end - 1]
+        returns.append(close[end - 1 + config.horizon] / entry - 1 if entry > 0 else 0.0)
+
+    return TokenSamples(
+        address=address,
+        times=np.array(times),
+        inputs=RiskInputs.from_rows(samples),
+        confidence=np.array(confidence, dtype=float),
+        forward_returns=np.array(returns, dtype=float),
+        sentiment_known=int(sentiment["known"].sum())
+    )
+
+def replay_token(address: str, config: BacktestConfig) -> Optional[TokenSamples]:
+    """Run the live analyzers over one token's stored history (process pool entry point)"""
+    try:
+        return asyncio.run(_replay_token(address, config))
+    except Exception as e:
+        logger.error(f"Backtest replay failed for {address}: {e}", exc_info=True)
+        return None
+
+class Backtester:
+    """Replays stored candles and transactions through the analyzers and scorer
+
+    Replay is the expensive part and runs once per token in a process pool.
+    Scoring is a vectorized pass over every token-step, so many weight and
+    threshold settings can be evaluated against the same replay.
+    """
+
+    def __init__(self, config: BacktestConfig):
+        self.config = config
+        self.samples: List[TokenSamples] = []
+        self.replay_seconds = 0.0
+        self.sentiment_samples = 0
+
+    def replay(self, addresses: Optional[List[str]] = None, workers: Optional[int] = None) -> int:
+        """Replay tokens (all stored ones by default); returns the number of samples"""
+        if addresses is None:
+            addresses = CandleStore(self.config.candle_path, self.config.interval).tokens()
+        start = time.perf_counter()
+        if workers == 1:
+            results = [replay_token(address, self.config) for address in addresses]
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                results = list(pool.map(replay_token, addresses, [self.config] * len(addresses), chunksize=4))
+        self.replay_seconds = time.perf_counter() - start
+        self.samples = [result for result in results if result is not None and len(result)]
+        self.sentiment_samples = sum(samples.sentiment_known for samples in self.samples)
+        if self.samples:
+            self._inputs = RiskInputs.concat([samples.inputs for samples in self.samples])
+            self._confidence = np.concatenate([samples.confidence for samples in self.samples])
+            self._returns = np.concatenate([samples.forward_returns for samples in self.samples])
+        return sum(len(samples) for samples in self.samples)
+
+    def token_days(self) -> float:
+        candles = sum(len(samples) * self.config.step for samples in self.samples)
+        return candles * interval_to_seconds(self.config.interval) / 86400
+
+    def evaluate(self, settings: Dict) -> Dict:
+        """Score every replayed sample under one settings dict and summarize outcomes
+
+        Besides BatchRiskScorer settings, `min_confidence` demotes BUY signals
+        whose chart confidence is below it to WAIT.
+        """
+        if not self.samples:
+            return {"settings": settings, "samples": 0, "signals": {}}
+        settings = dict(settings)
+        min_confidence = settings.pop("min_confidence", 0.0)
+        scorer = BatchRiskScorer({})
+        scorer.update(**settings)
+
+        inputs, returns = self._inputs, self._returns
+        signals = scorer.signals(scorer.score(inputs), inputs)
+        signals[(signals == BUY) & (self._confidence < min_confidence)] = WAIT
+
+        report = {}
+        for code, signal in enumerate(SIGNALS):
+            selected = returns[signals == code]
+            if code == BUY:
+                hits = selected > 0
+            elif code == SELL:
+                hits = selected < 0
+            else:
+                hits = None
+            report[signal.value] = {
+                "count": int(len(selected)),
+                "mean_return": float(selected.mean()) if len(selected) else None,
+                "hit_rate": float(hits.mean()) if hits is not None and len(selected) else None
+            }
+        return {
+            "settings": dict(settings, min_confidence=min_confidence),
+            "samples": int(len(returns)),
+            "signals": report
+        }
+
+    def sweep(self, grid: List[Dict]) -> List[Dict]:
+        return [self.evaluate(settings) for settings in grid]
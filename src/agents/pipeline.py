@@ -0,0 +1,121 @@
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+@dataclass
+class StageMetrics:
+    name: str
+    workers: int
+    processed: int = 0
+    dropped: int = 0
+    errors: int = 0
+    busy_seconds: float = 0.0
+    blocked_seconds: float = 0.0
+    max_queue_depth: int = 0
+
+    def to_dict(self, elapsed: float) -> Dict:
+        return {
+            "workers": self.workers,
+            "processed": self.processed,
+            "dropped": self.dropped,
+            "errors": self.errors,
+            "throughput_per_sec": self.processed / elapsed if elapsed > 0 else 0.0,
+            "utilization": self.busy_seconds / (elapsed * self.workers) if elapsed > 0 else 0.0,
+            "blocked_seconds": round(self.blocked_seconds, 3),
+            "max_queue_depth": self.max_queue_depth
+        }
+
+@dataclass
+class Stage:
+    """One pipeline step: a bounded input queue drained by `workers` tasks
+
+    The handler returns the item for the next stage, or None to drop it.
+    """
+    name: str
+    handler: Callable[[Any], Awaitable[Optional[Any]]]
+    workers: int = 1
+    queue_size: int = 32
+    metrics: StageMetrics = field(init=False)
+
+    def __post_init__(self):
+        self.metrics = StageMetrics(self.name, self.workers)
+
+class Pipeline:
+    """Chain of stages connected by bounded asyncio queues
+
+    A full downstream queue blocks upstream workers (backpressure), so memory
+    stays bounded no matter how many items are fed in.
+    """
+
+    def __init__(self, stages: List[Stage]):
+        self.stages = stages
+        self.last_run: Dict = {}
+
+    async def run(self, items: Iterable[Any]) -> Dict:
+        """Feed items through every stage and wait until all have drained"""
+        queues = [asyncio.Queue(maxsize=stage.queue_size) for stage in self.stages]
+        for stage in self.stages:
+            stage.metrics = StageMetrics(stage.name, stage.workers)
+
+        workers = [
+            asyncio.create_task(self._worker(i, queues))
+            for i, stage in enumerate(self.stages)
+            for _ in range(stage.workers)
+        ]
+        start = time.perf_counter()
+        try:
+            fed = 0
+            for item in items:
+                await queues[0].put(item)
+                fed += 1
+            for queue in queues:
+                await queue.join()
+        finally:
+            for worker in workers:
+                worker.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+
+        elapsed = time.perf_counter() - start
+        self.last_run = {
+            "items": fed,
+            "duration_seconds": round(elapsed, 3),
+            "stages": {stage.name: stage.metrics.to_dict(elapsed) for stage in self.stages}
+        }
+        return self.last_run
+
+    async def _worker(self, index: int, queues: List[asyncio.Queue]):
+        stage = self.stages[index]
+        queue = queues[index]
+        next_queue = queues[index + 1] if index + 1 < len(queues) else None
+        metrics = stage.metrics
+
+        while True:
+            item = await queue.get()
+            try:
+                metrics.max_queue_depth = max(metrics.max_queue_depth, queue.qsize() + 1)
+                started = time.perf_counter()
+                try:
+                    result = await stage.handler(item)
+                finally:
+                    metrics.busy_seconds += time.perf_counter() - started
+                metrics.processed += 1
+
+                if next_queue is None:
+                    continue
+                if result is None:
+                    metrics.dropped += 1
+                else:
+                    blocked = time.perf_counter()
+                    await next_queue.put(result)
+                    metrics.blocked_seconds += time.perf_counter() - blocked
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                metrics.errors += 1
+                logger.error(f"Error in pipeline stage {stage.name}: {e}", exc_info=True)
+            finally:
+                queue.task_done()
@@ -0,0 +1,235 @@
+import asyncio
+import heapq
+import itertools
+import logging
+import statistics
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, Deque, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+@dataclass
+class RefreshState:
+    deadline: float = 0.0
+    rate: float = 0.0
+    interval: float = 0.0
+    volume: Optional[float] = None
+    volume_change: float = 0.0
+    volume_changed_at: float = 0.0
+    risk_scores: Deque[float] = field(default_factory=lambda: deque(maxlen=8))
+    interest: float = 0.0
+    interest_at: float = 0.0
+
+class RefreshScheduler:
+    """Per-token refresh deadlines kept in a heap timer
+
+    Each token's interval is `base_interval` divided by its heat, which grows
+    with decayed relative volume change, risk-score volatility and decayed
+    client interest. Volume only changes when discovery reports a new figure,
+    so its heat fades over `volume_half_life` instead of dropping to zero on
+    the next refresh. Intervals are then scaled so the summed refresh rate never
+    exceeds what refreshing every token once per `base_interval` would cost:
+    hot tokens get shorter intervals by stretching those of quiet ones.
+    """
+
+    def __init__(self,
+                 base_interval: float = 300,
+                 min_interval: float = 5,
+                 max_interval: float = 1800,
+                 volume_weight: float = 1.0,
+                 volatility_weight: float = 1.0,
+                 interest_weight: float = 1.0,
+                 interest_half_life: float = 600,
+                 volume_half_life: float = 600,
+                 clock: Callable[[], float] = time.time):
+        self.base_interval = base_interval
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.volume_weight = volume_weight
+        self.volatility_weight = volatility_weight
+        self.interest_weight = interest_weight
+        self.interest_half_life = interest_half_life
+        self.volume_half_life = volume_half_life
+        self.clock = clock
+        self.refreshes = 0
+        self._states: Dict[str, RefreshState] = {}
+        self._heap: List[Tuple[float, int, str]] = []
+        self._sequence = itertools.count()
+        self._total_rate = 0.0
+        self._wakeup = asyncio.Event()
+
+    def __len__(self) -> int:
+        return len(self._states)
+
+    def __contains__(self, address: str) -> bool:
+        return address in self._states
+
+    def _interest(self, state: RefreshState, now: float) -> float:
+        return state.interest * 0.5 ** ((now - state.interest_at) / self.interest_half_life)
+
+    def _volume_change(self, state: RefreshState, now: float) -> float:
+        return state.volume_change * 0.5 ** ((now - state.volume_changed_at) / self.volume_half_life)
+
+    def heat(self, address: str) -> float:
+        state = self._states[address]
+        volatility = statistics.pstdev(state.risk_scores) if len(state.risk_scores) > 1 else 0.0
+        now = self.clock()
+        return (
+            1.0
+            + self.volume_weight * min(self._volume_change(state, now), 10.0)
+            + self.volatility_weight * volatility / 10
+            + self.interest_weight * self._interest(state, now)
+        )
+
+    def interval(self, address: str) -> float:
+        """Current refresh interval for a token after load normalization"""
+        state = self._states[address]
+        raw = self.base_interval / self.heat(address)
+        self._total_rate += 1 / raw - state.rate
+        state.rate = 1 / raw
+
+        budget = len(self._states) / self.base_interval
+        scale = max(1.0, self._total_rate / budget) if budget else 1.0
+        state.interval = min(self.max_interval, max(self.min_interval, raw * scale))
+        return state.interval
+
+    def _schedule(self, address: str, deadline: float):
+        state = self._states[address]
+        wake = not self._heap or deadline < self._heap[0][0]
+        state.deadline = deadline
+        heapq.heappush(self._heap, (deadline, next(self._sequence), address))
+        if wake:
+            self._wakeup.set()
+
+    def add(self, address: str, delay: float = 0.0):
+        """Start tracking a token, first refreshing after `delay` seconds"""
+        if address not in self._states:
+            self._states[address] = RefreshState()
+            self._schedule(address, self.clock() + delay)
+
+    def snapshot(self) -> Dict[str, Dict]:
+        return {
+            address: {"deadline": state.deadline, "volume": state.volume, "risk_scores": list(state.risk_scores)}
+            for address, state in self._states.items()
+        }
+
+    def restore(self, states: Dict[str, Dict]):
+        """Resume tracking from snapshot(), keeping each token's volume and risk history
+
+        Deadlines that passed while the process was down are spread over one
+        base interval in their original order instead of all coming due at once.
+        """
+        now = self.clock()
+        overdue = sorted(
+            (state["deadline"], address) for address, state in states.items()
+            if address not in self._states and state["deadline"] <= now
+        )
+        spacing = self.base_interval / len(overdue) if overdue else 0.0
+        deadlines = {address: now + i * spacing for i, (_, address) in enumerate(overdue)}
+        for address, saved in states.items():
+            if address in self._states:
+                continue
+            state = RefreshState(volume=saved.get("volume"))
+            state.risk_scores.extend(saved.get("risk_scores", []))
+            self._states[address] = state
+            self._schedule(address, deadlines.get(address, saved["deadline"]))
+
+    def remove(self, address: str):
+        state = self._states.pop(address, None)
+        if state is not None:
+            # Heap entries for the token are skipped lazily when they come due
+            self._total_rate -= state.rate
+
+    def observe(self, address: str, volume: float, risk_score: float):
+        """Record the result of a refresh and schedule the next one
+
+        Tokens that are not tracked (never added, or removed while their
+        refresh was in flight) are ignored rather than tracked again.
+        """
+        state = self._states.get(address)
+        if state is None:
+            return
+        # Refreshes between discoveries report the same volume; only a new
+        # figure restarts the volume heat
+        if state.volume is not None and volume != state.volume:
+            state.volume_change = abs(volume - state.volume) / max(state.volume, 1.0)
+            state.volume_changed_at = self.clock()
+        state.volume = volume
+        state.risk_scores.append(risk_score)
+        self._schedule(address, self.clock() + self.interval(address))
+
+    def touch(self, address: str, weight: float = 1.0):
+        """Record client interest, pulling the next refresh forward if it got hotter"""
+        state = self._states.get(address)
+        if state is None:
+            return
+        now = self.clock()
+        state.interest = self._interest(state, now) + weight
+        state.interest_at = now
+        deadline = now + self.interval(address)
+        if deadline < state.deadline:
+            self._schedule(address, deadline)
+
+    def is_due(self, address: str) -> bool:
+        state = self._states.get(address)
+        return state is None or state.deadline <= self.clock()
+
+    def next_deadline(self) -> Optional[float]:
+        self._discard_stale()
+        return self._heap[0][0] if self._heap else None
+
+    def _discard_stale(self):
+        while self._heap:
+            deadline, _, address = self._heap[0]
+            state = self._states.get(address)
+            if state is not None and state.deadline == deadline:
+                return
+            heapq.heappop(self._heap)
+
+    def pop_due(self) -> List[str]:
+        """Addresses whose deadline has passed
+
+        Each is provisionally rescheduled one interval ahead, so a refresh that
+        fails without reporting back through observe() is still retried.
+        """
+        now = self.clock()
+        due = []
+        while self.next_deadline() is not None and self._heap[0][0] <= now:
+            _, _, address = heapq.heappop(self._heap)
+            due.append(address)
+        for address in due:
+            self._schedule(address, now + self.interval(address))
+        return due
+
+    async def run(self, refresh: Callable[[List[str]], Awaitable[None]]):
+        """Call `refresh` with each batch of due tokens as deadlines pass"""
+        while True:
+            self._wakeup.clear()
+            deadline = self.next_deadline()
+            timeout = None if deadline is None else max(0.0, deadline - self.clock())
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout)
+                continue
+            except asyncio.TimeoutError:
+                pass
+
+            due = self.pop_due()
+            if not due:
+                continue
+            self.refreshes += len(due)
+            try:
+                await refresh(due)
+            except Exception as e:
+                logger.error(f"Error refreshing {len(due)} tokens: {e}", exc_info=True)
+
+    def stats(self) -> Dict:
+        intervals = [state.interval for state in self._states.values() if state.interval]
+        return {
+            "tokens": len(self._states),
+            "refreshes": self.refreshes,
+            "refresh_rate_per_min": sum(60 / interval for interval in intervals),
+            "min_interval": min(intervals) if intervals else None,
+            "max_interval": max(intervals) if intervals else None
+        }
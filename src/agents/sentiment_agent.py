@@ -1,9 +1,16 @@
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple
 import aiohttp
 import asyncio
-from datetime import datetime, timedelta
-from textblob import TextBlob
-from utils.twitter_client import TwitterClient
+from datetime import datetime, timedelta, timezone
+from analyzers.text_scorer import Sentiment, TextScorer, score_texts
+from utils.cache import TTLCache
+from .tweet_batcher import MAX_QUERY_LENGTH, SearchTerm, TweetBatcher
+from .tweet_window import TweetWindow
+from .sentiment_sources import SourceAggregator, build_sources, merge_results
+from collections import OrderedDict
+import numpy as np
+import re
+from utils.capture import capture
 from dataclasses import dataclass
 import logging
 import base64
@@ -20,15 +27,140 @@ class SentimentResult:
     timestamp: datetime
     text: str
 
+class SentimentBackend:
+    """Scores a batch of texts as (polarity, subjectivity) pairs
+    
+    Backends are handed to TextScorer and must be picklable so batches can
+    run on its process pool.
+    """
+    name = ""
+    
+    def score_batch(self, texts: List[str]) -> List[Sentiment]:
+        raise NotImplementedError
+        
+class TextBlobBackend(SentimentBackend):
+    name = "textblob"
+    
+    def score_batch(self, texts: List[str]) -> List[Sentiment]:
+        return score_texts(texts)
+        
+# Valences in [-1, 1]: crypto slang first, then common English opinion words and emoji
+CRYPTO_LEXICON: Dict[str, float] = {
+    "moon": 0.8, "mooning": 0.8, "moonshot": 0.7, "lfg": 0.7, "wagmi": 0.7, "bullish": 0.8,
+    "gem": 0.6, "gems": 0.6, "pump": 0.3, "pumping": 0.5, "send": 0.3, "sending": 0.4,
+    "hodl": 0.4, "hodling": 0.4, "diamond": 0.4, "ath": 0.5, "breakout": 0.5, "based": 0.5,
+    "alpha": 0.4, "undervalued": 0.5, "legit": 0.6, "safu": 0.6, "degen": 0.1, "ape": 0.2,
+    "aped": 0.2, "green": 0.4, "rally": 0.5, "ripping": 0.6, "giga": 0.4, "chad": 0.5,
+    "100x": 0.7, "10x": 0.6, "1000x": 0.7, "gm": 0.2,
+    "rug": -0.9, "rugged": -0.9, "rugpull": -0.9, "rugging": -0.9, "ngmi": -0.7, "bearish": -0.8,
+    "scam": -0.9, "scammer": -0.9, "scammers": -0.9, "honeypot": -0.9, "fud": -0.3, "rekt": -0.7,
+    "dump": -0.6, "dumping": -0.6, "dumped": -0.6, "jeet": -0.5, "jeets": -0.5, "exit": -0.3,
+    "ponzi": -0.8, "bagholder": -0.5, "bagholders": -0.5, "bags": -0.2, "red": -0.3,
+    "crash": -0.7, "crashing": -0.7, "dead": -0.7, "down": -0.3, "sell": -0.3, "selling": -0.3,
+    "sold": -0.2, "farm": -0.2, "farming": -0.2, "bot": -0.3, "bots": -0.3, "sniped": -0.4,
+    "snipers": -0.4, "insider": -0.4, "insiders": -0.4, "cabal": -0.5, "larp": -0.4, "shitcoin": -0.6,
+    "good": 0.6, "great": 0.8, "amazing": 0.9, "awesome": 0.8, "love": 0.7, "loving": 0.7,
+    "best": 0.8, "nice": 0.5, "strong": 0.5, "solid": 0.5, "huge": 0.4, "win": 0.6, "winning": 0.6,
+    "winner": 0.6, "happy": 0.6, "excited": 0.6, "bullrun": 0.7, "gains": 0.6, "profit": 0.5,
+    "profits": 0.5, "up": 0.2, "buy": 0.3, "buying": 0.3, "bought": 0.2, "growing": 0.4,
+    "bad": -0.7, "terrible": -0.9, "awful": -0.9, "worst": -0.9, "hate": -0.8, "fake": -0.7,
+    "fraud": -0.9, "avoid": -0.7, "careful": -0.3, "warning": -0.5, "beware": -0.6, "risky": -0.4,
+    "loss": -0.5, "losses": -0.5, "lost": -0.5, "weak": -0.5, "sad": -0.5, "ugly": -0.6,
+    "stolen": -0.8, "hacked": -0.8, "exploit": -0.7, "drained": -0.8, "lol": 0.1,
+    "\U0001F680": 0.6, "\U0001F48E": 0.4, "\U0001F525": 0.5, "\U0001F4C8": 0.5, "\U0001F319": 0.5,
+    "\U0001F4B0": 0.4, "\U0001F4AA": 0.4, "\U0001F4C9": -0.5, "\U0001F480": -0.4, "\U0001F921": -0.5,
+    "\U0001F6A8": -0.4, "\u26A0": -0.4, "\U0001F6A9": -0.6,
+}
+NEGATIONS = {
+    "not", "no", "never", "nothing", "without", "isnt", "isn't", "dont", "don't", "doesnt",
+    "doesn't", "wont", "won't", "cant", "can't", "aint", "ain't", "wasnt", "wasn't", "nobody"
+}
+INTENSIFIERS = {"very": 1.3, "so": 1.2, "really": 1.2, "super": 1.3, "extremely": 1.5, "mega": 1.4, "absolutely": 1.4}
+
+class LexiconBackend(SentimentBackend):
+    """Lexicon scorer tuned for crypto slang, much cheaper than TextBlob
+    
+    Polarity is the mean valence of the opinion words in a text, after
+    flipping and damping those within three tokens of a negation and
+    boosting those right after an intensifier. Subjectivity is the share of
+    opinion words, reaching 1 at one per four tokens. Per-text valences are
+    aggregated for the whole batch at once with numpy.
+    """
+    name = "lexicon"
+    token_pattern = re.compile(r"[a-z0-9']+|[\U0001F300-\U0001FAFF\u2600-\u27BF]")
+    
+    def __init__(self, lexicon: Optional[Dict[str, float]] = None, negation_window: int = 3):
+        self.lexicon = dict(CRYPTO_LEXICON, **(lexicon or {}))
+        self.negation_window = negation_window
+        
+    def score_batch(self, texts: List[str]) -> List[Sentiment]:
+        lexicon = self.lexicon
+        documents: List[int] = []
+        valences: List[float] = []
+        lengths = np.zeros(len(texts))
+        for document, text in enumerate(texts):
+            tokens = self.token_pattern.findall(text.lower())
+            lengths[document] = len(tokens)
+            negated_until = -1
+            boost = 1.0
+            for position, token in enumerate(tokens):
+                if token in NEGATIONS:
+                    negated_until = position + self.negation_window
+                    continue
+                if token in INTENSIFIERS:
+                    boost = INTENSIFIERS[token]
+                    continue
+                valence = lexicon.get(token)
+                if valence is not None:
+                    if position <= negated_until:
+                        valence = -0.5 * valence
+                    documents.append(document)
+                    valences.append(valence * boost)
+                boost = 1.0
+        
+        counts = np.bincount(documents, minlength=len(texts)).astype(float)
+        sums = np.bincount(documents, weights=valences, minlength=len(texts))
+        polarity = np.clip(np.divide(sums, counts, out=np.zeros(len(texts)), where=counts > 0), -1.0, 1.0)
+        subjectivity = np.minimum(1.0, np.divide(4 * counts, lengths, out=np.zeros(len(texts)), where=lengths > 0))
+        return list(zip(polarity.tolist(), subjectivity.tolist()))
+        
+SENTIMENT_BACKENDS = {
+    TextBlobBackend.name: TextBlobBackend,
+    LexiconBackend.name: LexiconBackend
+}
+
+def make_backend(name: str) -> SentimentBackend:
+    if name not in SENTIMENT_BACKENDS:
+        raise ValueError(f"Unknown sentiment backend: {name}")
+    return SENTIMENT_BACKENDS[name]()
+
 class SentimentAnalyzer:
-    def __init__(self, api_key: str, api_secret: str):
+    def __init__(self, api_key: str, api_secret: str, scorer: Optional[TextScorer] = None,
+                 cache: Optional[TTLCache] = None, query_max_length: int = MAX_QUERY_LENGTH,
+                 window_hours: int = 24, source_config: Optional[Dict] = None, max_pages: int = 10,
+                 twitter_deadline: float = 20.0):
         self.api_key = api_key
         self.api_secret = api_secret
         self.bearer_token = None
-        self.sentiment_cache = {}  # Cache for sentiment results
-        self.cache_duration = 300  # 5 minutes in seconds
+        # Results stay fresh for 5 minutes, then are served stale for up to an hour
+        # while a refresh waits for Twitter quota
+        self.sentiment_cache = cache if cache is not None else TTLCache(
+            max_entries=1024, default_ttl=300, stale_ttl=3600
+        )
         self.last_twitter_call = 0  # Track last Twitter API call
         self.twitter_rate_limit = 300  # 5 minutes in seconds
+        self.scorer = scorer or TextScorer()
+        self.batcher = TweetBatcher(query_max_length)
+        # A batched search pages through results until it reaches every
+        # token's cursor, so a busy token cannot crowd the others out
+        self.max_pages = max_pages
+        self.truncated_searches = 0
+        # Like every other source, the whole search has a deadline
+        self.twitter_deadline = twitter_deadline
+        self.sources = SourceAggregator(build_sources(source_config or {}, self.scorer))
+        # Rolling tweet windows and search cursors per token, least recently searched first
+        self.window_hours = window_hours
+        self.windows: "OrderedDict[str, TweetWindow]" = OrderedDict()
         
     async def _get_bearer_token(self) -> str:
         """Get OAuth 2.0 Bearer Token from Twitter"""
@@ -42,7 +174,9 @@ class SentimentAnalyzer:
             ).decode()
             
             async with aiohttp.ClientSession() as session:
-                async with session.post(
+                response = await capture.request(
+                    session,
+                    "POST",
                     "https://api.twitter.com/oauth2/token",
                     headers={
                         "Authorization": f"Basic {credentials}",
@@ -50,153 +184,251 @@ class SentimentAnalyzer:
                     },
                     data={"grant_type": "client_credentials"},
                     ssl=True
-                ) as response:
-                    if response.status != 200:
-                        logger.error(f"Failed to get bearer token: {await response.text()}")
-                        return None
-                        
-                    data = await response.json()
-                    self.bearer_token = data.get("access_token")
-                    return self.bearer_token
+                )
+                if response.status != 200:
+                    logger.error(f"Failed to get bearer token: {await response.text()}")
+                    return None
                     
+                data = await response.json()
+                self.bearer_token = data.get("access_token")
+                return self.bearer_token
+                
         except Exception as e:
             logger.error(f"Error getting bearer token: {e}")
             return None
         
+    def snapshot(self) -> Dict:
+        """The last search time and tweet windows; the sentiment cache persists itself"""
+        return {
+            "last_twitter_call": self.last_twitter_call,
+            "windows": {key: window.to_state() for key, window in self.windows.items()}
+        }
+        
+    def restore(self, state: Dict):
+        self.last_twitter_call = max(self.last_twitter_call, state.get("last_twitter_call", 0))
+        for key, window in state.get("windows", {}).items():
+            if key not in self.windows:
+                self.windows[key] = TweetWindow.from_state(window, self.window_hours)
+        self._trim_windows()
+        
+    def _window(self, cache_key: str) -> TweetWindow:
+        window = self.windows.get(cache_key)
+        if window is None:
+            window = self.windows[cache_key] = TweetWindow(self.window_hours)
+        self.windows.move_to_end(cache_key)
+        self._trim_windows()
+        return window
+        
+    def _trim_windows(self):
+        while len(self.windows) > self.sentiment_cache.max_entries:
+            self.windows.popitem(last=False)
+        
+    def close(self):
+        self.sentiment_cache.save()
+        self.scorer.close()
+        
+    def cached_sentiment(self, symbol: str, name: str) -> Optional[Dict]:
+        """Cached result without searching, marked stale once past its TTL"""
+        entry = self.sentiment_cache.get_entry(f"{symbol}:{name}")
+        if entry is None:
+            return None
+        now = time.time()
+        return dict(entry.value, cache_age=entry.age(now), stale=not entry.is_fresh(now))
+        
+    def _fallback(self, results: Dict[str, Dict], terms: List[SearchTerm]) -> Dict[str, Dict]:
+        """`results` plus the stale cached result of each term that has one
+        
+        Terms with nothing cached are left out rather than given a neutral
+        score, so callers can tell "no answer" from "neutral" and retry.
+        """
+        now = time.time()
+        results = dict(results)
+        for term in terms:
+            entry = self.sentiment_cache.get_entry(f"{term.symbol}:{term.name}")
+            if entry is not None:
+                results[term.key] = dict(entry.value, cache_age=entry.age(now), stale=True)
+        return results
+        
+    def quota_wait(self) -> float:
+        """Seconds until the Twitter rate limit allows another search"""
+        return max(0.0, self.last_twitter_call + self.twitter_rate_limit - time.time())
+        
     async def analyze_sentiment(self, symbol: str, name: str) -> Optional[Dict]:
         """Analyze social sentiment for a token"""
+        cache_key = f"{symbol}:{name}"
+        return (await self.analyze_sentiment_batch([(cache_key, symbol, name)])).get(cache_key)
+        
+    async def analyze_sentiment_batch(self, requests: List[Tuple[str, str, str]]) -> Dict[str, Dict]:
+        """Analyze social sentiment for many tokens with at most one search
+        
+        `requests` are (key, symbol, name) in priority order. Fresh cached
+        results are returned without searching; the rest share one query
+        packed up to the query length limit. Keys that did not fit in the
+        query are missing from the result, so the caller can retry them.
+        """
+        results = {}
+        pending = []
+        for key, symbol, name in requests:
+            cached = self.cached_sentiment(symbol, name)
+            if cached is not None and not cached["stale"]:
+                logger.debug(f"Using cached sentiment for {symbol}:{name}")
+                results[key] = cached
+            else:
+                pending.append(SearchTerm(key, symbol, name))
+        if not pending:
+            return results
+        
+        current_time = time.time()
+        # Every other source runs for every pending token under its own
+        # deadline and rate limit, whatever state Twitter is in
+        other_sources = asyncio.create_task(self._analyze_other_sources(pending))
         try:
-            # Check cache first
-            cache_key = f"{symbol}:{name}"
-            current_time = time.time()
-            
-            if cache_key in self.sentiment_cache:
-                cached_result, timestamp = self.sentiment_cache[cache_key]
-                if current_time - timestamp < self.cache_duration:
-                    logger.debug(f"Using cached sentiment for {cache_key}")
-                    return cached_result
-            
-            # Check Twitter rate limit
-            if current_time - self.last_twitter_call < self.twitter_rate_limit:
-                logger.warning("Twitter rate limit in effect, returning neutral sentiment")
-                return {"overall_sentiment": 0.0, "tweets": []}
+            try:
+                searched = await asyncio.wait_for(self._search_twitter(pending, current_time), self.twitter_deadline)
+            except asyncio.TimeoutError:
+                logger.warning(f"Twitter search missed its {self.twitter_deadline}s deadline")
+                searched = None
+            others = await other_sources
             
-            # Get bearer token first
-            bearer_token = await self._get_bearer_token()
-            if not bearer_token:
-                logger.warning("Twitter authentication failed, returning neutral sentiment")
-                return {"overall_sentiment": 0.0, "tweets": []}
+            if searched is None:
+                # Without Twitter, tokens another source answered for still get a
+                # result with their tweet window as it stands; the rest fall back
+                # to their cache
+                included, found = [], []
+                def has_answer(term: SearchTerm) -> bool:
+                    return any(result and result.get("confidence", 0) > 0
+                               for result in others.get(term.key, {}).values())
+                
+                answered = [term for term in pending if has_answer(term)]
+                results = self._fallback(results, [term for term in pending if not has_answer(term)])
+            else:
+                included, found = searched
+                answered = included
+                if not found:
+                    logger.debug(f"No new tweets found for {len(included)} tokens")
+            windows = {term.key: self._window(f"{term.symbol}:{term.name}") for term in answered}
             
-            # Search Twitter for mentions
-            async with aiohttp.ClientSession() as session:
-                async with session.get(
-                    "https://api.twitter.com/2/tweets/search/recent",
-                    params={
-                        "query": f"({symbol} OR {name}) -is:retweet",
-                        "max_results": 100
-                    },
-                    headers={
-                        "Authorization": f"Bearer {bearer_token}"
-                    }
-                ) as response:
-                    # Update last Twitter API call time
-                    self.last_twitter_call = current_time
-                    
-                    if response.status != 200:
-                        logger.error(f"Twitter API error: {await response.text()}")
-                        if response.status == 429:  # Rate limit error
-                            logger.warning("Twitter rate limit exceeded, using cached or neutral sentiment")
-                            return self.sentiment_cache.get(cache_key, ({"overall_sentiment": 0.0, "tweets": []}, 0))[0]
-                        return {"overall_sentiment": 0.0, "tweets": []}
-                    
-                    data = await response.json()
-                    
-                    if "data" not in data:
-                        logger.warning(f"No tweets found for {symbol}")
-                        return {"overall_sentiment": 0.0, "tweets": []}
-                    
-                    # Process tweets and calculate sentiment
-                    tweets = []
-                    total_sentiment = 0
-                    
-                    for tweet in data["data"]:
-                        blob = TextBlob(tweet["text"])
-                        sentiment = blob.sentiment.polarity
-                        total_sentiment += sentiment
-                        
-                        tweets.append({
-                            "text": tweet["text"],
-                            "created_at": tweet.get("created_at", ""),
-                            "sentiment": sentiment
-                        })
-                    
-                    overall_sentiment = total_sentiment / len(tweets) if tweets else 0
-                    
-                    result = {
-                        "overall_sentiment": overall_sentiment,
-                        "tweets": tweets
-                    }
-                    
-                    # Cache the result
-                    self.sentiment_cache[cache_key] = (result, current_time)
-                    return result
+            # Hand each token the mentions it hasn't counted yet, then score
+            # only those tweets, all in one pass
+            routed = self.batcher.route(found, included)
+            new = {
+                term.key: [index for index in routed.get(term.key, []) if windows[term.key].is_new(found[index])]
+                for term in answered
+            }
+            to_score = sorted({index for indexes in new.values() for index in indexes})
+            scores = dict(zip(to_score, await self.scorer.score([found[index]["text"] for index in to_score])))
             
+            for term in answered:
+                window = windows[term.key]
+                for index in new[term.key]:
+                    window.add(found[index], scores[index][0], current_time)
+                
+                # Blend in the other sources by confidence; tweets alone count
+                # the same as before
+                merged = merge_results(dict(others.get(term.key, {}), twitter={
+                    "score": window.score(current_time),
+                    "confidence": min(1.0, len(window) / 50),
+                    "sample_size": len(window)
+                }))
+                result = {
+                    "overall_sentiment": merged["score"],
+                    "confidence": merged["confidence"],
+                    "tweet_count": len(window),
+                    "tweets": window.recent(current_time),
+                    "sources": merged["sources"]
+                }
+                
+                # Cache the result; an empty search is a real result too
+                self.sentiment_cache.set(f"{term.symbol}:{term.name}", result)
+                results[term.key] = result
+            return results
+        
         except Exception as e:
             logger.error(f"Error analyzing Twitter sentiment: {e}")
+            for term in pending:
+                cached = self.cached_sentiment(term.symbol, term.name)
+                if cached is not None:
+                    results[term.key] = cached
+            return results
+        finally:
+            # Nobody waits for the other sources once the search has failed
+            other_sources.cancel()
+        
+    async def _search_twitter(self, pending: List[SearchTerm],
+                              current_time: float) -> Optional[Tuple[List[SearchTerm], List[Dict]]]:
+        """Tweets for the tokens that fit in one search, or None if Twitter can't be searched
+        
+        Returns the included search terms and the tweets found for them.
+        """
+        # Check Twitter rate limit
+        if current_time - self.last_twitter_call < self.twitter_rate_limit:
+            logger.warning("Twitter rate limit in effect, using other sources and stale sentiment")
             return None
         
-    async def _analyze_twitter(self, search_terms: List[str]) -> Dict:
-        """Analyze Twitter sentiment"""
-        sentiments: List[SentimentResult] = []
+        # Get bearer token first
+        bearer_token = await self._get_bearer_token()
+        if not bearer_token:
+            logger.warning("Twitter authentication failed, using other sources and stale sentiment")
+            return None
         
-        for term in search_terms:
-            try:
-                # Search recent tweets
-                tweets = await self.twitter_client.search_tweets(term)
+        # Search Twitter for mentions of every token that fits in one query
+        query, included = self.batcher.pack(pending)
+        if not included:
+            logger.warning("No token's search clause fits in a Twitter query, using other sources and stale sentiment")
+            return None
+        windows = [self._window(f"{term.symbol}:{term.name}") for term in included]
+        params = {
+            "query": query,
+            "max_results": 100,
+            "tweet.fields": "created_at"
+        }
+        # Only tweets newer than every included token's cursor are fetched;
+        # without cursors, only tweets young enough to count in the window
+        cursors = [window.since_id for window in windows]
+        if all(cursor is not None for cursor in cursors):
+            params["since_id"] = str(min(cursors))
+        else:
+            params["start_time"] = datetime.fromtimestamp(
+                current_time - self.window_hours * 3600 + 60, timezone.utc
+            ).strftime("%Y-%m-%dT%H:%M:%SZ")
+        found = []
+        async with aiohttp.ClientSession() as session:
+            for _ in range(self.max_pages):
+                response = await capture.request(
+                    session,
+                    "GET",
+                    "https://api.twitter.com/2/tweets/search/recent",
+                    params=params,
+                    headers={
+                        "Authorization": f"Bearer {bearer_token}"
+                    }
+                )
+                # Update last Twitter API call time
+                self.last_twitter_call = current_time
                 
-                for tweet in tweets:
-                    # Skip retweets and replies
-                    if tweet.get('referenced_tweets'):  # Skip retweets and replies
-                        continue
-                        
-                    blob = TextBlob(tweet['text'])
-                    sentiments.append(SentimentResult(
-                        score=blob.sentiment.polarity,
-                        confidence=blob.sentiment.subjectivity,
-                        source="twitter",
-                        timestamp=datetime.fromisoformat(tweet['created_at'].replace('Z', '+00:00')),
-                        text=tweet['text']
-                    ))
-                    
-            except Exception as e:
-                print(f"Error analyzing Twitter sentiment: {e}")
+                # Windows only change once every page is in, so a failed
+                # page never advances a cursor past tweets not seen
+                if response.status != 200:
+                    logger.error(f"Twitter API error: {await response.text()}")
+                    if response.status == 429:  # Rate limit error
+                        logger.warning("Twitter rate limit exceeded, using other sources and stale sentiment")
+                    return None
                 
-        if not sentiments:
-            return {"score": 0.0, "confidence": 0.0}
-            
-        # Calculate weighted average based on recency
-        total_weight = 0
-        weighted_sum = 0
-        
-        for sent in sentiments:
-            age = datetime.now() - sent.timestamp
-            weight = 1.0 / (1 + age.total_seconds() / 3600)  # Decay weight with age
-            weighted_sum += sent.score * weight
-            total_weight += weight
-            
-        return {
-            "score": weighted_sum / total_weight if total_weight > 0 else 0,
-            "confidence": min(1.0, len(sentiments) / 50),  # Scale with number of data points
-            "sample_size": len(sentiments)
-        }
-        
-    async def _analyze_news(self, search_terms: List[str]) -> Dict:
-        """Analyze news sentiment using news APIs"""
-        # Similar to Twitter analysis but for news sources
-        # Implementation would depend on which news APIs you're using
-        return {"score": 0.0, "confidence": 0.0}  # Placeholder
+                data = await response.json()
+                found.extend(data.get("data", []))
+                next_token = data.get("meta", {}).get("next_token")
+                if not next_token:
+                    break
+                params = dict(params, next_token=next_token)
+            else:
+                self.truncated_searches += 1
+                logger.warning(f"Search for {len(included)} tokens stopped after {self.max_pages} pages; "
+                               f"older tweets since the last cursor are skipped")
+        return included, found
         
-    async def _analyze_telegram(self, search_terms: List[str]) -> Dict:
-        """Analyze Telegram sentiment"""
-        # Implementation would require Telegram API integration
-        return {"score": 0.0, "confidence": 0.0}  # Placeholder 
\ No newline at end of file
+    async def _analyze_other_sources(self, terms: List[SearchTerm]) -> Dict[str, Dict]:
+        """Per-source results of the other sources for each search term's key"""
+        if not self.sources.enabled():
+            return {}
+        merged = await self.sources.analyze({term.key: [term.symbol, term.name] for term in terms})
+        return {key: result["sources"] for key, result in merged.items()}
@@ -0,0 +1,161 @@
+import asyncio
+import heapq
+import itertools
+import logging
+import time
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+from models.token import Token
+from .sentiment_agent import SentimentAnalyzer
+
+logger = logging.getLogger(__name__)
+
+class SentimentEnricher:
+    """Background stage that adds social sentiment to analyzed tokens
+
+    Tokens are queued with a priority and enriched highest first, one search
+    at a time as the analyzer's Twitter quota allows. Each search covers up to
+    `batch_size` tokens; those that don't fit in the query go back in the
+    queue with their priority. Resubmitting a queued token only raises its
+    priority, and tokens enriched within `refresh_interval` are not queued
+    again. Results are handed to `on_result`, so the analysis path never
+    waits on Twitter. A stale cached result served in place of a search is
+    applied, and the token stays queued at low priority until a real refresh
+    succeeds.
+    """
+
+    def __init__(self,
+                 analyzer: SentimentAnalyzer,
+                 lookup: Callable[[str], Optional[Token]],
+                 on_result: Callable[[Token, Dict], Awaitable[None]],
+                 refresh_interval: float = 900,
+                 batch_size: int = 20,
+                 retry_delay: float = 30):
+        self.analyzer = analyzer
+        self.lookup = lookup
+        self.on_result = on_result
+        self.refresh_interval = refresh_interval
+        self.batch_size = batch_size
+        self.retry_delay = retry_delay
+        self.enriched = 0
+        self.failed = 0
+        self.stale = 0
+        self.unanswered = 0
+        self.searches = 0
+        self._heap: List[Tuple[float, int, str]] = []
+        self._priorities: Dict[str, float] = {}
+        self._last_enriched: Dict[str, float] = {}
+        self._sequence = itertools.count()
+        self._ready = asyncio.Event()
+
+    def __len__(self) -> int:
+        return len(self._priorities)
+
+    def submit(self, address: str, priority: float, force: bool = False):
+        """Queue a token for enrichment, or raise the priority of a queued one"""
+        if not force and time.time() - self._last_enriched.get(address, 0) < self.refresh_interval:
+            return
+        if address in self._priorities and self._priorities[address] >= priority:
+            return
+        self._priorities[address] = priority
+        heapq.heappush(self._heap, (-priority, next(self._sequence), address))
+        self._ready.set()
+
+    def discard(self, address: str):
+        """Forget a token that is no longer tracked"""
+        self._priorities.pop(address, None)
+        self._last_enriched.pop(address, None)
+
+    def snapshot(self) -> Dict[str, float]:
+        """When each token was last enriched, so a restart doesn't re-search them all"""
+        return dict(self._last_enriched)
+
+    def restore(self, last_enriched: Dict[str, float]):
+        for address, enriched_at in last_enriched.items():
+            self._last_enriched[address] = max(enriched_at, self._last_enriched.get(address, 0))
+
+    def _pop(self) -> Optional[Tuple[str, float]]:
+        while self._heap:
+            priority, _, address = heapq.heappop(self._heap)
+            # Entries superseded by a higher priority or discarded are skipped
+            if self._priorities.get(address) == -priority:
+                del self._priorities[address]
+                return address, -priority
+        return None
+
+    def _pop_batch(self) -> List[Tuple[Token, float]]:
+        batch = []
+        while len(batch) < self.batch_size:
+            popped = self._pop()
+            if popped is None:
+                break
+            address, priority = popped
+            token = self.lookup(address)
+            if token is not None:
+                batch.append((token, priority))
+        return batch
+
+    async def run(self):
+        """Enrich queued tokens forever, pacing searches by the quota"""
+        while True:
+            if not self._priorities:
+                self._ready.clear()
+                await self._ready.wait()
+                continue
+
+            # Wait for quota before choosing, so tokens queued meanwhile can win
+            wait = self.analyzer.quota_wait()
+            if wait > 0:
+                await asyncio.sleep(wait)
+
+            batch = self._pop_batch()
+            if batch:
+                await self._enrich(batch)
+
+    async def _enrich(self, batch: List[Tuple[Token, float]]):
+        try:
+            results = await self.analyzer.analyze_sentiment_batch([
+                (token.address, token.symbol or token.name, token.name) for token, _ in batch
+            ])
+        except Exception as e:
+            self.failed += len(batch)
+            logger.error(f"Error enriching sentiment for {len(batch)} tokens: {e}", exc_info=True)
+            return
+        if not results:
+            # Search failed with nothing cached: keep the tokens' current
+            # sentiment and back off rather than retrying at once
+            self.unanswered += 1
+            for token, priority in batch:
+                self.submit(token.address, priority, force=True)
+            await asyncio.sleep(self.retry_delay)
+            return
+        self.searches += 1
+
+        now = time.time()
+        for token, priority in batch:
+            result = results.get(token.address)
+            if result is None:
+                # Left out of the query; keep its place for the next search
+                self.submit(token.address, priority, force=True)
+                continue
+            self._last_enriched[token.address] = now
+            self.enriched += 1
+            try:
+                await self.on_result(token, result)
+            except Exception as e:
+                self.failed += 1
+                logger.error(f"Error applying sentiment for {token.address}: {e}", exc_info=True)
+            if result.get("stale"):
+                self.stale += 1
+                self.submit(token.address, 0.0, force=True)
+
+    def stats(self) -> Dict:
+        return {
+            "pending": len(self._priorities),
+            "enriched": self.enriched,
+            "failed": self.failed,
+            "stale": self.stale,
+            "unanswered": self.unanswered,
+            "searches": self.searches,
+            "tokens_per_search": self.enriched / self.searches if self.searches else 0.0,
+            "quota_wait_seconds": round(self.analyzer.quota_wait(), 1)
+        }
@@ -0,0 +1,195 @@
+import asyncio
+import json
+import logging
+import time
+from typing import Dict, List, Optional
+from analyzers.text_scorer import TextScorer
+from .tweet_window import recency_weight, tweet_time
+
+logger = logging.getLogger(__name__)
+
+def merge_results(results: Dict[str, Optional[Dict]]) -> Dict:
+    """Confidence-weighted score of the sources that answered
+
+    Confidence combines like independent evidence: 1 - prod(1 - confidence).
+    """
+    answered = {name: result for name, result in results.items() if result is not None}
+    total_confidence = sum(result["confidence"] for result in answered.values())
+    doubt = 1.0
+    for result in answered.values():
+        doubt *= 1 - min(max(result["confidence"], 0.0), 1.0)
+    return {
+        "score": sum(result["score"] * result["confidence"] for result in answered.values()) / total_confidence
+        if total_confidence > 0 else 0.0,
+        "confidence": 1 - doubt,
+        "sample_size": sum(result.get("sample_size", 0) for result in answered.values()),
+        "sources": results
+    }
+
+async def score_posts(scorer: TextScorer, posts: List[Dict], now: Optional[float] = None) -> Dict:
+    """Recency-weighted sentiment of posts with "text" and optional "created_at" """
+    if not posts:
+        return {"score": 0.0, "confidence": 0.0, "sample_size": 0}
+    now = time.time() if now is None else now
+    scores = await scorer.score([post["text"] for post in posts])
+    weights = [recency_weight(now - tweet_time(post, now)) for post in posts]
+    total_weight = sum(weights)
+    return {
+        "score": sum(weight * polarity for weight, (polarity, _) in zip(weights, scores)) / total_weight,
+        "confidence": min(1.0, len(posts) / 50),  # Scale with number of data points
+        "sample_size": len(posts)
+    }
+
+class SentimentSource:
+    """One place to look for sentiment, queried under its own deadline and rate limit
+
+    `fetch` returns {"score", "confidence", "sample_size"} for one token's
+    search terms. `query` asks about a whole batch of tokens at once, counting
+    once against `min_interval`, and returns None instead of waiting when the
+    source is rate limited, disabled, over its deadline or failing, so one
+    slow source never holds up the others.
+    """
+    name = ""
+
+    def __init__(self, deadline: float = 5.0, min_interval: float = 0.0, enabled: bool = True):
+        self.deadline = deadline
+        self.min_interval = min_interval
+        self.enabled = enabled
+        self.last_query = 0.0
+        self.queries = 0
+        self.rate_limited = 0
+        self.timeouts = 0
+        self.errors = 0
+
+    async def fetch(self, search_terms: List[str]) -> Dict:
+        raise NotImplementedError
+
+    async def fetch_batch(self, batch: Dict[str, List[str]]) -> Dict[str, Dict]:
+        """Results for every key's search terms; override to use one upstream call"""
+        results = await asyncio.gather(*(self.fetch(search_terms) for search_terms in batch.values()))
+        return dict(zip(batch, results))
+
+    async def query(self, batch: Dict[str, List[str]]) -> Optional[Dict[str, Dict]]:
+        if not self.enabled:
+            return None
+        now = time.time()
+        if now - self.last_query < self.min_interval:
+            self.rate_limited += 1
+            return None
+        self.last_query = now
+        self.queries += 1
+        try:
+            return await asyncio.wait_for(self.fetch_batch(batch), self.deadline)
+        except asyncio.TimeoutError:
+            self.timeouts += 1
+            logger.warning(f"{self.name} sentiment missed its {self.deadline}s deadline")
+        except Exception as e:
+            self.errors += 1
+            logger.error(f"Error analyzing {self.name} sentiment: {e}")
+        return None
+
+    def stats(self) -> Dict:
+        return {
+            "enabled": self.enabled,
+            "queries": self.queries,
+            "rate_limited": self.rate_limited,
+            "timeouts": self.timeouts,
+            "errors": self.errors
+        }
+
+class NewsSource(SentimentSource):
+    name = "news"
+
+    async def fetch(self, search_terms: List[str]) -> Dict:
+        # Implementation would depend on which news APIs you're using
+        return {"score": 0.0, "confidence": 0.0, "sample_size": 0}  # Placeholder
+
+class TelegramSource(SentimentSource):
+    name = "telegram"
+
+    async def fetch(self, search_terms: List[str]) -> Dict:
+        # Implementation would require Telegram API integration
+        return {"score": 0.0, "confidence": 0.0, "sample_size": 0}  # Placeholder
+
+class FixtureSource(SentimentSource):
+    """Offline source serving posts from a JSON file of {term: [post, ...]}
+
+    Posts are strings or {"text", "created_at"} dicts. `delay` simulates a
+    slow upstream for testing deadlines.
+    """
+
+    def __init__(self, posts: Dict[str, List], scorer: TextScorer, name: str = "fixture",
+                 delay: float = 0.0, **kwargs):
+        super().__init__(**kwargs)
+        self.name = name
+        self.posts = {term.lower(): [post if isinstance(post, dict) else {"text": post} for post in items]
+                      for term, items in posts.items()}
+        self.scorer = scorer
+        self.delay = delay
+
+    @classmethod
+    def from_file(cls, path: str, scorer: TextScorer, **kwargs) -> "FixtureSource":
+        with open(path, encoding="utf-8") as f:
+            return cls(json.load(f), scorer, **kwargs)
+
+    async def fetch(self, search_terms: List[str]) -> Dict:
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        # A symbol and name that differ only in case are one term
+        terms = dict.fromkeys(term.lower() for term in search_terms)
+        posts = [post for term in terms for post in self.posts.get(term, [])]
+        return await score_posts(self.scorer, posts)
+
+class SourceAggregator:
+    """Queries every enabled source at once and merges what returns in time
+
+    Latency is that of the slowest source within its deadline, so adding
+    sources does not add up their latencies. Each source is asked about the
+    whole batch of tokens in one query.
+    """
+
+    def __init__(self, sources: List[SentimentSource]):
+        self.sources = sources
+
+    def enabled(self) -> List[SentimentSource]:
+        return [source for source in self.sources if source.enabled]
+
+    async def analyze(self, batch: Dict[str, List[str]]) -> Dict[str, Dict]:
+        """Merged result per key of `batch`, which maps keys to search terms"""
+        sources = self.enabled()
+        answers = await asyncio.gather(*(source.query(batch) for source in sources))
+        return {
+            key: merge_results({
+                source.name: (answer or {}).get(key) for source, answer in zip(sources, answers)
+            })
+            for key in batch
+        }
+
+    def stats(self) -> Dict:
+        return {source.name: source.stats() for source in self.sources}
+
+def build_sources(config: Dict, scorer: TextScorer) -> List[SentimentSource]:
+    """Sources besides the batched Twitter search, from the `sentiment.sources` config
+
+    The news and Telegram placeholders are disabled by default.
+    """
+    def options(name: str, enabled: bool) -> Dict:
+        source_config = config.get(name, {})
+        return {
+            "deadline": source_config.get("deadline", 5.0),
+            "min_interval": source_config.get("min_interval", 0.0),
+            "enabled": source_config.get("enabled", enabled)
+        }
+
+    sources = [
+        NewsSource(**options("news", False)),
+        TelegramSource(**options("telegram", False))
+    ]
+    fixture_path = config.get("fixture", {}).get("path")
+    if fixture_path:
+        sources.append(FixtureSource.from_file(
+            fixture_path, scorer,
+            delay=config["fixture"].get("delay", 0.0),
+            **options("fixture", True)
+        ))
+    return sources
@@ -0,0 +1,234 @@
+import asyncio
+import bisect
+import copy
+import hashlib
+import logging
+import multiprocessing
+import queue
+from typing import Dict, List, Optional, Tuple
+from utils.logging import setup_logging
+from utils.json_codec import loads
+
+logger = logging.getLogger(__name__)
+
+def _hash(key: str) -> int:
+    return int.from_bytes(hashlib.blake2b(key.encode(), digest_size=8).digest(), "big")
+
+class HashRing:
+    """Consistent-hash assignment of token addresses to shards
+
+    Each shard owns `replicas` points on the ring, so addresses spread evenly
+    and resizing the ring only moves the addresses next to the changed shard.
+    """
+
+    def __init__(self, shards: int, replicas: int = 64):
+        if shards < 1:
+            raise ValueError("A hash ring needs at least one shard")
+        self.shards = shards
+        points = sorted(
+            (_hash(f"shard-{shard}:{replica}"), shard)
+            for shard in range(shards)
+            for replica in range(replicas)
+        )
+        self._hashes = [point for point, _ in points]
+        self._owners = [shard for _, shard in points]
+
+    def shard_for(self, address: str) -> int:
+        index = bisect.bisect(self._hashes, _hash(address)) % len(self._hashes)
+        return self._owners[index]
+
+class QueuePublisher:
+    """Publisher for worker processes that forwards broadcasts over an IPC queue"""
+
+    def __init__(self, channel: multiprocessing.Queue, shard: int):
+        self.channel = channel
+        self.shard = shard
+
+    async def broadcast_token_update(self, token_data: Dict):
+        self.channel.put(("token_update", self.shard, token_data))
+
+    async def broadcast_pattern_alert(self, pattern_data: Dict):
+        self.channel.put(("pattern_alert", self.shard, pattern_data))
+
+    def forward_eviction(self, address: str, token):
+        """Registry eviction callback so the API process's mirror drops the token too"""
+        self.channel.put(("token_evicted", self.shard, address))
+
+def shard_config(config: Dict, shard: int) -> Dict:
+    """Per-shard copy of the agent config with files that must not be shared"""
+    config = copy.deepcopy(config)
+    cache_config = config.setdefault("cache", {})
+    if cache_config.get("path"):
+        cache_config["path"] = f"{cache_config['path']}.shard{shard}"
+    sentiment_config = config.setdefault("sentiment", {})
+    # Workers are daemonic and cannot start a scoring process pool; the shards
+    # are the parallelism
+    sentiment_config["scoring_workers"] = 0
+    if sentiment_config.get("cache_path"):
+        sentiment_config["cache_path"] = f"{sentiment_config['cache_path']}.shard{shard}"
+    snapshot_config = config.setdefault("snapshot", {})
+    if snapshot_config.get("path"):
+        snapshot_config["path"] = f"{snapshot_config['path']}.shard{shard}"
+    return config
+
+def _next_message(channel: multiprocessing.Queue, timeout: float) -> Optional[Tuple]:
+    try:
+        return channel.get(timeout=timeout)
+    except queue.Empty:
+        return None
+
+async def apply_message(agent, kind: str, data):
+    """Apply a message from the API process to a worker's agent"""
+    if kind == "tokens":
+        await agent.analyze_discovered(data)
+    elif kind == "interest":
+        agent.note_interest(data)
+
+async def _receive(agent, shard: int, inbox: multiprocessing.Queue, poll_timeout: float = 0.5):
+    loop = asyncio.get_running_loop()
+    while True:
+        message = await loop.run_in_executor(None, _next_message, inbox, poll_timeout)
+        if message is None:
+            continue
+        kind, data = message
+        try:
+            await apply_message(agent, kind, data)
+        except Exception as e:
+            logger.error(f"Shard {shard} failed to apply {kind}: {e}", exc_info=True)
+
+async def _run_agent(config: Dict, shard: int, shards: int, channel: multiprocessing.Queue,
+                     inbox: multiprocessing.Queue):
+    from agents.trading_agent import TradingAgent
+
+    ring = HashRing(shards)
+    publisher = QueuePublisher(channel, shard)
+    agent = TradingAgent(shard_config(config, shard), publisher=publisher)
+    agent.owns = lambda address: ring.shard_for(address) == shard
+    agent.active_tokens.on_evict(publisher.forward_eviction)
+    # The Twitter quota is shared by every worker
+    agent.sentiment_analyzer.twitter_rate_limit *= shards
+
+    agent.snapshot.load()
+    logger.info(f"Shard {shard}/{shards} started")
+    try:
+        await asyncio.gather(
+            _receive(agent, shard, inbox), agent.run_scheduler(), agent.sentiment_enricher.run(), agent.snapshot.run()
+        )
+    finally:
+        agent.snapshot.save()
+        agent.response_cache.save()
+        agent.sentiment_analyzer.close()
+
+def run_worker(config: Dict, shard: int, shards: int, channel: multiprocessing.Queue,
+               inbox: multiprocessing.Queue):
+    """Worker process entry point: run a TradingAgent over one shard of tokens"""
+    setup_logging()
+    try:
+        asyncio.run(_run_agent(config, shard, shards, channel, inbox))
+    except KeyboardInterrupt:
+        pass
+
+class ShardedWorkers:
+    """Worker processes that each analyze one consistent-hash shard of tokens
+
+    The API process fetches trending tokens once per round and `dispatch`es
+    each to the inbox of the shard that owns it; client interest is routed the
+    same way. Results come back on a shared queue; `relay` applies them to the
+    local agent's registry and forwards them to the publisher, and drops the
+    tokens the shards evict.
+    """
+
+    def __init__(self, config: Dict, shards: int, discover_interval: float = 300):
+        self.config = config
+        self.shards = shards
+        self.discover_interval = discover_interval
+        self.ring = HashRing(shards)
+        self.context = multiprocessing.get_context("spawn")
+        self.channel = self.context.Queue()
+        self.inboxes = [self.context.Queue() for _ in range(shards)]
+        self.processes: List[multiprocessing.Process] = []
+        self.received = 0
+        self.dispatched = 0
+
+    def start(self):
+        for shard in range(self.shards):
+            process = self.context.Process(
+                target=run_worker,
+                args=(self.config, shard, self.shards, self.channel, self.inboxes[shard]),
+                name=f"agent-shard-{shard}",
+                daemon=True
+            )
+            process.start()
+            self.processes.append(process)
+        logger.info(f"Started {self.shards} agent shard workers")
+
+    def stop(self, timeout: float = 5):
+        for process in self.processes:
+            process.terminate()
+        for process in self.processes:
+            process.join(timeout)
+        self.processes.clear()
+
+    def dispatch(self, discovered: List[Dict]):
+        """Send each discovered token to the shard that owns it
+
+        Every shard gets its share, even an empty one, so each one also sweeps
+        its idle tokens once per discovery round.
+        """
+        batches: List[List[Dict]] = [[] for _ in range(self.shards)]
+        for token_data in discovered:
+            batches[self.ring.shard_for(token_data["address"])].append(token_data)
+        for inbox, batch in zip(self.inboxes, batches):
+            inbox.put(("tokens", batch))
+        self.dispatched += len(discovered)
+
+    def note_interest(self, address: str):
+        """Forward a client looking at a token to the shard that owns it"""
+        self.inboxes[self.ring.shard_for(address)].put(("interest", address))
+
+    async def discover_once(self, agent):
+        discovered = await agent.discover_live_tokens()
+        if discovered is not None:
+            self.dispatch(discovered)
+
+    async def discover(self, agent):
+        """Fetch trending tokens with the API process agent and dispatch them to the shards"""
+        while True:
+            try:
+                await self.discover_once(agent)
+            except Exception as e:
+                logger.error(f"Failed to discover tokens for the shards: {e}", exc_info=True)
+            await asyncio.sleep(self.discover_interval)
+
+    async def relay(self, agent, publisher, poll_timeout: float = 0.5):
+        """Apply worker results to the API process agent and publish them"""
+        loop = asyncio.get_running_loop()
+        while True:
+            message = await loop.run_in_executor(None, _next_message, self.channel, poll_timeout)
+            if message is None:
+                continue
+            kind, shard, data = message
+            self.received += 1
+            try:
+                if kind == "token_update":
+                    # Pre-encoded token state is forwarded as is after mirroring
+                    token_data = loads(data) if isinstance(data, bytes) else data
+                    # Status-only "analyzing" notices carry no results to mirror
+                    if "risk_score" in token_data:
+                        agent.apply_remote_update(token_data)
+                    await publisher.broadcast_token_update(data)
+                elif kind == "pattern_alert":
+                    await publisher.broadcast_pattern_alert(data)
+                elif kind == "token_evicted":
+                    # The mirror is never swept itself; it follows the owning shard
+                    agent.active_tokens.remove(data)
+            except Exception as e:
+                logger.error(f"Error relaying {kind} from shard {shard}: {e}", exc_info=True)
+
+    def stats(self) -> Dict:
+        return {
+            "shards": self.shards,
+            "alive": sum(process.is_alive() for process in self.processes),
+            "dispatched": self.dispatched,
+            "received": self.received
+        }
@@ -0,0 +1,151 @@
+import asyncio
+import logging
+import os
+import time
+from typing import Any, Dict, Optional
+from models.token import Token
+from utils.json_codec import dumps, loads
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_FORMAT = 1
+
+def _as_tuple(value: Any) -> Any:
+    """JSON turns fingerprint tuples into lists; turn them back so they compare equal"""
+    if isinstance(value, list):
+        return tuple(_as_tuple(item) for item in value)
+    return value
+
+class AgentSnapshot:
+    """Periodic on-disk snapshot of a TradingAgent's in-memory state
+
+    Captures tracked tokens with their analysis results, registry activity,
+    refresh deadlines, analysis fingerprints, sentiment enrichment times and
+    the last Twitter search time. Writes go to a temporary file that replaces
+    the snapshot, so a crash mid-write leaves the previous one intact. Restoring
+    at startup lets the API serve the last known state immediately while the
+    scheduler refreshes tokens at their usual pace.
+    """
+
+    def __init__(self, agent, path: Optional[str], interval: float = 60, max_age: float = 86400):
+        self.agent = agent
+        self.path = path
+        self.interval = interval
+        self.max_age = max_age
+        self.saves = 0
+        self.last_save: Optional[float] = None
+        self.last_save_seconds = 0.0
+        self.restored = 0
+
+    def capture(self) -> Dict:
+        agent = self.agent
+        registry = agent.active_tokens
+        return {
+            "format": SNAPSHOT_FORMAT,
+            "saved_at": time.time(),
+            "tokens": [
+                dict(token.to_state(), registry=registry.entry_state(address))
+                for address, token in registry.items()
+            ],
+            "fingerprints": {
+                address: fingerprint for address, fingerprint in agent.fingerprints.items()
+                if address in registry
+            },
+            "scheduler": agent.scheduler.snapshot(),
+            "enricher": agent.sentiment_enricher.snapshot(),
+            "sentiment": agent.sentiment_analyzer.snapshot()
+        }
+
+    def save(self) -> bool:
+        """Atomically write the current state; False if disabled or it failed"""
+        if not self.path:
+            return False
+        start = time.perf_counter()
+        try:
+            payload = dumps(self.capture())
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, "wb") as f:
+                f.write(payload)
+            os.replace(tmp_path, self.path)
+        except (OSError, TypeError, ValueError) as e:
+            logger.error(f"Failed to write agent snapshot to {self.path}: {e}")
+            return False
+        self.saves += 1
+        self.last_save = time.time()
+        self.last_save_seconds = time.perf_counter() - start
+        return True
+
+    def load(self) -> int:
+        """Restore state from the snapshot file; returns the number of tokens restored"""
+        if not self.path:
+            return 0
+        try:
+            with open(self.path, "rb") as f:
+                payload = loads(f.read())
+        except FileNotFoundError:
+            return 0
+        except (OSError, ValueError) as e:
+            logger.error(f"Failed to read agent snapshot from {self.path}: {e}")
+            return 0
+
+        if payload.get("format") != SNAPSHOT_FORMAT:
+            logger.warning(f"Ignoring agent snapshot {self.path} with format {payload.get('format')}")
+            return 0
+        age = time.time() - payload.get("saved_at", 0)
+        if age > self.max_age:
+            logger.info(f"Ignoring agent snapshot {self.path} saved {age:.0f}s ago")
+            return 0
+        return self.restore(payload)
+
+    def restore(self, payload: Dict) -> int:
+        agent = self.agent
+        restored = set()
+        for state in payload.get("tokens", []):
+            try:
+                token = Token.from_state(state)
+                admitted_at, last_active, activity = state["registry"]
+            except (KeyError, TypeError, ValueError) as e:
+                logger.warning(f"Skipping unreadable token in agent snapshot: {e}")
+                continue
+            if agent.owns(token.address) and agent.active_tokens.restore(token, admitted_at, last_active, activity):
+                restored.add(token.address)
+        # Tokens that went idle while the process was down leave through the usual callbacks
+        agent.active_tokens.sweep()
+        restored &= set(agent.active_tokens)
+
+        for address, fingerprint in payload.get("fingerprints", {}).items():
+            if address in restored:
+                agent.fingerprints[address] = _as_tuple(fingerprint)
+        agent.scheduler.restore({
+            address: state for address, state in payload.get("scheduler", {}).items()
+            if address in restored
+        })
+        agent.sentiment_enricher.restore({
+            address: enriched_at for address, enriched_at in payload.get("enricher", {}).items()
+            if address in restored
+        })
+        agent.sentiment_analyzer.restore(payload.get("sentiment", {}))
+
+        self.restored = len(restored)
+        logger.info(f"Restored {self.restored} tokens from agent snapshot {self.path}")
+        return self.restored
+
+    async def run(self):
+        """Save a snapshot every `interval` seconds"""
+        if not self.path:
+            return
+        while True:
+            await asyncio.sleep(self.interval)
+            self.save()
+
+    def stats(self) -> Dict:
+        return {
+            "path": self.path,
+            "saves": self.saves,
+            "last_save": self.last_save,
+            "last_save_seconds": round(self.last_save_seconds, 4),
+            "restored": self.restored
+        }
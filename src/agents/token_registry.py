@@ -0,0 +1,169 @@
+import heapq
+import logging
+import math
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+from models.token import Token
+
+logger = logging.getLogger(__name__)
+
+EvictionCallback = Callable[[str, Token], None]
+
+@dataclass
+class RegistryEntry:
+    token: Token
+    admitted_at: float
+    last_active: float
+    activity: float = 1.0
+
+    def decayed_activity(self, now: float, half_life: float) -> float:
+        return self.activity * 0.5 ** ((now - self.last_active) / half_life)
+
+class TokenRegistry:
+    """Bounded set of tracked tokens keyed by address
+
+    Behaves like the dict it replaces for reads. New tokens are admitted only
+    if their liquidity (when known) meets `min_liquidity`. Tokens idle for
+    longer than `ttl` are swept, and when the registry is full the tokens with
+    the highest eviction score go first: the score grows with idle time and
+    risk and shrinks with recent activity (analyses and client lookups, decayed
+    with `activity_half_life`). Eviction callbacks release per-token state held
+    elsewhere.
+    """
+
+    def __init__(self,
+                 max_tokens: int = 1000,
+                 min_liquidity: float = 0,
+                 ttl: float = 86400,
+                 activity_half_life: float = 3600,
+                 evict_fraction: float = 0.05,
+                 clock: Callable[[], float] = time.time):
+        self.max_tokens = max_tokens
+        self.min_liquidity = min_liquidity
+        self.ttl = ttl
+        self.activity_half_life = activity_half_life
+        # Evict a small batch at once so a full registry doesn't rescan on every admission
+        self.evict_count = max(1, int(max_tokens * evict_fraction))
+        self.clock = clock
+        self.admitted = 0
+        self.rejected = 0
+        self.evicted = 0
+        self.expired = 0
+        self._entries: Dict[str, RegistryEntry] = {}
+        self._callbacks: List[EvictionCallback] = []
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, address: str) -> bool:
+        return address in self._entries
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._entries)
+
+    def __getitem__(self, address: str) -> Token:
+        return self._entries[address].token
+
+    def get(self, address: str, default: Optional[Token] = None) -> Optional[Token]:
+        entry = self._entries.get(address)
+        return entry.token if entry is not None else default
+
+    def keys(self) -> List[str]:
+        return list(self._entries)
+
+    def values(self) -> List[Token]:
+        return [entry.token for entry in self._entries.values()]
+
+    def items(self) -> List[Tuple[str, Token]]:
+        return [(address, entry.token) for address, entry in self._entries.items()]
+
+    def on_evict(self, callback: EvictionCallback):
+        """Register a callback run with (address, token) whenever a token leaves"""
+        self._callbacks.append(callback)
+
+    def admit(self, token: Token, liquidity: Optional[float] = None) -> bool:
+        """Track a token, evicting others if full; False if it fails admission"""
+        if token.address in self._entries:
+            self.touch(token.address)
+            return True
+        if liquidity is not None and liquidity < self.min_liquidity:
+            self.rejected += 1
+            logger.debug(f"Rejected {token.address}: liquidity {liquidity} below {self.min_liquidity}")
+            return False
+
+        if len(self._entries) >= self.max_tokens:
+            self.sweep()
+        if len(self._entries) >= self.max_tokens:
+            self._evict_batch()
+
+        now = self.clock()
+        self._entries[token.address] = RegistryEntry(token, now, now)
+        self.admitted += 1
+        return True
+
+    def restore(self, token: Token, admitted_at: float, last_active: float, activity: float) -> bool:
+        """Re-track a token from a snapshot without admission checks; False if full"""
+        if len(self._entries) >= self.max_tokens and token.address not in self._entries:
+            return False
+        self._entries[token.address] = RegistryEntry(token, admitted_at, last_active, activity)
+        return True
+
+    def entry_state(self, address: str) -> List[float]:
+        entry = self._entries[address]
+        return [entry.admitted_at, entry.last_active, entry.activity]
+
+    def touch(self, address: str, weight: float = 1.0):
+        """Record activity on a token, keeping it from being evicted"""
+        entry = self._entries.get(address)
+        if entry is None:
+            return
+        now = self.clock()
+        entry.activity = entry.decayed_activity(now, self.activity_half_life) + weight
+        entry.last_active = now
+
+    def eviction_score(self, entry: RegistryEntry, now: float) -> float:
+        idle = (now - entry.last_active) / self.ttl
+        risk = entry.token.risk_score / 100
+        return idle + risk - math.log1p(entry.decayed_activity(now, self.activity_half_life))
+
+    def _evict_batch(self):
+        now = self.clock()
+        victims = heapq.nlargest(
+            self.evict_count,
+            self._entries.items(),
+            key=lambda item: self.eviction_score(item[1], now)
+        )
+        for address, _ in victims:
+            self.remove(address)
+            self.evicted += 1
+
+    def sweep(self) -> int:
+        """Remove tokens idle for longer than the TTL; returns how many were removed"""
+        cutoff = self.clock() - self.ttl
+        expired = [address for address, entry in self._entries.items() if entry.last_active < cutoff]
+        for address in expired:
+            self.remove(address)
+        self.expired += len(expired)
+        return len(expired)
+
+    def remove(self, address: str) -> Optional[Token]:
+        entry = self._entries.pop(address, None)
+        if entry is None:
+            return None
+        for callback in self._callbacks:
+            try:
+                callback(address, entry.token)
+            except Exception as e:
+                logger.error(f"Eviction callback failed for {address}: {e}")
+        return entry.token
+
+    def stats(self) -> Dict:
+        return {
+            "tokens": len(self._entries),
+            "max_tokens": self.max_tokens,
+            "admitted": self.admitted,
+            "rejected": self.rejected,
+            "evicted": self.evicted,
+            "expired": self.expired
+        }
@@ -1,56 +1,254 @@
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple
 from datetime import datetime
 import asyncio
 from models.token import Token, TokenStatus, TradingSignal
 from models.developer import Developer
+from models.transaction import TransactionRecord
 from analyzers.transaction_analyzer import TransactionAnalyzer
 from analyzers.chart_analyzer import ChartAnalyzer
-from .sentiment_agent import SentimentAnalyzer
+from analyzers.risk_scorer import BatchRiskScorer, RiskInputs, SIGNALS
+from analyzers.text_scorer import TextScorer
+from data.candle_store import CandleStore, CandleFrame
+from data.transaction_log import TransactionLog, to_records
+from data.decoders import birdeye_transactions
+from data.sentiment_history import SentimentHistory
+from .pipeline import Pipeline, Stage
+from .token_registry import TokenRegistry
+from .refresh_scheduler import RefreshScheduler
+from .sentiment_enricher import SentimentEnricher
+from .sentiment_agent import SentimentAnalyzer, make_backend
+from .snapshot import AgentSnapshot
 from api.websocket import websocket_manager
 import aiohttp
 import logging
 import base58
 from utils.rpc import make_rpc_call
+from utils.cache import ResponseCache, TTLCache, candle_ttl, interval_to_seconds
+from utils.singleflight import SingleFlight
+from utils.json_codec import read_json
+from utils.capture import capture
+import math
 import time
+import numpy as np
 
 logger = logging.getLogger(__name__)
 
 class TradingAgent:
-    def __init__(self, config: Dict):
+    def __init__(self, config: Dict, publisher=None):
         if not config.get("rpc_url"):
             raise ValueError("RPC URL is required")
         if not config.get("birdeye_api_key"):
             raise ValueError("Birdeye API key is required")
         
+        # Anything with the WebSocketManager broadcast methods; sharded workers publish over IPC
+        self.publisher = publisher or websocket_manager
+        # Sharded workers narrow this to the addresses they own
+        self.owns = lambda address: True
+        
         self.transaction_analyzer = TransactionAnalyzer()
         self.chart_analyzer = ChartAnalyzer()
+        sentiment_config = config.get("sentiment", {})
         self.sentiment_analyzer = SentimentAnalyzer(
             config["twitter_api_key"],
-            config["twitter_api_secret"]
+            config["twitter_api_secret"],
+            scorer=TextScorer(
+                workers=sentiment_config.get("scoring_workers", 2),
+                batch_size=sentiment_config.get("scoring_batch_size", 64),
+                max_cached=sentiment_config.get("scoring_cache_size", 20000),
+                score_batch=make_backend(sentiment_config.get("backend", "textblob")).score_batch
+            ),
+            cache=TTLCache(
+                max_entries=sentiment_config.get("cache_size", 1024),
+                default_ttl=sentiment_config.get("cache_ttl", 300),
+                stale_ttl=sentiment_config.get("cache_stale_ttl", 3600),
+                persist_path=sentiment_config.get("cache_path"),
+                persist_interval=sentiment_config.get("cache_persist_interval", 60)
+            ),
+            query_max_length=sentiment_config.get("query_max_length", 512),
+            window_hours=sentiment_config.get("window_hours", 24),
+            max_pages=sentiment_config.get("max_pages", 10),
+            twitter_deadline=sentiment_config.get("twitter_deadline", 20.0),
+            source_config=sentiment_config.get("sources", {})
+        )
+        self.sentiment_enricher = SentimentEnricher(
+            self.sentiment_analyzer,
+            lookup=lambda address: self.active_tokens.get(address),
+            on_result=self._apply_sentiment,
+            refresh_interval=sentiment_config.get("refresh_interval", 900),
+            batch_size=sentiment_config.get("batch_size", 20),
+            retry_delay=sentiment_config.get("retry_delay", 30)
         )
+        self.sentiment_history = SentimentHistory(sentiment_config.get("history_path", "data/sentiment"))
         
-        self.active_tokens: Dict[str, Token] = {}
-        self.risk_threshold = config.get("risk_threshold", 70)
+        monitoring_config = config.get("monitoring", {})
+        self.active_tokens = TokenRegistry(
+            max_tokens=monitoring_config.get("max_tokens", 1000),
+            min_liquidity=monitoring_config.get("min_liquidity", 0),
+            ttl=monitoring_config.get("token_ttl_hours", 24) * 3600
+        )
+        self.active_tokens.on_evict(self._release_token)
+        self.scorer = BatchRiskScorer(config)
         self.min_confidence = config.get("min_confidence", 0.6)
         self.rpc_url = config["rpc_url"]
         self.birdeye_api_key = config["birdeye_api_key"]
         self.last_fetch_time = None
         
-    async def process_new_token(self, token_data: Dict):
-        """Process a newly discovered token"""
-        token = Token(
-            address=token_data["address"],
-            name=token_data["name"],
-            creator_address=token_data["creator_address"]
+        cache_config = config.get("cache", {})
+        self.response_cache = ResponseCache(
+            max_entries=cache_config.get("max_entries", 1024),
+            persist_path=cache_config.get("path"),
+            persist_interval=cache_config.get("persist_interval", 30)
+        )
+        self.trending_ttl = cache_config.get("trending_ttl", 60)
+        self.price_interval = "1H"
+        self.price_window = 24
+        self.price_pages = 10
+        self.candle_store = CandleStore(
+            config.get("candles", {}).get("path", "data/candles"),
+            interval=self.price_interval
         )
+        transaction_config = config.get("transactions", {})
+        self.transaction_log = TransactionLog(transaction_config.get("path", "data/transactions"))
+        self.transaction_window = transaction_config.get("window_hours", 24) * 3600
+        self.singleflight = SingleFlight()
+        self.fingerprints: Dict[str, Tuple] = {}
+        self.fingerprint_checks = 0
+        self.fingerprint_skips = 0
         
-        self.active_tokens[token.address] = token
-        await self.analyze_token(token)
+        scheduler_config = config.get("scheduler", {})
+        self.scheduler = RefreshScheduler(
+            base_interval=scheduler_config.get("base_interval", 300),
+            min_interval=scheduler_config.get("min_interval", 5),
+            max_interval=scheduler_config.get("max_interval", 1800),
+            volume_half_life=scheduler_config.get("volume_half_life", 600)
+        )
+        
+        pipeline_config = config.get("pipeline", {})
+        queue_size = pipeline_config.get("queue_size", 32)
+        self.pipeline = Pipeline([
+            Stage("discover", self._discover_stage, pipeline_config.get("discover_workers", 1), queue_size),
+            Stage("fetch", self._fetch_stage, pipeline_config.get("fetch_workers", 8), queue_size),
+            Stage("analyze", self._analyze_stage, pipeline_config.get("analyze_workers", 2), queue_size),
+            Stage("publish", self._publish_stage, pipeline_config.get("publish_workers", 1), queue_size)
+        ])
+        # Scheduled refreshes start from already tracked tokens
+        self.refresh_pipeline = Pipeline([
+            Stage("fetch", self._fetch_stage, pipeline_config.get("fetch_workers", 8), queue_size),
+            Stage("analyze", self._analyze_stage, pipeline_config.get("analyze_workers", 2), queue_size),
+            Stage("publish", self._publish_stage, pipeline_config.get("publish_workers", 1), queue_size)
+        ])
+        
+        snapshot_config = config.get("snapshot", {})
+        self.snapshot = AgentSnapshot(
+            self,
+            snapshot_config.get("path"),
+            interval=snapshot_config.get("interval", 60),
+            max_age=snapshot_config.get("max_age_hours", 24) * 3600
+        )
+        
+    async def process_new_token(self, token_data: Dict):
+        """Process a newly discovered token"""
+        token = await self._discover_stage(token_data)
+        if token is not None:
+            await self.analyze_token(token)
         
     async def analyze_token(self, token: Token):
         """Run comprehensive analysis on a token"""
+        # An explicit request always reanalyzes, even if the inputs are unchanged
+        self.fingerprints.pop(token.address, None)
+        fetched = await self._fetch_stage(token)
+        analyzed = await self._analyze_stage(fetched)
+        if analyzed is not None:
+            await self._publish_stage(analyzed)
+        
+    async def _discover_stage(self, token_data: Dict) -> Optional[Token]:
+        """Register a discovered token, or None if it fails admission"""
+        if not self.owns(token_data["address"]):
+            return None
+        
+        token = self.active_tokens.get(token_data["address"])
+        if token is None:
+            token = Token(
+                address=token_data["address"],
+                name=token_data["name"],
+                creator_address=token_data["creator_address"]
+            )
+        
+        # Listener discoveries carry no market data, so liquidity is only checked when known
+        if not self.active_tokens.admit(token, token_data.get("liquidity")):
+            return None
+        
+        token.symbol = token_data.get("symbol", token.symbol)
+        token.description = token_data.get("description", token.description)
+        token.logoURI = token_data.get("logoURI", token.logoURI)
+        token.volume24hUSD = token_data.get("volume24hUSD", token.volume24hUSD)
+        token.price = token_data.get("price", token.price)
+        token.liquidity = token_data.get("liquidity", token.liquidity)
+        
+        # Tracked tokens are refreshed by the scheduler once their deadline passes
+        if token.address in self.scheduler and not self.scheduler.is_due(token.address):
+            return None
+        self.scheduler.add(token.address, self.scheduler.base_interval)
+        return token
+        
+    def _release_token(self, address: str, token: Token):
+        """Drop per-token caches and memory maps when a token leaves the registry"""
+        self.fingerprints.pop(address, None)
+        self.scheduler.remove(address)
+        self.sentiment_enricher.discard(address)
+        self.candle_store.release(address)
+        self.transaction_log.release(address)
+        self.response_cache.invalidate(lambda key: address in key)
+        logger.info(f"Stopped tracking {token.name} ({address})")
+        
+    async def _fetch_stage(self, token: Token) -> Tuple[Token, List[TransactionRecord], CandleFrame]:
+        """Fetch transaction and price data concurrently"""
+        transactions, price_history = await asyncio.gather(
+            self._get_transactions(token),
+            self._get_price_history(token)
+        )
+        return token, transactions, price_history
+        
+    def _fingerprint(self, token: Token, transactions: List[TransactionRecord], price_history: CandleFrame) -> Tuple:
+        """Summarize everything an analysis result depends on"""
+        latest = self.transaction_log.latest(token.address)
+        last_signature = latest["signature"].decode() if latest is not None else None
+        # The newest candle is rewritten in place until it closes, so its values count too
+        last_candle = (
+            (int(price_history.time[-1]), float(price_history.close[-1]), float(price_history.volume[-1]))
+            if len(price_history) else None
+        )
+        settings = (self.price_interval, self.price_window, self.transaction_window)
+        # Transactions ageing out of the window change the result without a new signature
+        return last_signature, len(transactions), last_candle, settings
+        
+    def _is_unchanged(self, token: Token, transactions: List[TransactionRecord], price_history: CandleFrame) -> bool:
+        """Record the token's input fingerprint; True if it matches the last analysis"""
+        fingerprint = self._fingerprint(token, transactions, price_history)
+        self.fingerprint_checks += 1
+        if self.fingerprints.get(token.address) == fingerprint:
+            self.fingerprint_skips += 1
+            return True
+        self.fingerprints[token.address] = fingerprint
+        return False
+        
+    async def _analyze_stage(self, fetched: Tuple[Token, List[TransactionRecord], CandleFrame]) -> Optional[Tuple[Token, Dict]]:
+        """Run the analyzers and update the token's metrics, risk and signal
+        
+        Returns None, skipping analysis and broadcast, when no new trades or
+        candles arrived since the token was last analyzed.
+        """
+        token, transactions, price_history = fetched
+        # Price-history candles carry no volume; trending refreshes the 24h figure
+        volume = token.volume24hUSD
+        if self._is_unchanged(token, transactions, price_history):
+            logger.debug(f"Inputs unchanged for {token.address}, skipping analysis")
+            self._reschedule(token, volume)
+            return None
+        self.active_tokens.touch(token.address)
+        
         # Notify clients that analysis is starting
-        await websocket_manager.broadcast_token_update({
+        await self.publisher.broadcast_token_update({
             "address": token.address,
             "name": token.name,
             "status": TokenStatus.ANALYZING.value,
@@ -59,31 +257,38 @@ class TradingAgent:
         
         token.status = TokenStatus.ANALYZING
         
-        # Get transaction and price data
-        transactions = await self._get_transactions(token)
-        price_history = await self._get_price_history(token)
-        
         # Run all analyses in parallel
         try:
-            # Run analyses separately to handle empty data
-            transaction_analysis = await self.transaction_analyzer.analyze_transactions(token, transactions) if transactions else {
-                "sniper_count": 0,
-                "bot_count": 0,
-                "insider_count": 0
-            }
+            async def analyze_transactions():
+                # Run analyses separately to handle empty data
+                if not transactions:
+                    return {"sniper_count": 0, "bot_count": 0, "insider_count": 0}
+                return await self.transaction_analyzer.analyze_transactions(token, transactions)
             
-            chart_analysis = await self.chart_analyzer.analyze_chart(price_history) if price_history else {
-                "natural_chart": True,
-                "patterns": []
-            }
+            async def analyze_chart():
+                if not price_history:
+                    return {"natural_chart": True, "patterns": []}
+                return await self.chart_analyzer.analyze_frame(price_history)
+            
+            transaction_analysis, chart_analysis = await asyncio.gather(
+                analyze_transactions(),
+                analyze_chart()
+            )
             
-            # Don't automatically analyze sentiment
-            sentiment_analysis = {"overall_sentiment": 0.0}
+            # Sentiment is filled in by the background enricher; a cached result,
+            # even a stale one, is used right away while the enricher refreshes it
+            cached_sentiment = self.sentiment_analyzer.cached_sentiment(token.symbol or token.name, token.name)
+            sentiment_analysis = {
+                "overall_sentiment": cached_sentiment["overall_sentiment"]
+                if cached_sentiment is not None else token.metrics.social_sentiment
+            }
         except Exception as e:
             logger.error(f"Error during analysis: {e}")
+            # Retry on the next refresh instead of keeping the fallback result
+            self.fingerprints.pop(token.address, None)
             transaction_analysis = {"sniper_count": 0, "bot_count": 0, "insider_count": 0}
             chart_analysis = {"natural_chart": True, "patterns": []}
-            sentiment_analysis = {"overall_sentiment": 0.0}
+            sentiment_analysis = {"overall_sentiment": token.metrics.social_sentiment}
         
         # Update token metrics
         token.metrics.sniper_count = transaction_analysis["sniper_count"]
@@ -91,6 +296,7 @@ class TradingAgent:
         token.metrics.insider_count = transaction_analysis["insider_count"]
         token.metrics.natural_chart = chart_analysis["natural_chart"]
         token.metrics.social_sentiment = sentiment_analysis["overall_sentiment"]
+        token.patterns = chart_analysis["patterns"]
         
         # Calculate risk score
         token.risk_score = self._calculate_risk_score(
@@ -101,22 +307,27 @@ class TradingAgent:
         
         # Determine trading signal
         token.trading_signal = self._determine_trading_signal(token)
-        token.status = TokenStatus.APPROVED if token.risk_score < self.risk_threshold else TokenStatus.SUSPICIOUS
+        token.status = TokenStatus.APPROVED if token.risk_score < self.scorer.risk_threshold else TokenStatus.SUSPICIOUS
+        self._reschedule(token, volume)
+        return token, chart_analysis
+        
+    def _reschedule(self, token: Token, volume: float):
+        """Schedule the next refresh and enrichment, unless the token was evicted meanwhile"""
+        if token.address not in self.active_tokens:
+            return
+        self.scheduler.observe(token.address, volume, token.risk_score)
+        self.sentiment_enricher.submit(token.address, self._sentiment_priority(token))
+        
+    async def _publish_stage(self, analyzed: Tuple[Token, Dict]):
+        """Broadcast the analysis result and any detected patterns"""
+        token, chart_analysis = analyzed
         
         # Notify connected clients about the analysis
-        await websocket_manager.broadcast_token_update({
-            "address": token.address,
-            "name": token.name,
-            "risk_score": token.risk_score,
-            "trading_signal": token.trading_signal.value,
-            "status": token.status.value,
-            "metrics": token.metrics.__dict__,
-            "logo_url": token.logo_url if hasattr(token, 'logo_url') else None
-        })
+        await self._broadcast_token(token)
         
         # Notify about detected patterns
         for pattern in chart_analysis.get("patterns", []):
-            await websocket_manager.broadcast_pattern_alert({
+            await self.publisher.broadcast_pattern_alert({
                 "token_address": token.address,
                 "pattern": {
                     "type": pattern,
@@ -125,139 +336,301 @@ class TradingAgent:
                 }
             })
         
+    async def _broadcast_token(self, token: Token):
+        await self.publisher.broadcast_token_update(token.encoded())
+        
+    def apply_remote_update(self, token_data: Dict) -> Optional[Token]:
+        """Mirror a token analyzed by a shard worker from its broadcast payload"""
+        token = self.active_tokens.get(token_data["address"])
+        if token is None:
+            token = Token(
+                address=token_data["address"],
+                name=token_data["name"],
+                creator_address=token_data.get("creator_address", "Unknown")
+            )
+            if not self.active_tokens.admit(token):
+                return None
+        
+        for field_name in ("symbol", "logoURI", "volume24hUSD", "price", "liquidity", "patterns", "risk_score"):
+            if field_name in token_data:
+                setattr(token, field_name, token_data[field_name])
+        for metric, value in token_data.get("metrics", {}).items():
+            setattr(token.metrics, metric, value)
+        if "trading_signal" in token_data:
+            token.trading_signal = TradingSignal(token_data["trading_signal"])
+        token.status = TokenStatus(token_data["status"])
+        self.active_tokens.touch(token.address)
+        return token
+        
+    def _sentiment_priority(self, token: Token) -> float:
+        """Enrich tokens whose signal sentiment could flip to BUY first, then by volume"""
+        could_buy = token.metrics.natural_chart and token.risk_score < self.scorer.risk_threshold
+        return (1.0 if could_buy else 0.0) + math.log10(1 + max(token.volume24hUSD, 0)) / 20
+        
+    async def _apply_sentiment(self, token: Token, sentiment: Dict):
+        """Patch in an enriched sentiment score, rescore and notify clients"""
+        token.metrics.social_sentiment = sentiment.get("overall_sentiment", 0.0)
+        # Kept so backtests can replay the sentiment the agent saw
+        self.sentiment_history.append(
+            token.address, time.time(), token.metrics.social_sentiment, sentiment.get("confidence", 0.0)
+        )
+        if token.status in (TokenStatus.APPROVED, TokenStatus.SUSPICIOUS):
+            self._rescore([token])
+        await self._broadcast_token(token)
+        
     def _calculate_risk_score(self, 
                             transaction_analysis: Dict,
                             chart_analysis: Dict,
                             sentiment_analysis: Dict) -> float:
         """Calculate overall risk score"""
-        risk_score = 50.0  # Start neutral
-        
-        # Transaction risks
-        risk_score += transaction_analysis["sniper_count"] * 2
-        risk_score += transaction_analysis["bot_count"] * 1.5
-        risk_score += transaction_analysis["insider_count"] * 3
-        
-        # Chart risks
-        if not chart_analysis["natural_chart"]:
-            risk_score += 20
-        
-        for pattern in chart_analysis["patterns"]:
-            if pattern == "pump_and_dump":
-                risk_score += 15
-            elif pattern == "wash_trading":
-                risk_score += 10
-                
-        # Sentiment risks
-        sentiment_score = sentiment_analysis["overall_sentiment"]
-        if sentiment_score < 0:
-            risk_score += abs(sentiment_score) * 10
-            
-        return min(100.0, max(0.0, risk_score))
+        inputs = RiskInputs.from_analyses(transaction_analysis, chart_analysis, sentiment_analysis)
+        return float(self.scorer.score(inputs)[0])
         
     def _determine_trading_signal(self, token: Token) -> TradingSignal:
         """Determine trading signal based on analysis"""
-        if token.risk_score >= self.risk_threshold:
-            return TradingSignal.SELL
-            
-        if token.metrics.social_sentiment > 0.5 and token.metrics.natural_chart:
-            return TradingSignal.BUY
+        inputs = RiskInputs.from_tokens([token])
+        return SIGNALS[self.scorer.signals(np.array([token.risk_score]), inputs)[0]]
+        
+    def rescore_all(self) -> int:
+        """Rescore every analyzed token from its stored metrics in one batch
+        
+        Nothing is refetched or reanalyzed; returns the number of tokens rescored.
+        """
+        tokens = [
+            token for token in self.active_tokens.values()
+            if token.status in (TokenStatus.APPROVED, TokenStatus.SUSPICIOUS)
+        ]
+        self._rescore(tokens)
+        return len(tokens)
+        
+    def _rescore(self, tokens: List[Token]):
+        if not tokens:
+            return
+        
+        inputs = RiskInputs.from_tokens(tokens)
+        risk_scores = self.scorer.score(inputs)
+        signals = self.scorer.signals(risk_scores, inputs)
+        for token, risk_score, signal in zip(tokens, risk_scores, signals):
+            token.risk_score = float(risk_score)
+            token.trading_signal = SIGNALS[signal]
+            token.status = TokenStatus.APPROVED if token.risk_score < self.scorer.risk_threshold else TokenStatus.SUSPICIOUS
+        
+    def update_scoring(self, **settings) -> int:
+        """Change scoring weights or thresholds and rescore all tokens"""
+        self.scorer.update(**settings)
+        rescored = self.rescore_all()
+        logger.info(f"Scoring settings changed to {self.scorer.settings()}, rescored {rescored} tokens")
+        return rescored
+        
+    async def _get_transactions(self, token: Token) -> List[TransactionRecord]:
+        """Fetch token transactions from blockchain
+        
+        New swaps are appended to the token's transaction log, which then serves
+        the whole analysis window, including swaps seen before a restart. Swaps
+        older than the window are pruned from the log.
+        """
+        fetched = await self._fetch_transactions(token)
+        if fetched:
+            added = self.transaction_log.append(token.address, fetched)
+            logger.debug(f"Logged {added} new transactions for {token.address}")
+        
+        window_start = time.time() - self.transaction_window
+        self.transaction_log.prune(token.address, window_start)
+        rows = self.transaction_log.since(token.address, window_start)
+        return to_records(rows)
+        
+    async def _fetch_transactions(self, token: Token) -> List[TransactionRecord]:
+        data = await self._birdeye_get(
+            "https://public-api.birdeye.so/defi/v2/token/txs",
+            params={
+                "address": token.address,
+                "chain": "solana",
+                "type": "swap",
+                "offset": 0,
+                "limit": 100
+            }
+        )
+        if not data:
+            return []
+        if not data.get("success"):
+            logger.debug(f"No transaction data available yet for {token.address}")
+            return []
             
-        return TradingSignal.WAIT
+        transactions = birdeye_transactions(data, token.address)
+        logger.info(f"Found {len(transactions)} transactions for {token.address}")
+        return transactions
         
-    async def _get_transactions(self, token: Token) -> List[Dict]:
-        """Fetch token transactions from blockchain"""
-        try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(
-                    "https://public-api.birdeye.so/defi/v2/token/txs",
-                    params={
-                        "address": token.address,
-                        "chain": "solana",
-                        "type": "swap",
-                        "offset": 0,
-                        "limit": 100
-                    },
-                    headers={
-                        "X-API-KEY": self.birdeye_api_key,
-                        "accept": "*/*"
-                    }
-                ) as response:
-                    if response.status != 200:
-                        logger.error(f"Failed to fetch transactions: {await response.text()}")
-                        return []
-                        
-                    data = await response.json()
-                    if not data.get("success"):
-                        logger.debug(f"No transaction data available yet for {token.address}")
-                        return []
-                    
-                    transactions = data.get("data", {}).get("items", [])
-                    logger.info(f"Found {len(transactions)} transactions for {token.address}")
-                    return transactions
-        except Exception as e:
-            logger.error(f"Error fetching transactions: {e}")
+    async def _get_price_history(self, token: Token) -> CandleFrame:
+        """Fetch token price history
+        
+        Candles are kept in the local candle store; only the tail after the last
+        stored candle is requested upstream, page by page until it reaches the
+        current candle, so the window served is never older than the store.
+        """
+        step = interval_to_seconds(self.price_interval)
+        current_open = int(time.time()) // step * step
+        since = self.candle_store.last_time(token.address)
+        for _ in range(self.price_pages):
+            items = await self._fetch_price_history(token, since)
+            if items:
+                self.candle_store.append(token.address, items)
+            last = self.candle_store.last_time(token.address)
+            if not items or last is None or last == since or last >= current_open:
+                break
+            since = last
+        else:
+            logger.warning(f"Price history for {token.address} is still behind after {self.price_pages} pages")
+        return self.candle_store.tail(token.address, self.price_window)
+        
+    async def _fetch_price_history(self, token: Token, since: Optional[int] = None) -> List[Dict]:
+        url = "https://public-api.birdeye.so/defi/v2/price/history"
+        params = {
+            "token": token.address,
+            "chain": "solana",
+            "interval": self.price_interval
+        }
+        if since is None:
+            params["limit"] = self.price_window
+        else:
+            # Everything from the last stored candle, which may still have been
+            # forming, to the close of the current one; the close keeps the
+            # cache key stable for the whole interval
+            step = interval_to_seconds(self.price_interval)
+            params["time_from"] = since
+            params["time_to"] = (int(time.time()) // step + 1) * step
+        
+        async def fetch():
+            return await self._birdeye_get(url, params, accept="application/json")
+        
+        # Candles only change once per interval, so cache until the current one closes
+        data = await self.response_cache.get(
+            url,
+            params,
+            fetch,
+            ttl=candle_ttl(self.price_interval),
+            stale_ttl=interval_to_seconds(self.price_interval)
+        )
+        if not data:
             return []
+        return data.get("data", {}).get("items", [])
+        
+    async def _birdeye_get(self, url: str, params: Dict, accept: str = "*/*") -> Optional[Dict]:
+        """GET a Birdeye endpoint and return the decoded body, or None on failure
+        
+        Concurrent calls with the same url and params share one upstream request.
+        """
+        key = ResponseCache.make_key(url, params)
+        return await self.singleflight.do(key, lambda: self._birdeye_fetch(url, params, accept))
         
-    async def _get_price_history(self, token: Token) -> List[Dict]:
-        """Fetch token price history"""
+    async def _birdeye_fetch(self, url: str, params: Dict, accept: str) -> Optional[Dict]:
         try:
             async with aiohttp.ClientSession() as session:
-                async with session.get(
-                    "https://public-api.birdeye.so/defi/v2/price/history",
-                    params={
-                        "token": token.address,
-                        "chain": "solana",
-                        "interval": "1H",
-                        "limit": 24
-                    },
+                response = await capture.request(
+                    session,
+                    "GET",
+                    url,
+                    params=params,
                     headers={
                         "X-API-KEY": self.birdeye_api_key,
-                        "accept": "application/json"
+                        "accept": accept
                     }
-                ) as response:
-                    if response.status != 200:
-                        logger.error(f"Failed to fetch price history: {await response.text()}")
-                        return []
-                        
-                    data = await response.json()
-                    return data.get("data", {}).get("items", [])
+                )
+                if response.status != 200:
+                    logger.error(f"Birdeye API error ({response.status}) for {url}: {await response.text()}")
+                    return None
+                    
+                return await read_json(response)
         except Exception as e:
-            logger.error(f"Error fetching price history: {e}")
-            return []
+            logger.error(f"Error fetching {url}: {e}")
+            return None
+        
+    def note_interest(self, address: str):
+        """Record a client looking at a token, so it is kept and refreshed sooner"""
+        self.active_tokens.touch(address)
+        self.scheduler.touch(address)
+        token = self.active_tokens.get(address)
+        if token is not None:
+            self.sentiment_enricher.submit(address, self._sentiment_priority(token) + 1.0)
+        
+    async def run_scheduler(self):
+        """Re-analyze tracked tokens as their refresh deadlines come due"""
+        await self.scheduler.run(self._refresh_tokens)
+        
+    async def _refresh_tokens(self, addresses: List[str]):
+        tokens = [self.active_tokens.get(address) for address in addresses]
+        await self.refresh_pipeline.run([token for token in tokens if token is not None])
+        
+    def get_stats(self) -> Dict:
+        """Report cache and request coalescing counters"""
+        return {
+            "active_tokens": self.active_tokens.stats(),
+            "response_cache": self.response_cache.stats(),
+            "singleflight": self.singleflight.stats(),
+            "capture": capture.stats(),
+            "pipeline": self.pipeline.last_run,
+            "refresh_pipeline": self.refresh_pipeline.last_run,
+            "scheduler": self.scheduler.stats(),
+            "sentiment_enricher": self.sentiment_enricher.stats(),
+            "text_scorer": self.sentiment_analyzer.scorer.stats(),
+            "sentiment_cache": self.sentiment_analyzer.sentiment_cache.stats(),
+            "sentiment_sources": self.sentiment_analyzer.sources.stats(),
+            "sentiment_truncated_searches": self.sentiment_analyzer.truncated_searches,
+            "snapshot": self.snapshot.stats(),
+            "fingerprint": {
+                "checked": self.fingerprint_checks,
+                "skipped": self.fingerprint_skips,
+                "skip_rate": self.fingerprint_skips / self.fingerprint_checks if self.fingerprint_checks else 0.0
+            }
+        }
         
     async def fetch_live_tokens(self):
-        """Fetch trending tokens from Birdeye"""
+        """Fetch trending tokens from Birdeye and analyze them"""
+        discovered = await self.discover_live_tokens()
+        if discovered is not None:
+            await self.analyze_discovered(discovered)
+        
+    async def analyze_discovered(self, discovered: List[Dict]):
+        """Analyze discovered tokens, then stop tracking idle ones"""
+        # Tokens move through the stages concurrently, so a refresh takes
+        # about as long as its slowest token rather than the sum of all
+        run = await self.pipeline.run(discovered)
+        logger.info(f"Analyzed {run['items']} tokens in {run['duration_seconds']}s")
+        
+        expired = self.active_tokens.sweep()
+        if expired:
+            logger.info(f"Stopped tracking {expired} idle tokens")
+        
+    async def discover_live_tokens(self) -> Optional[List[Dict]]:
+        """Trending tokens from Birdeye as token data, or None if the fetch failed"""
         logger.info("Fetching trending tokens from Birdeye...")
         
         if not self.birdeye_api_key:
             logger.error("No Birdeye API key configured")
-            return
+            return None
         
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(
-                    "https://public-api.birdeye.so/defi/token_trending",
-                    params={
-                        "chain": "solana",
-                        "page": 1,
-                        "perPage": 20,
-                        "sortBy": "v24hUSD",
-                        "sortOrder": "desc",
-                        "timeframe": "1H"
-                    },
-                    headers={
-                        "X-API-KEY": self.birdeye_api_key,
-                        "accept": "*/*"
-                    }
-                ) as response:
-                    if response.status != 200:
-                        error_text = await response.text()
-                        logger.error(f"Birdeye API error: {error_text}")
-                        logger.error(f"Status code: {response.status}")
-                        logger.error(f"Headers used: {response.request_info.headers}")
-                        return
-                        
-                    data = await response.json()
+            url = "https://public-api.birdeye.so/defi/token_trending"
+            params = {
+                "chain": "solana",
+                "page": 1,
+                "perPage": 20,
+                "sortBy": "v24hUSD",
+                "sortOrder": "desc",
+                "timeframe": "1H"
+            }
+            
+            async def fetch():
+                return await self._birdeye_get(url, params)
+            
+            data = await self.response_cache.get(
+                url,
+                params,
+                fetch,
+                ttl=self.trending_ttl,
+                stale_ttl=self.trending_ttl
+            )
+            if data is None:
+                return None
             
             if data.get("success") and isinstance(data.get("data", {}).get("tokens"), list):
                 tokens = data["data"]["tokens"]
@@ -266,6 +639,7 @@ class TradingAgent:
                     if token.get("logoURI")
                 ]
                 
+                discovered = []
                 for token in tokens_with_logos:
                     try:
                         token_address = token.get("address")
@@ -296,10 +670,13 @@ class TradingAgent:
                         # Log token data for debugging
                         logger.debug(f"Raw token data: {token}")
                         logger.info(f"Processing token: {token_data}")
-                        await self.process_new_token(token_data)
+                        discovered.append(token_data)
                     except Exception as e:
                         logger.error(f"Error processing token {token.get('address', 'unknown')}: {e}", exc_info=True)
+                
+                return discovered
             else:
                 logger.error(f"Invalid response from Birdeye: {data}")
         except Exception as e:
-            logger.error(f"Error fetching live tokens: {e}", exc_info=True) 
\ No newline at end of file
+            logger.error(f"Error fetching live tokens: {e}", exc_info=True)
+        return None 
\ No newline at end of file
@@ -0,0 +1,95 @@
+import re
+from dataclasses import dataclass, field, replace
+from typing import Dict, List, Pattern, Tuple
+
+# Recent search query length limit on the standard API tiers
+MAX_QUERY_LENGTH = 512
+QUERY_SUFFIX = " -is:retweet"
+
+# Characters that would otherwise be read as search operators or grouping
+_OPERATOR_CHARS = re.compile(r'[\s:()]')
+_OPERATOR_PREFIXES = ("-", "#", "@", "$")
+_OPERATOR_WORDS = ("OR", "AND")
+
+def _quote(term: str) -> str:
+    term = term.replace('"', "")
+    if (_OPERATOR_CHARS.search(term) or term.startswith(_OPERATOR_PREFIXES)
+            or term.upper() in _OPERATOR_WORDS):
+        return f'"{term}"'
+    return term
+
+def _pattern(term: str) -> str:
+    # Symbols are often written as cashtags; neither side may touch another word character
+    return rf"(?<![\w$])\$?{re.escape(term.lower())}(?!\w)"
+
+@dataclass
+class SearchTerm:
+    """One token's share of a batched search"""
+    key: str
+    symbol: str
+    name: str
+    symbol_only: bool = False
+    clause: str = field(init=False)
+    matcher: Pattern = field(init=False)
+
+    def __post_init__(self):
+        if self.symbol_only or self.symbol.lower() == self.name.lower():
+            terms = [self.symbol]
+        else:
+            terms = [self.symbol, self.name]
+        self.clause = f"({' OR '.join(_quote(term) for term in terms)})"
+        self.matcher = re.compile("|".join(_pattern(term) for term in terms))
+
+    def matches(self, text: str) -> bool:
+        return self.matcher.search(text.lower()) is not None
+
+    def narrowed(self) -> "SearchTerm":
+        """The same term searched by its symbol alone, keeping its key and name"""
+        return replace(self, symbol_only=True)
+
+class TweetBatcher:
+    """Packs many tokens' search clauses into one recent-search query
+
+    Clauses are added in the given (priority) order until the query would
+    exceed `max_length`. The disjunction is wrapped in parentheses because
+    AND binds tighter than OR, so the retweet filter applies to every clause.
+    A clause too long to fit even alone is narrowed to the token's symbol,
+    or left out if that is still too long, since Twitter rejects overlong
+    queries. Returned tweets are routed back to every token whose symbol or
+    name they mention.
+    """
+
+    def __init__(self, max_length: int = MAX_QUERY_LENGTH):
+        self.max_length = max_length
+
+    def pack(self, terms: List[SearchTerm]) -> Tuple[str, List[SearchTerm]]:
+        """Query for as many terms as fit, and the terms it covers (none if nothing fits)"""
+        included: List[SearchTerm] = []
+        length = len(QUERY_SUFFIX) + 2  # Parentheses around the disjunction
+        for term in terms:
+            if length + len(term.clause) > self.max_length:
+                term = term.narrowed()
+                if length + len(term.clause) > self.max_length:
+                    continue
+            added = len(term.clause) + (4 if included else 0)  # " OR " between clauses
+            if length + added > self.max_length:
+                continue
+            included.append(term)
+            length += added
+        if not included:
+            return "", included
+        query = f"({' OR '.join(term.clause for term in included)}){QUERY_SUFFIX}"
+        return query, included
+
+    def route(self, tweets: List[Dict], terms: List[SearchTerm]) -> Dict[str, List[int]]:
+        """Indexes into `tweets` that belong to each term's key"""
+        routed: Dict[str, List[int]] = {term.key: [] for term in terms}
+        if len(terms) == 1:
+            # Everything a single-token query returns is about that token
+            routed[terms[0].key] = list(range(len(tweets)))
+            return routed
+        for index, tweet in enumerate(tweets):
+            for term in terms:
+                if term.matches(tweet["text"]):
+                    routed[term.key].append(index)
+        return routed
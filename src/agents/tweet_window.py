@@ -0,0 +1,109 @@
+import time
+from collections import deque
+from datetime import datetime
+from typing import Dict, List, Optional
+
+BUCKET_SECONDS = 3600
+
+def recency_weight(age_seconds: float) -> float:
+    """Weight of a tweet that decays with its age in hours"""
+    return 1.0 / (1 + max(age_seconds, 0.0) / 3600)
+
+def tweet_time(tweet: Dict, default: float) -> float:
+    created_at = tweet.get("created_at")
+    if not created_at:
+        return default
+    try:
+        return datetime.fromisoformat(created_at.replace("Z", "+00:00")).timestamp()
+    except ValueError:
+        return default
+
+def tweet_id(tweet: Dict) -> Optional[int]:
+    try:
+        return int(tweet["id"])
+    except (KeyError, TypeError, ValueError):
+        return None
+
+class TweetWindow:
+    """Rolling window of one token's scored tweets in hourly buckets
+
+    Each bucket keeps the sentiment sum and tweet count of one hour, so adding
+    a tweet is O(1) and the recency-weighted score is a pass over at most
+    `hours` buckets, each weighted by the age of its midpoint. `since_id` is
+    the newest tweet already counted and is the token's search cursor. The
+    last `max_recent` tweets are kept as they were scored, for display.
+    """
+
+    def __init__(self, hours: int = 24, max_recent: int = 20):
+        self.hours = hours
+        self.since_id: Optional[int] = None
+        self._buckets: Dict[int, List[float]] = {}
+        self._recent: deque = deque(maxlen=max_recent)
+
+    def __len__(self) -> int:
+        return int(sum(count for _, count in self._buckets.values()))
+
+    def is_new(self, tweet: Dict) -> bool:
+        identifier = tweet_id(tweet)
+        return identifier is None or self.since_id is None or identifier > self.since_id
+
+    def add(self, tweet: Dict, sentiment: float, now: Optional[float] = None):
+        now = time.time() if now is None else now
+        created = tweet_time(tweet, now)
+        bucket = self._buckets.setdefault(int(created // BUCKET_SECONDS), [0.0, 0])
+        bucket[0] += sentiment
+        bucket[1] += 1
+        self._recent.append({
+            "text": tweet.get("text", ""),
+            "created_at": tweet.get("created_at", ""),
+            "sentiment": sentiment,
+            "time": created
+        })
+        identifier = tweet_id(tweet)
+        if identifier is not None and (self.since_id is None or identifier > self.since_id):
+            self.since_id = identifier
+
+    def expire(self, now: Optional[float] = None):
+        now = time.time() if now is None else now
+        oldest = int(now // BUCKET_SECONDS) - self.hours + 1
+        for hour in [hour for hour in self._buckets if hour < oldest]:
+            del self._buckets[hour]
+        if any(tweet["time"] < oldest * BUCKET_SECONDS for tweet in self._recent):
+            self._recent = deque(
+                (tweet for tweet in self._recent if tweet["time"] >= oldest * BUCKET_SECONDS),
+                maxlen=self._recent.maxlen
+            )
+
+    def recent(self, now: Optional[float] = None) -> List[Dict]:
+        """The most recently scored tweets still in the window, newest first"""
+        self.expire(now)
+        # Ties keep the latest added first
+        tweets = sorted(reversed(self._recent), key=lambda tweet: tweet["time"], reverse=True)
+        return [{name: tweet[name] for name in ("text", "created_at", "sentiment")} for tweet in tweets]
+
+    def score(self, now: Optional[float] = None) -> float:
+        """Recency-weighted mean sentiment of the tweets in the window"""
+        now = time.time() if now is None else now
+        self.expire(now)
+        weighted_sum = 0.0
+        total_weight = 0.0
+        for hour, (sentiment_sum, count) in self._buckets.items():
+            weight = recency_weight(now - (hour + 0.5) * BUCKET_SECONDS)
+            weighted_sum += sentiment_sum * weight
+            total_weight += count * weight
+        return weighted_sum / total_weight if total_weight > 0 else 0.0
+
+    def to_state(self) -> Dict:
+        return {
+            "since_id": self.since_id,
+            "buckets": {str(hour): bucket for hour, bucket in self._buckets.items()},
+            "recent": list(self._recent)
+        }
+
+    @classmethod
+    def from_state(cls, state: Dict, hours: int = 24) -> "TweetWindow":
+        window = cls(hours)
+        window.since_id = state.get("since_id")
+        window._buckets = {int(hour): list(bucket) for hour, bucket in state.get("buckets", {}).items()}
+        window._recent.extend(state.get("recent", []))
+        return window
@@ -0,0 +1,116 @@
+from typing import List, Dict, Iterable
+import numpy as np
+from dataclasses import dataclass, fields
+from models.token import Token, TradingSignal
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Signal codes used in the vectorized output
+SIGNALS = [TradingSignal.WAIT, TradingSignal.BUY, TradingSignal.SELL]
+WAIT, BUY, SELL = range(3)
+
+@dataclass
+class RiskInputs:
+    """Struct-of-arrays of every scored token's analysis results"""
+    sniper_count: np.ndarray
+    bot_count: np.ndarray
+    insider_count: np.ndarray
+    natural_chart: np.ndarray
+    pump_and_dump: np.ndarray
+    wash_trading: np.ndarray
+    sentiment: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.sniper_count)
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[Dict]) -> "RiskInputs":
+        rows = list(rows)
+        return cls(**{
+            field.name: np.array([row[field.name] for row in rows], dtype=bool if field.name == "natural_chart" else float)
+            for field in fields(cls)
+        })
+
+    @classmethod
+    def concat(cls, batches: List["RiskInputs"]) -> "RiskInputs":
+        return cls(**{
+            field.name: np.concatenate([getattr(batch, field.name) for batch in batches])
+            for field in fields(cls)
+        })
+
+    @classmethod
+    def from_analyses(cls, transaction_analysis: Dict, chart_analysis: Dict, sentiment_analysis: Dict) -> "RiskInputs":
+        patterns = chart_analysis["patterns"]
+        return cls.from_rows([{
+            "sniper_count": transaction_analysis["sniper_count"],
+            "bot_count": transaction_analysis["bot_count"],
+            "insider_count": transaction_analysis["insider_count"],
+            "natural_chart": chart_analysis["natural_chart"],
+            "pump_and_dump": patterns.count("pump_and_dump"),
+            "wash_trading": patterns.count("wash_trading"),
+            "sentiment": sentiment_analysis["overall_sentiment"]
+        }])
+
+    @classmethod
+    def from_tokens(cls, tokens: List[Token]) -> "RiskInputs":
+        return cls.from_rows({
+            "sniper_count": token.metrics.sniper_count,
+            "bot_count": token.metrics.bot_buyer_count,
+            "insider_count": token.metrics.insider_count,
+            "natural_chart": token.metrics.natural_chart,
+            "pump_and_dump": token.patterns.count("pump_and_dump"),
+            "wash_trading": token.patterns.count("wash_trading"),
+            "sentiment": token.metrics.social_sentiment
+        } for token in tokens)
+
+class BatchRiskScorer:
+    """Risk scores and trading signals for many tokens in one vectorized pass
+
+    The score starts neutral at 50 and adds transaction, chart and sentiment
+    risk. Each group is multiplied by its configured weight relative to the
+    mean weight, so equal weights reproduce the unweighted sum.
+    """
+
+    def __init__(self, config: Dict):
+        analysis_config = config.get("analysis", {})
+        self.transaction_weight = analysis_config.get("transaction_weight", 1.0)
+        self.chart_weight = analysis_config.get("chart_weight", 1.0)
+        self.sentiment_weight = analysis_config.get("sentiment_weight", 1.0)
+        self.risk_threshold = config.get("risk_threshold", 70)
+        self.buy_sentiment = analysis_config.get("buy_sentiment", 0.5)
+
+    def update(self, **settings):
+        """Change weights or thresholds; unknown names raise ValueError"""
+        for name, value in settings.items():
+            if name not in self.settings():
+                raise ValueError(f"Unknown scoring setting: {name}")
+            setattr(self, name, float(value))
+
+    def settings(self) -> Dict:
+        return {
+            "transaction_weight": self.transaction_weight,
+            "chart_weight": self.chart_weight,
+            "sentiment_weight": self.sentiment_weight,
+            "risk_threshold": self.risk_threshold,
+            "buy_sentiment": self.buy_sentiment
+        }
+
+    def score(self, inputs: RiskInputs) -> np.ndarray:
+        """Risk score in [0, 100] for every row"""
+        weights = np.array([self.transaction_weight, self.chart_weight, self.sentiment_weight])
+        weights = weights / weights.mean() if weights.mean() > 0 else np.ones(3)
+
+        transaction_risk = inputs.sniper_count * 2 + inputs.bot_count * 1.5 + inputs.insider_count * 3
+        chart_risk = (~inputs.natural_chart) * 20 + inputs.pump_and_dump * 15 + inputs.wash_trading * 10
+        sentiment_risk = np.abs(np.minimum(inputs.sentiment, 0)) * 10
+
+        risk = 50.0 + weights[0] * transaction_risk + weights[1] * chart_risk + weights[2] * sentiment_risk
+        return np.clip(risk, 0.0, 100.0)
+
+    def signals(self, risk: np.ndarray, inputs: RiskInputs) -> np.ndarray:
+        """Signal code for every row; index SIGNALS to get the TradingSignal"""
+        signals = np.full(len(risk), WAIT, dtype=np.int8)
+        signals[(inputs.sentiment > self.buy_sentiment) & inputs.natural_chart] = BUY
+        signals[risk >= self.risk_threshold] = SELL
+        return signals
@@ -0,0 +1,113 @@
+import asyncio
+import hashlib
+import logging
+import multiprocessing
+from collections import OrderedDict
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# (polarity in [-1, 1], subjectivity in [0, 1])
+Sentiment = Tuple[float, float]
+
+def score_texts(texts: List[str]) -> List[Sentiment]:
+    """Score a batch of texts with TextBlob (process pool entry point)"""
+    # Imported here so processes that never use TextBlob don't pay for loading it
+    from textblob import TextBlob
+    scores = []
+    for text in texts:
+        sentiment = TextBlob(text).sentiment
+        scores.append((sentiment.polarity, sentiment.subjectivity))
+    return scores
+
+def _text_key(text: str) -> bytes:
+    return hashlib.blake2b(text.encode(), digest_size=16).digest()
+
+class TextScorer:
+    """Sentiment scoring kept off the event loop
+
+    Texts are deduplicated, looked up in an LRU cache of scores keyed by a
+    hash of the text, and the remaining ones are scored in batches on a
+    process pool. With `workers=0` batches run on the loop's default thread
+    pool instead, which still frees the loop but shares the GIL. Batches are
+    scored by `score_batch`, TextBlob by default; it must be picklable to run
+    on the process pool.
+    """
+
+    def __init__(self, workers: Optional[int] = 2, batch_size: int = 64, max_cached: int = 20000,
+                 score_batch: Callable[[List[str]], List[Sentiment]] = score_texts):
+        self.score_batch = score_batch
+        self.workers = workers
+        self.batch_size = batch_size
+        self.max_cached = max_cached
+        self.hits = 0
+        self.misses = 0
+        self.batches = 0
+        self._cache: "OrderedDict[bytes, Sentiment]" = OrderedDict()
+        self._executor: Optional[Executor] = None
+
+    def _pool(self) -> Optional[Executor]:
+        if self.workers == 0:
+            return None
+        if multiprocessing.current_process().daemon:
+            # Daemonic processes (e.g. shard workers) may not have children
+            logger.warning("Scoring sentiment on threads; daemonic processes cannot start a process pool")
+            self.workers = 0
+            return None
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.workers)
+        return self._executor
+
+    async def score(self, texts: List[str]) -> List[Sentiment]:
+        """Sentiment of every text, in order"""
+        keys = [_text_key(text) for text in texts]
+        scored: Dict[bytes, Sentiment] = {}
+        pending: Dict[bytes, str] = {}
+        for key, text in zip(keys, texts):
+            if key in scored or key in pending:
+                self.hits += 1
+            elif key in self._cache:
+                self._cache.move_to_end(key)
+                scored[key] = self._cache[key]
+                self.hits += 1
+            else:
+                pending[key] = text
+                self.misses += 1
+
+        if pending:
+            loop = asyncio.get_running_loop()
+            pool = self._pool()
+            missing = list(pending.items())
+            batches = [missing[i:i + self.batch_size] for i in range(0, len(missing), self.batch_size)]
+            results = await asyncio.gather(*(
+                loop.run_in_executor(pool, self.score_batch, [text for _, text in batch])
+                for batch in batches
+            ))
+            self.batches += len(batches)
+            for batch, scores in zip(batches, results):
+                for (key, _), sentiment in zip(batch, scores):
+                    scored[key] = sentiment
+                    self._store(key, sentiment)
+        return [scored[key] for key in keys]
+
+    def _store(self, key: bytes, sentiment: Sentiment):
+        self._cache[key] = sentiment
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.max_cached:
+            self._cache.popitem(last=False)
+
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def stats(self) -> Dict:
+        lookups = self.hits + self.misses
+        return {
+            "cached": len(self._cache),
+            "hits": self.hits,
+            "misses": self.misses,
+            "batches": self.batches,
+            "hit_rate": self.hits / lookups if lookups else 0.0
+        }
@@ -1,7 +1,7 @@
 from fastapi import FastAPI, HTTPException, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, Response
 from pydantic import BaseModel
 from typing import List, Dict, Optional, Any
 from datetime import datetime
@@ -19,9 +19,12 @@ load_dotenv()
 logger = logging.getLogger(__name__)
 
 from agents.trading_agent import TradingAgent
+from agents.sharding import ShardedWorkers
 from models.token import Token, TokenStatus, TradingSignal
 from models.metrics import TokenMetrics
 from .websocket import websocket_manager
+from utils.capture import capture
+from utils.config import load_config
 
 app = FastAPI(title="Trading Assistant API")
 
@@ -30,7 +33,7 @@ rpc_url = os.getenv("SOLANA_RPC_URL")
 if not rpc_url:
     raise ValueError("SOLANA_RPC_URL environment variable is not set")
 
-# Background task for token fetching
+# Background task for token discovery; tracked tokens are re-analyzed by the scheduler
 async def fetch_tokens_periodically():
     while True:
         try:
@@ -41,18 +44,74 @@ async def fetch_tokens_periodically():
 
 @app.on_event("startup")
 async def startup_event():
-    logger.info("Starting token fetch background task")
+    # Serve the last known state right away; the scheduler refreshes it from there
+    trading_agent.snapshot.load()
+    create_task(trading_agent.snapshot.run())
+    if sharded_workers:
+        logger.info(f"Starting {sharded_workers.shards} agent shard workers")
+        sharded_workers.start()
+        create_task(sharded_workers.discover(trading_agent))
+        create_task(sharded_workers.relay(trading_agent, websocket_manager))
+        return
+    logger.info("Starting token fetch, refresh scheduler and sentiment background tasks")
     create_task(fetch_tokens_periodically())
+    create_task(trading_agent.run_scheduler())
+    create_task(trading_agent.sentiment_enricher.run())
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    if sharded_workers:
+        sharded_workers.stop()
+    trading_agent.snapshot.save()
+    trading_agent.response_cache.save()
+    trading_agent.sentiment_analyzer.close()
+    capture.close()
+
+# config.json supplies tuning (monitoring, analysis weights, sentiment, ...);
+# secrets and data file locations come from the environment
+CONFIG_PATH = os.getenv("CONFIG_PATH", os.path.join(os.path.dirname(__file__), "..", "..", "config.json"))
+
+# config.json ships "YOUR_..." placeholders for these; they must never be sent as credentials
+CREDENTIAL_KEYS = ("api_key", "twitter_api_key", "twitter_api_secret", "birdeye_api_key")
+
+def is_placeholder(value) -> bool:
+    return isinstance(value, str) and value.startswith("YOUR_")
+
+def build_agent_config(config_path: str = CONFIG_PATH) -> Dict:
+    config = load_config(config_path)
+    for key in CREDENTIAL_KEYS:
+        if is_placeholder(config.get(key)):
+            config[key] = None
+    config["birdeye_api_key"] = os.getenv("BIRDEYE_API_KEY", config.get("birdeye_api_key"))
+    for section, key, env_var in (
+        ("cache", "path", "HTTP_CACHE_PATH"),
+        ("snapshot", "path", "AGENT_SNAPSHOT_PATH"),
+        ("sentiment", "cache_path", "SENTIMENT_CACHE_PATH"),
+        ("sentiment", "history_path", "SENTIMENT_HISTORY_PATH")
+    ):
+        value = os.getenv(env_var)
+        if value:
+            config.setdefault(section, {})[key] = value
+    return config
+
+agent_config = build_agent_config()
+
+# AGENT_SHARDS > 0 moves fetching and analysis into that many worker processes;
+# this process then only mirrors their results and serves the API
+agent_shards = int(os.getenv("AGENT_SHARDS", "0"))
+sharded_workers = ShardedWorkers(agent_config, agent_shards) if agent_shards > 0 else None
+
+def mirror_config(config: Dict, shards: int) -> Dict:
+    """The API process mirrors every shard's tokens, so it holds shards times as many"""
+    monitoring = config.get("monitoring", {})
+    return dict(config, monitoring=dict(
+        monitoring, max_tokens=monitoring.get("max_tokens", 1000) * max(1, shards)
+    ))
 
 # Initialize trading agent with config
-trading_agent = TradingAgent({
-    "rpc_url": rpc_url,
-    "twitter_api_key": os.getenv("TWITTER_API_KEY"),
-    "twitter_api_secret": os.getenv("TWITTER_API_SECRET"),
-    "birdeye_api_key": os.getenv("BIRDEYE_API_KEY"),
-    "risk_threshold": 70,
-    "min_confidence": 0.6
-})
+trading_agent = TradingAgent(
+    mirror_config(agent_config, agent_shards) if sharded_workers else agent_config
+)
 
 logger.info(f"Initialized with RPC URL: {rpc_url}")
 
@@ -68,17 +127,22 @@ app.add_middleware(
 # Mount static files for web interface
 app.mount("/static", StaticFiles(directory="src/static"), name="static")
 
-class TokenAnalysis(BaseModel):
-    address: str
-    name: str
-    risk_score: float
-    trading_signal: str
-    status: str
-    metrics: Dict
-    patterns: List[str]
-    last_updated: datetime
+class TokenMetricsResponse(BaseModel):
+    volume_5m: float
+    sniper_count: int
+    bot_buyer_count: int
+    insider_count: int
+    dev_selling: bool
+    natural_chart: bool
+    social_sentiment: float
 
 class TokenResponse(BaseModel):
+    """Shape of Token.to_dict(), which the token endpoints return pre-encoded
+
+    It only documents the endpoints: they return Token.encoded() in a raw
+    Response, which FastAPI passes through without validating it.
+    """
+
     address: str
     name: str
     symbol: str
@@ -90,6 +154,12 @@ class TokenResponse(BaseModel):
     patterns: List[str]
     risk_score: float
     trading_signal: str
+    metrics: TokenMetricsResponse
+    version: int
+    updated_at: float
+
+    class Config:
+        extra = "forbid"
 
 @app.get("/")
 async def root():
@@ -98,53 +168,60 @@ async def root():
 @app.get("/tokens", response_model=List[TokenResponse])
 async def get_tokens():
     """Get all tracked tokens and their analysis"""
-    tokens = []
-    for token in trading_agent.active_tokens.values():
-        tokens.append({
-            "address": token.address,
-            "name": token.name,
-            "symbol": token.symbol,
-            "logoURI": token.logoURI,
-            "volume24hUSD": token.volume24hUSD,
-            "price": token.price,
-            "liquidity": token.liquidity,
-            "status": token.status.value,
-            "patterns": ["example_pattern"],
-            "risk_score": token.risk_score,
-            "trading_signal": token.trading_signal.value
-        })
-    return tokens
-
-@app.get("/tokens/{address}")
-async def get_token(address: str) -> TokenAnalysis:
+    # Each token caches its own encoding, so only changed tokens are re-encoded
+    body = b"[" + b",".join(token.encoded() for token in trading_agent.active_tokens.values()) + b"]"
+    return Response(content=body, media_type="application/json")
+
+@app.get("/tokens/{address}", response_model=TokenResponse)
+async def get_token(address: str):
     """Get detailed analysis for a specific token"""
     token = trading_agent.active_tokens.get(address)
     if not token:
         raise HTTPException(status_code=404, detail="Token not found")
-        
-    return TokenAnalysis(
-        address=token.address,
-        name=token.name,
-        risk_score=token.risk_score,
-        trading_signal=token.trading_signal.value,
-        status=token.status.value,
-        metrics=token.metrics.__dict__,
-        patterns=await pattern_analyzer.analyze_patterns(
-            await blockchain_data.get_price_history(token.address, token.creation_time),
-            await blockchain_data.get_transactions(token.address, token.creation_time)
-        ),
-        last_updated=datetime.now()
-    )
+    if sharded_workers:
+        sharded_workers.note_interest(address)
+    else:
+        trading_agent.note_interest(address)
+    return Response(content=token.encoded(), media_type="application/json")
+
+@app.get("/stats")
+async def get_stats():
+    """Report fetch cache and request coalescing counters"""
+    stats = trading_agent.get_stats()
+    if sharded_workers:
+        stats["shards"] = sharded_workers.stats()
+    stats["websocket"] = websocket_manager.stats()
+    return stats
+
+@app.get("/scoring")
+async def get_scoring():
+    """Current risk scoring weights and thresholds"""
+    return trading_agent.scorer.settings()
+
+@app.post("/scoring")
+async def update_scoring(settings: Dict[str, float]):
+    """Change scoring weights or thresholds and rescore all tracked tokens"""
+    try:
+        rescored = trading_agent.update_scoring(**settings)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {"status": "success", "settings": trading_agent.scorer.settings(), "rescored": rescored}
 
 @app.get("/api/twitter-sentiment")
 async def get_twitter_sentiment(symbol: str, name: str):
     """Get Twitter sentiment analysis for a token"""
     try:
         sentiment_data = await trading_agent.sentiment_analyzer.analyze_sentiment(symbol, name)
+        if sentiment_data is None:
+            raise HTTPException(status_code=503, detail="Sentiment unavailable, try again later")
         return {
             "sentiment_score": sentiment_data.get("overall_sentiment", 0),
-            "tweets": sentiment_data.get("tweets", [])
+            "tweets": sentiment_data.get("tweets", []),
+            "cache_age": sentiment_data.get("cache_age"),
+            "stale": sentiment_data.get("stale", False)
         }
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error getting Twitter sentiment: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -152,8 +229,11 @@ async def get_twitter_sentiment(symbol: str, name: str):
 @app.post("/tokens/analyze")
 async def analyze_token(address: str):
     """Trigger analysis for a specific token"""
+    token = trading_agent.active_tokens.get(address)
+    if not token:
+        raise HTTPException(status_code=404, detail="Token not found")
     try:
-        await trading_agent.analyze_token(address)
+        await trading_agent.analyze_token(token)
         return {"status": "success", "message": "Analysis completed"}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e)) 
@@ -1,43 +1,196 @@
 from fastapi import WebSocket, WebSocketDisconnect
-from typing import Dict, Set
+from typing import Deque, Dict, List, Optional, Set, Union
+from collections import deque
 import json
 import asyncio
+import logging
+import os
+import re
 from datetime import datetime
+from utils.json_codec import dumps
+
+logger = logging.getLogger(__name__)
+
+# What a client's full queue does with one more message: drop the oldest
+# queued message, replace the queued update for the same token (dropping the
+# oldest when there is none), or disconnect the client
+OVERFLOW_POLICIES = ("drop_oldest", "coalesce", "disconnect")
+
+# Token encodings start with the address, so updates can be coalesced without decoding them
+_ADDRESS = re.compile(rb'^\{\s*"address"\s*:\s*"((?:[^"\\]|\\.)*)"')
+
+def _token_key(token_data: Union[Dict, bytes]) -> Optional[str]:
+    if isinstance(token_data, bytes):
+        match = _ADDRESS.match(token_data)
+        return match.group(1).decode() if match else None
+    return token_data.get("address")
+
+class ClientQueue:
+    """Bounded outbound queue of one connection, drained by its own writer task
+
+    Queued entries are [key, text]. Under the coalesce policy a newer update
+    for a key blanks the queued one and goes to the back, so the client gets
+    only the latest state of each token, still in the order it changed.
+    """
+
+    def __init__(self, websocket: WebSocket, max_size: int, overflow: str):
+        self.websocket = websocket
+        self.max_size = max_size
+        self.overflow = overflow
+        self.pending: Deque[List] = deque()
+        self.keyed: Dict[str, List] = {}
+        self.size = 0  # Entries that have not been coalesced away
+        self.ready = asyncio.Event()
+        self.overflowed = False
+        self.task: Optional[asyncio.Task] = None
+        self.sent = 0
+        self.dropped = 0
+        self.coalesced = 0
+
+    def put(self, text: str, key: Optional[str] = None):
+        """Queue a message without waiting for the client"""
+        if self.overflowed:
+            return
+        if self.overflow == "coalesce" and key is not None and key in self.keyed:
+            self.keyed.pop(key)[1] = None
+            self.size -= 1
+            self.coalesced += 1
+        elif self.size >= self.max_size:
+            if self.overflow == "disconnect":
+                # The writer closes the connection; nothing more is queued
+                self.overflowed = True
+                self.ready.set()
+                return
+            self._drop_oldest()
+        entry = [key, text]
+        self.pending.append(entry)
+        self.size += 1
+        if self.overflow == "coalesce" and key is not None:
+            self.keyed[key] = entry
+            if len(self.pending) > 2 * self.max_size:
+                # Keep blanked entries from piling up behind a stalled client
+                self.pending = deque(entry for entry in self.pending if entry[1] is not None)
+        self.ready.set()
+
+    def _pop(self) -> Optional[str]:
+        key, text = self.pending.popleft()
+        if text is not None:
+            self.size -= 1
+            if key is not None:
+                self.keyed.pop(key, None)
+        return text
+
+    def _drop_oldest(self):
+        while self._pop() is None:
+            pass
+        self.dropped += 1
+
+    async def run(self, on_close):
+        """Send queued messages in order until the client goes away"""
+        try:
+            while True:
+                while not self.pending and not self.overflowed:
+                    self.ready.clear()
+                    await self.ready.wait()
+                if self.overflowed:
+                    logger.warning("Disconnecting WebSocket client that fell behind")
+                    await self.websocket.close(code=1013)
+                    break
+                text = self._pop()
+                if text is None:
+                    continue
+                await self.websocket.send_text(text)
+                self.sent += 1
+        except Exception as e:
+            logger.debug(f"WebSocket send failed: {e}")
+        on_close(self.websocket)
+
+    def start(self, on_close):
+        self.task = asyncio.create_task(self.run(on_close))
+
+    def stop(self):
+        if self.task is not None and self.task is not asyncio.current_task():
+            self.task.cancel()
 
 class WebSocketManager:
-    def __init__(self):
-        self.active_connections: Set[WebSocket] = set()
-        self.last_update: Dict = {}
-        
+    """Fans messages out to every client without waiting on any of them
+
+    Each broadcast is encoded once and put on every client's bounded queue;
+    a writer task per client sends from its queue, so a slow client only
+    falls behind itself and broadcasts return immediately.
+    """
+
+    def __init__(self, queue_size: int = 256, overflow: str = "coalesce"):
+        if overflow not in OVERFLOW_POLICIES:
+            raise ValueError(f"Unknown WebSocket overflow policy: {overflow}")
+        self.queue_size = queue_size
+        self.overflow = overflow
+        self.clients: Dict[WebSocket, ClientQueue] = {}
+        self.last_update: Optional[str] = None
+        self.broadcasts = 0
+        self.disconnected = 0
+        # Counts of clients that have already disconnected
+        self._closed_stats = {"sent": 0, "dropped": 0, "coalesced": 0}
+
+    @property
+    def active_connections(self) -> Set[WebSocket]:
+        return set(self.clients)
+
     async def connect(self, websocket: WebSocket):
         await websocket.accept()
-        self.active_connections.add(websocket)
-        
+        client = ClientQueue(websocket, self.queue_size, self.overflow)
+        self.clients[websocket] = client
+
         # Send initial data
         if self.last_update:
-            await websocket.send_json(self.last_update)
-    
+            client.put(self.last_update)
+        client.start(self.disconnect)
+
     def disconnect(self, websocket: WebSocket):
-        self.active_connections.remove(websocket)
-    
+        """Forget a client and stop its writer; safe to call more than once"""
+        client = self.clients.pop(websocket, None)
+        if client is None:
+            return
+        client.stop()
+        self.disconnected += 1
+        for name in self._closed_stats:
+            self._closed_stats[name] += getattr(client, name)
+
     async def broadcast(self, message: Dict):
         """Broadcast message to all connected clients"""
-        self.last_update = message
-        for connection in self.active_connections:
-            try:
-                await connection.send_json(message)
-            except Exception:
-                await self.disconnect(connection)
-                
-    async def broadcast_token_update(self, token_data: Dict):
-        """Broadcast token update to all connected clients"""
+        await self.broadcast_text(dumps(message).decode())
+
+    async def broadcast_text(self, text: str, key: Optional[str] = None):
+        """Queue an already encoded message, encoded once for all clients
+
+        Messages with the same `key` may be coalesced on a client's queue.
+        """
+        self.last_update = text
+        self.broadcasts += 1
+        for client in self.clients.values():
+            client.put(text, key)
+
+    async def broadcast_token_update(self, token_data: Union[Dict, bytes]):
+        """Broadcast token update to all connected clients
+
+        token_data may be a Token's pre-encoded JSON, which is spliced into
+        the message without decoding it.
+        """
+        key = _token_key(token_data)
+        if isinstance(token_data, bytes):
+            timestamp = datetime.now().isoformat()
+            await self.broadcast_text(
+                f'{{"type":"token_update","data":{token_data.decode()},"timestamp":"{timestamp}"}}',
+                key
+            )
+            return
         message = {
             "type": "token_update",
             "data": token_data,
             "timestamp": datetime.now().isoformat()
         }
-        await self.broadcast(message)
-        
+        await self.broadcast_text(dumps(message).decode(), key)
+
     async def broadcast_pattern_alert(self, pattern_data: Dict):
         """Broadcast pattern detection alert"""
         message = {
@@ -47,4 +200,23 @@ class WebSocketManager:
         }
         await self.broadcast(message)
 
-websocket_manager = WebSocketManager() 
\ No newline at end of file
+    def stats(self) -> Dict:
+        clients = list(self.clients.values())
+        return {
+            "connections": len(clients),
+            "overflow": self.overflow,
+            "queue_size": self.queue_size,
+            "broadcasts": self.broadcasts,
+            "disconnected": self.disconnected,
+            "queued": sum(client.size for client in clients),
+            "max_queued": max((client.size for client in clients), default=0),
+            **{
+                name: total + sum(getattr(client, name) for client in clients)
+                for name, total in self._closed_stats.items()
+            }
+        }
+
+websocket_manager = WebSocketManager(
+    queue_size=int(os.getenv("WS_QUEUE_SIZE", "256")),
+    overflow=os.getenv("WS_OVERFLOW_POLICY", "coalesce")
+)
\ No newline at end of file
@@ -1,12 +1,19 @@
 from typing import List, Dict, Optional
 import aiohttp
 from datetime import datetime, timedelta
+from models.transaction import TransactionRecord
+from utils.json_codec import read_json
+from utils.capture import capture
+from utils.singleflight import SingleFlight
+from .decoders import decode_signatures, decode_rpc_batch
 
 class BlockchainDataFetcher:
-    def __init__(self, rpc_url: str, api_key: str):
+    def __init__(self, rpc_url: str, api_key: str, singleflight: Optional[SingleFlight] = None):
         self.rpc_url = rpc_url
         self.api_key = api_key
         self.session = None
+        self.singleflight = singleflight or SingleFlight()
+        self.batch_size = 100
 
     async def get_session(self) -> aiohttp.ClientSession:
         if self.session is None or self.session.closed:
@@ -16,8 +23,14 @@ class BlockchainDataFetcher:
             })
         return self.session
 
-    async def get_transactions(self, token_address: str, start_time: datetime) -> List[Dict]:
+    async def get_transactions(self, token_address: str, start_time: datetime) -> List[TransactionRecord]:
         """Fetch token transactions from blockchain"""
+        return await self.singleflight.do(
+            ("transactions", token_address, start_time),
+            lambda: self._fetch_transactions(token_address, start_time)
+        )
+
+    async def _fetch_transactions(self, token_address: str, start_time: datetime) -> List[TransactionRecord]:
         session = await self.get_session()
         
         try:
@@ -35,18 +48,17 @@ class BlockchainDataFetcher:
                 "jsonrpc": "2.0"
             }
             
-            async with session.post(self.rpc_url, json=params) as response:
-                data = await response.json()
-                signatures = data.get("result", [])
+            response = await capture.request(session, "POST", self.rpc_url, json=params)
+            signatures = decode_signatures(await response.read())
+                
+            # Fetch transaction details in JSON-RPC batches
+            transactions = []
+            for i in range(0, len(signatures), self.batch_size):
+                transactions.extend(
+                    await self._get_transaction_details_batch(signatures[i:i + self.batch_size])
+                )
                 
-                # Fetch transaction details for each signature
-                transactions = []
-                for sig in signatures:
-                    tx_data = await self._get_transaction_details(sig["signature"])
-                    if tx_data:
-                        transactions.append(tx_data)
-                        
-                return transactions
+            return transactions
                 
         except Exception as e:
             print(f"Error fetching transactions: {e}")
@@ -56,6 +68,14 @@ class BlockchainDataFetcher:
                               start_time: datetime,
                               interval: str = "5m") -> List[Dict]:
         """Fetch token price history"""
+        return await self.singleflight.do(
+            ("price_history", token_address, start_time, interval),
+            lambda: self._fetch_price_history(token_address, start_time, interval)
+        )
+
+    async def _fetch_price_history(self, token_address: str,
+                                   start_time: datetime,
+                                   interval: str) -> List[Dict]:
         session = await self.get_session()
         
         try:
@@ -68,15 +88,15 @@ class BlockchainDataFetcher:
             }
             
             # Example using a DEX API endpoint
-            async with session.get(f"{self.rpc_url}/v1/prices", params=params) as response:
-                data = await response.json()
-                return self._format_price_data(data)
+            response = await capture.request(session, "GET", f"{self.rpc_url}/v1/prices", params=params)
+            data = await read_json(response)
+            return self._format_price_data(data)
                 
         except Exception as e:
             print(f"Error fetching price history: {e}")
             return []
 
-    async def _get_transaction_details(self, signature: str) -> Optional[Dict]:
+    async def _get_transaction_details(self, signature: str) -> Optional[TransactionRecord]:
         """Fetch detailed transaction information"""
         session = await self.get_session()
         
@@ -91,23 +111,46 @@ class BlockchainDataFetcher:
                 "jsonrpc": "2.0"
             }
             
-            async with session.post(self.rpc_url, json=params) as response:
-                data = await response.json()
-                return self._format_transaction_data(data.get("result", {}))
+            response = await capture.request(session, "POST", self.rpc_url, json=params)
+            data = await read_json(response)
+            return self._format_transaction_data(data.get("result", {}))
                 
         except Exception as e:
             print(f"Error fetching transaction details: {e}")
             return None
 
-    def _format_transaction_data(self, tx_data: Dict) -> Dict:
-        """Format raw transaction data into standardized format"""
-        return {
-            "signature": tx_data.get("transaction", {}).get("signatures", [])[0],
-            "timestamp": datetime.fromtimestamp(tx_data.get("blockTime", 0)),
-            "type": self._determine_transaction_type(tx_data),
-            "amount": self._extract_amount(tx_data),
-            "address": self._extract_address(tx_data)
-        }
+    async def _get_transaction_details_batch(self, signatures: List[str]) -> List[TransactionRecord]:
+        """Fetch several transactions with a single JSON-RPC batch request"""
+        session = await self.get_session()
+        
+        try:
+            batch = [
+                {
+                    "method": "getTransaction",
+                    "params": [signature, "json"],
+                    "id": i,
+                    "jsonrpc": "2.0"
+                }
+                for i, signature in enumerate(signatures)
+            ]
+            
+            response = await capture.request(session, "POST", self.rpc_url, json=batch)
+            results = decode_rpc_batch(await response.read())
+            return [self._format_transaction_data(result) for result in results if result]
+                
+        except Exception as e:
+            print(f"Error fetching transaction batch: {e}")
+            return []
+
+    def _format_transaction_data(self, tx_data: Dict) -> TransactionRecord:
+        """Format raw transaction data into a compact record"""
+        return TransactionRecord(
+            signature=tx_data.get("transaction", {}).get("signatures", [])[0],
+            timestamp=datetime.fromtimestamp(tx_data.get("blockTime", 0)),
+            type=self._determine_transaction_type(tx_data),
+            amount=self._extract_amount(tx_data),
+            address=self._extract_address(tx_data)
+        )
 
     def _format_price_data(self, price_data: Dict) -> List[Dict]:
         """Format raw price data into standardized format"""
@@ -1,52 +1,321 @@
 import asyncio
-from typing import Callable, List
-from solana.rpc.async_api import AsyncClient
-from solana.rpc.commitment import Confirmed
+import logging
+from typing import Callable, Dict, List, Optional
+import aiohttp
+from utils.json_codec import loads
+from utils.rpc import make_rpc_batch, make_rpc_call
+from .signature_cursor import BoundedLRUSet, SignatureCursor
+
+logger = logging.getLogger(__name__)
+
+TOKEN_PROGRAM_ID = "TokenkegQfeZyiNwAJbNbGKPFXCWuBvf9Ss623VQ5DA"
+MINT_ACCOUNT_SIZE = 82
+MINT_INSTRUCTIONS = ("initializeMint", "initializeMint2")
+MINT_LOG_MARKERS = ("Instruction: InitializeMint", "Instruction: InitializeMint2")
+
+def ws_url_for(rpc_url: str) -> str:
+    """Derive the websocket endpoint from an HTTP RPC URL"""
+    if rpc_url.startswith("https://"):
+        return "wss://" + rpc_url[len("https://"):]
+    if rpc_url.startswith("http://"):
+        return "ws://" + rpc_url[len("http://"):]
+    return rpc_url
 
 class BlockchainListener:
-    def __init__(self, rpc_url: str, callback: Callable):
-        self.client = AsyncClient(rpc_url, commitment=Confirmed)
+    def __init__(self, rpc_url: str, callback: Callable,
+                 mode: str = "poll",
+                 ws_url: Optional[str] = None,
+                 subscription: str = "logs",
+                 cursor_path: Optional[str] = None):
         self.callback = callback
         self.running = False
-        
+        self.rpc_url = rpc_url
+        self.ws_url = ws_url or ws_url_for(rpc_url)
+        self.mode = mode
+        self.subscription = subscription
+        self.reconnect_delay = 1.0
+        self.max_reconnect_delay = 30.0
+        self.poll_interval = 1.0
+        self.page_size = 1000
+        self.max_backlog = 5000
+        self.truncated_backlogs = 0
+        # Polled signatures carry no logs, so every one is fetched: in
+        # batched calls, a few batches at a time
+        self.fetch_batch_size = 100
+        self.max_concurrent_fetches = 4
+        # Resume point for polling, and for backfilling after a dropped subscription
+        self.cursor = SignatureCursor(TOKEN_PROGRAM_ID, persist_path=cursor_path)
+        self._seen_mints = BoundedLRUSet(10000)
+        self._ws: Optional[aiohttp.ClientWebSocketResponse] = None
+
     async def start_monitoring(self):
         """
         Start monitoring the blockchain for new token creations
         """
+        if self.mode == "subscribe":
+            await self.start_subscription()
+            return
+
         self.running = True
         while self.running:
             try:
-                # Get latest block
-                block = await self.client.get_recent_blockhash()
-                
-                # Look for token program interactions
-                signatures = await self.client.get_signatures_for_address(
-                    "TokenkegQfeZyiNwAJbNbGKPFXCWuBvf9Ss623VQ5DA"  # Solana Token Program
-                )
-                
-                for sig in signatures:
-                    tx = await self.client.get_transaction(sig.signature)
-                    if self._is_token_creation(tx):
-                        token_data = self._extract_token_data(tx)
-                        await self.callback(token_data)
-                        
-                await asyncio.sleep(1)  # Avoid rate limiting
-                
+                await self._poll_once()
+                await asyncio.sleep(self.poll_interval)  # Avoid rate limiting
+
             except Exception as e:
-                print(f"Error monitoring blockchain: {e}")
+                logger.error(f"Error monitoring blockchain: {e}")
                 await asyncio.sleep(5)  # Back off on error
-                
+        self.cursor.save()
+
+    async def _poll_once(self):
+        """Process Token Program signatures newer than the cursor, oldest first"""
+        entries = await self._fetch_new_signatures()
+        await self._process_entries(list(reversed(entries)))
+        self.cursor.save()
+
+    async def _fetch_new_signatures(self) -> List[Dict]:
+        """Page backwards from the chain head until reaching the high-water mark"""
+        entries: List[Dict] = []
+        before = None
+        while True:
+            options = {"limit": self.page_size}
+            if self.cursor.high_water:
+                options["until"] = self.cursor.high_water
+            if before:
+                options["before"] = before
+
+            response = await make_rpc_call(self.rpc_url, "getSignaturesForAddress", [TOKEN_PROGRAM_ID, options])
+            page = (response or {}).get("result") or []
+            entries.extend(page)
+
+            # Without a cursor only the latest page matters; with one, stop at the mark
+            if len(page) < self.page_size or not self.cursor.high_water:
+                return entries
+            if len(entries) >= self.max_backlog:
+                self._report_truncated_backlog(entries[-1])
+                return entries
+            before = page[-1]["signature"]
+
+    def _report_truncated_backlog(self, oldest: Dict):
+        """The newest max_backlog signatures are kept; older ones back to the mark are skipped"""
+        self.truncated_backlogs += 1
+        logger.warning(
+            f"Signature backlog exceeds {self.max_backlog}; skipping signatures after "
+            f"{self.cursor.high_water} (slot {self.cursor.high_water_slot}) and before "
+            f"{oldest['signature']} (slot {oldest.get('slot', 0)})"
+        )
+
+    async def start_subscription(self):
+        """
+        Stream new mints over an RPC websocket subscription, reconnecting with
+        exponential backoff and backfilling anything missed while disconnected
+        """
+        self.running = True
+        delay = self.reconnect_delay
+
+        async with aiohttp.ClientSession() as session:
+            while self.running:
+                try:
+                    async with session.ws_connect(self.ws_url, heartbeat=30) as ws:
+                        self._ws = ws
+                        await self._subscribe(ws)
+                        delay = self.reconnect_delay
+
+                        # Subscribe before backfilling so nothing falls in between
+                        if self.cursor.high_water:
+                            await self._backfill()
+
+                        async for message in ws:
+                            if message.type != aiohttp.WSMsgType.TEXT:
+                                break
+                            await self._handle_message(loads(message.data))
+
+                except (aiohttp.ClientError, asyncio.TimeoutError, OSError) as e:
+                    logger.warning(f"Subscription connection to {self.ws_url} failed: {e}")
+                except Exception as e:
+                    logger.error(f"Error in blockchain subscription: {e}", exc_info=True)
+                finally:
+                    self._ws = None
+
+                self.cursor.save()
+                if self.running:
+                    logger.info(f"Reconnecting to {self.ws_url} in {delay:.1f}s")
+                    await asyncio.sleep(delay)
+                    delay = min(delay * 2, self.max_reconnect_delay)
+
+    async def stop(self):
+        self.running = False
+        if self._ws is not None:
+            await self._ws.close()
+
+    async def _subscribe(self, ws: aiohttp.ClientWebSocketResponse):
+        if self.subscription == "program":
+            request = {
+                "jsonrpc": "2.0",
+                "id": 1,
+                "method": "programSubscribe",
+                "params": [
+                    TOKEN_PROGRAM_ID,
+                    {
+                        "commitment": "confirmed",
+                        "encoding": "jsonParsed",
+                        "filters": [{"dataSize": MINT_ACCOUNT_SIZE}]
+                    }
+                ]
+            }
+        else:
+            request = {
+                "jsonrpc": "2.0",
+                "id": 1,
+                "method": "logsSubscribe",
+                "params": [
+                    {"mentions": [TOKEN_PROGRAM_ID]},
+                    {"commitment": "confirmed"}
+                ]
+            }
+        await ws.send_json(request)
+        logger.info(f"Sent {request['method']} to {self.ws_url}")
+
+    async def _handle_message(self, message: Dict):
+        method = message.get("method")
+        if method is None:
+            if "error" in message:
+                logger.error(f"Subscription error: {message['error']}")
+            return
+
+        result = message.get("params", {}).get("result", {})
+        slot = result.get("context", {}).get("slot", 0)
+        value = result.get("value", {})
+
+        if method == "logsNotification":
+            if value.get("err") is None and self._logs_show_mint(value.get("logs", [])):
+                await self._process_signature(value["signature"], slot)
+            elif self.cursor.is_new(value["signature"]):
+                # Nothing to fetch, but it still moves the resume point forward
+                self.cursor.advance(value["signature"], slot)
+        elif method == "programNotification":
+            await self._process_mint_account(value, slot)
+
+    def _logs_show_mint(self, logs: List[str]) -> bool:
+        return any(marker in line for line in logs for marker in MINT_LOG_MARKERS)
+
+    async def _process_signature(self, signature: str, slot: int = 0, failed: bool = False):
+        if not self.cursor.is_new(signature):
+            return
+
+        if not failed:
+            response = await make_rpc_call(
+                self.rpc_url,
+                "getTransaction",
+                [signature, {"encoding": "jsonParsed", "maxSupportedTransactionVersion": 0}]
+            )
+            if response is None:
+                # Left unseen and behind the cursor, so a backfill can still pick it up
+                logger.error(f"Failed to fetch transaction {signature}")
+                return
+            tx = response.get("result")
+            if tx and self._is_token_creation(tx):
+                await self.callback(self._extract_token_data(tx))
+
+        self.cursor.advance(signature, slot)
+
+    async def _process_mint_account(self, value: Dict, slot: int):
+        mint = value.get("pubkey")
+        info = value.get("account", {}).get("data", {}).get("parsed", {}).get("info", {})
+        # Existing mints also change (supply, authorities); only report the first sighting
+        if not mint or mint in self._seen_mints:
+            return
+        self._seen_mints.add(mint)
+        await self.callback({
+            "address": mint,
+            "name": f"Token {mint[:8]}",
+            "creator_address": info.get("mintAuthority") or "Unknown",
+            "decimals": info.get("decimals"),
+            "slot": slot
+        })
+
+    async def _backfill(self):
+        """Replay signatures that landed after the high-water mark"""
+        entries = await self._fetch_new_signatures()
+        logger.info(f"Backfilling {len(entries)} signatures since {self.cursor.high_water}")
+        await self._process_entries(list(reversed(entries)))
+
+    async def _process_entries(self, entries: List[Dict]):
+        """Report mints among signatures given oldest first, advancing the cursor in order
+        
+        Transactions are fetched in batched calls with at most
+        `max_concurrent_fetches` in flight. A batch that fails stops processing
+        there, so the cursor never moves past a transaction that wasn't read,
+        and its signatures stay unseen for the next poll.
+        """
+        entries = [entry for entry in entries if self.cursor.is_new(entry["signature"])]
+        window = self.fetch_batch_size * self.max_concurrent_fetches
+        for start in range(0, len(entries), window):
+            chunks = [
+                entries[i:i + self.fetch_batch_size]
+                for i in range(start, min(start + window, len(entries)), self.fetch_batch_size)
+            ]
+            fetched = await asyncio.gather(*(self._fetch_transactions(chunk) for chunk in chunks))
+            for chunk, transactions in zip(chunks, fetched):
+                if transactions is None:
+                    logger.error(f"Failed to fetch transactions; resuming from {self.cursor.high_water} next time")
+                    return
+                for entry in chunk:
+                    tx = transactions.get(entry["signature"])
+                    if tx and self._is_token_creation(tx):
+                        await self.callback(self._extract_token_data(tx))
+                    self.cursor.advance(entry["signature"], entry.get("slot", 0))
+
+    async def _fetch_transactions(self, entries: List[Dict]) -> Optional[Dict[str, Dict]]:
+        """Transactions of the successful signatures among `entries`, by signature"""
+        signatures = [entry["signature"] for entry in entries if entry.get("err") is None]
+        responses = await make_rpc_batch(self.rpc_url, [
+            ("getTransaction", [signature, {"encoding": "jsonParsed", "maxSupportedTransactionVersion": 0}])
+            for signature in signatures
+        ])
+        if responses is None:
+            return None
+        return {
+            signature: (response or {}).get("result")
+            for signature, response in zip(signatures, responses)
+        }
+
+    def _find_mint_instruction(self, transaction: dict) -> Optional[Dict]:
+        message = transaction.get("transaction", {}).get("message", {})
+        instructions = list(message.get("instructions", []))
+        for inner in (transaction.get("meta") or {}).get("innerInstructions") or []:
+            instructions.extend(inner.get("instructions", []))
+
+        for instruction in instructions:
+            parsed = instruction.get("parsed")
+            if (instruction.get("programId") == TOKEN_PROGRAM_ID and
+                    isinstance(parsed, dict) and
+                    parsed.get("type") in MINT_INSTRUCTIONS):
+                return parsed
+        return None
+
     def _is_token_creation(self, transaction: dict) -> bool:
         """
         Check if transaction is a token creation
         """
-        # Implementation depends on specific blockchain
-        # Need to analyze transaction logs/instructions
-        pass
-        
+        if not isinstance(transaction, dict):
+            return False
+        return self._find_mint_instruction(transaction) is not None
+
     def _extract_token_data(self, transaction: dict) -> dict:
         """
         Extract relevant token data from creation transaction
         """
-        # Implementation depends on specific blockchain
-        pass 
\ No newline at end of file
+        info = self._find_mint_instruction(transaction).get("info", {})
+        mint = info.get("mint", "")
+        account_keys = transaction.get("transaction", {}).get("message", {}).get("accountKeys", [])
+        fee_payer = account_keys[0].get("pubkey") if account_keys and isinstance(account_keys[0], dict) else None
+
+        return {
+            "address": mint,
+            "name": f"Token {mint[:8]}",
+            "creator_address": info.get("mintAuthority") or fee_payer or "Unknown",
+            "decimals": info.get("decimals"),
+            "signature": transaction.get("transaction", {}).get("signatures", [None])[0],
+            "slot": transaction.get("slot")
+        }
@@ -0,0 +1,182 @@
+import logging
+import os
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+CANDLE_COLUMNS: Dict[str, np.dtype] = {
+    "time": np.dtype("<i8"),
+    "open": np.dtype("<f8"),
+    "high": np.dtype("<f8"),
+    "low": np.dtype("<f8"),
+    "close": np.dtype("<f8"),
+    "volume": np.dtype("<f8")
+}
+
+def normalize_candle(item: Dict) -> Optional[Tuple[int, float, float, float, float, float]]:
+    """Map a Birdeye OHLCV or price-history item to a (time, o, h, l, c, v) row"""
+    timestamp = item.get("unixTime", item.get("time"))
+    close = item.get("c", item.get("close", item.get("value")))
+    if timestamp is None or close is None:
+        return None
+    close = float(close)
+    return (
+        int(timestamp),
+        float(item.get("o", item.get("open", close))),
+        float(item.get("h", item.get("high", close))),
+        float(item.get("l", item.get("low", close))),
+        close,
+        float(item.get("v", item.get("volume", 0.0)) or 0.0)
+    )
+
+class CandleFrame:
+    """Read-only column views over a contiguous range of stored candles"""
+
+    def __init__(self, columns: Dict[str, np.ndarray]):
+        self.columns = columns
+
+    def __len__(self) -> int:
+        return len(self.columns["time"])
+
+    def __getitem__(self, name: str) -> np.ndarray:
+        return self.columns[name]
+
+    @property
+    def time(self) -> np.ndarray:
+        return self.columns["time"]
+
+    @property
+    def close(self) -> np.ndarray:
+        return self.columns["close"]
+
+    @property
+    def volume(self) -> np.ndarray:
+        return self.columns["volume"]
+
+    @classmethod
+    def empty(cls) -> "CandleFrame":
+        return cls({name: np.empty(0, dtype=dtype) for name, dtype in CANDLE_COLUMNS.items()})
+
+class CandleStore:
+    """Per-token OHLCV store of append-only, memory-mapped column files
+
+    Each token gets one file per column under <root>/<interval>/<address>/,
+    ordered by candle open time, which doubles as the time index. `read`
+    returns views into the memory maps, so slicing a range copies nothing;
+    `tail`, whose frames are held across refreshes, returns copies.
+    """
+
+    def __init__(self, root: str = "data/candles", interval: str = "1H"):
+        self.root = Path(root) / interval
+        self.interval = interval
+        self._maps: Dict[str, Tuple[int, Dict[str, np.ndarray]]] = {}
+
+    def _token_dir(self, address: str) -> Path:
+        return self.root / address
+
+    def _column_path(self, address: str, column: str) -> Path:
+        return self._token_dir(address) / f"{column}.bin"
+
+    def _row_count(self, address: str) -> int:
+        """Rows present in every column; a torn append leaves some columns longer"""
+        counts = []
+        for name, dtype in CANDLE_COLUMNS.items():
+            path = self._column_path(address, name)
+            counts.append(path.stat().st_size // dtype.itemsize if path.exists() else 0)
+        return min(counts)
+
+    def _columns(self, address: str) -> Dict[str, np.ndarray]:
+        rows = self._row_count(address)
+        cached = self._maps.get(address)
+        if cached is not None and cached[0] == rows:
+            return cached[1]
+
+        if rows == 0:
+            columns = CandleFrame.empty().columns
+        else:
+            columns = {
+                name: np.memmap(self._column_path(address, name), dtype=dtype, mode="r", shape=(rows,))
+                for name, dtype in CANDLE_COLUMNS.items()
+            }
+        self._maps[address] = (rows, columns)
+        return columns
+
+    def last_time(self, address: str) -> Optional[int]:
+        times = self._columns(address)["time"]
+        return int(times[-1]) if len(times) else None
+
+    def append(self, address: str, candles: Iterable[Dict]) -> int:
+        """Append candles newer than the stored tail; returns the number of new rows
+
+        A candle with the same open time as the last stored one replaces it, since
+        the most recent candle keeps changing until it closes.
+        """
+        rows = sorted(
+            {row[0]: row for row in map(normalize_candle, candles) if row is not None}.values()
+        )
+        if not rows:
+            return 0
+
+        last = self.last_time(address)
+        if last is not None:
+            current = [row for row in rows if row[0] == last]
+            if current:
+                self._rewrite_last(address, current[0])
+            rows = [row for row in rows if row[0] > last]
+        if not rows:
+            return 0
+
+        self._token_dir(address).mkdir(parents=True, exist_ok=True)
+        self._repair(address)
+        data = np.array(rows, dtype=np.float64).T
+        for i, (name, dtype) in enumerate(CANDLE_COLUMNS.items()):
+            with open(self._column_path(address, name), "ab") as f:
+                f.write(data[i].astype(dtype).tobytes())
+        return len(rows)
+
+    def _rewrite_last(self, address: str, row: Tuple):
+        for value, (name, dtype) in zip(row, CANDLE_COLUMNS.items()):
+            with open(self._column_path(address, name), "r+b") as f:
+                f.seek(-dtype.itemsize, os.SEEK_END)
+                f.write(np.array([value], dtype=dtype).tobytes())
+
+    def _repair(self, address: str):
+        """Truncate columns left longer than the others by an interrupted append"""
+        rows = self._row_count(address)
+        for name, dtype in CANDLE_COLUMNS.items():
+            path = self._column_path(address, name)
+            if path.exists() and path.stat().st_size != rows * dtype.itemsize:
+                logger.warning(f"Truncating torn candle column {path}")
+                with open(path, "r+b") as f:
+                    f.truncate(rows * dtype.itemsize)
+        self._maps.pop(address, None)
+
+    def read(self, address: str, start: Optional[int] = None, end: Optional[int] = None) -> CandleFrame:
+        """Zero-copy views of candles with start <= time < end (unix seconds)
+
+        The views see the last candle change in place while it is still
+        forming; copy them to keep a stable snapshot across appends.
+        """
+        columns = self._columns(address)
+        times = columns["time"]
+        lo = 0 if start is None else int(np.searchsorted(times, start, side="left"))
+        hi = len(times) if end is None else int(np.searchsorted(times, end, side="left"))
+        return CandleFrame({name: column[lo:hi] for name, column in columns.items()})
+
+    def tail(self, address: str, count: int) -> CandleFrame:
+        """Copies of the last `count` candles, unaffected by later appends or rewrites"""
+        columns = self._columns(address)
+        return CandleFrame({
+            name: np.array(column[-count:] if count else column[:0]) for name, column in columns.items()
+        })
+
+    def release(self, address: str):
+        """Drop the memory maps held for a token"""
+        self._maps.pop(address, None)
+
+    def tokens(self) -> List[str]:
+        if not self.root.exists():
+            return []
+        return sorted(path.name for path in self.root.iterdir() if path.is_dir())
@@ -0,0 +1,33 @@
+from typing import Dict, List, Optional, Union
+from models.transaction import TransactionRecord
+from utils.json_codec import loads
+
+def decode_signatures(body: Union[bytes, str], skip_failed: bool = True) -> List[str]:
+    """Decode a getSignaturesForAddress response into a list of signatures"""
+    data = loads(body)
+    entries = data.get("result") or []
+    return [
+        entry["signature"] for entry in entries
+        if not (skip_failed and entry.get("err"))
+    ]
+
+def decode_rpc_batch(body: Union[bytes, str]) -> List[Dict]:
+    """Decode a JSON-RPC batch response into results ordered by request id"""
+    data = loads(body)
+    if isinstance(data, dict):
+        data = [data]
+    data.sort(key=lambda item: item.get("id", 0))
+    return [item.get("result") for item in data]
+
+def birdeye_transactions(data: Dict, token_address: Optional[str] = None) -> List[TransactionRecord]:
+    """Transaction records of a decoded Birdeye token txs response, skipping swaps without a side"""
+    if not data.get("success"):
+        return []
+    items = (data.get("data") or {}).get("items") or []
+    from_birdeye = TransactionRecord.from_birdeye
+    records = (from_birdeye(item, token_address) for item in items)
+    return [record for record in records if record is not None]
+
+def decode_birdeye_transactions(body: Union[bytes, str], token_address: Optional[str] = None) -> List[TransactionRecord]:
+    """Decode a Birdeye token txs response straight into transaction records"""
+    return birdeye_transactions(loads(body), token_address)
@@ -0,0 +1,244 @@
+"""Local stand-in for a Solana RPC node.
+
+Serves JSON-RPC over HTTP POST and logsSubscribe/programSubscribe over a
+websocket on the same URL, so BlockchainListener can be exercised offline:
+
+    python src/data/rpc_standin.py --port 8899 --mint-every 2
+"""
+import argparse
+import asyncio
+import itertools
+import json
+import logging
+import random
+import string
+from typing import Dict, List, Optional, Set, Tuple
+from aiohttp import web, WSMsgType
+
+logger = logging.getLogger(__name__)
+
+TOKEN_PROGRAM_ID = "TokenkegQfeZyiNwAJbNbGKPFXCWuBvf9Ss623VQ5DA"
+BASE58 = "".join(c for c in string.ascii_letters + string.digits if c not in "0OIl")
+
+def random_base58(length: int) -> str:
+    return "".join(random.choice(BASE58) for _ in range(length))
+
+class RPCStandinServer:
+    def __init__(self, host: str = "127.0.0.1", port: int = 0):
+        self.host = host
+        self.port = port
+        self.slot = 1000
+        self.transactions: Dict[str, Dict] = {}
+        self.signatures: List[Dict] = []  # oldest first
+        self.requests: List[str] = []
+        self.batch_sizes: List[int] = []
+        self._subscription_ids = itertools.count(1)
+        self._subscriptions: Dict[int, Tuple[web.WebSocketResponse, str]] = {}
+        self._sockets: Set[web.WebSocketResponse] = set()
+        self._runner: Optional[web.AppRunner] = None
+
+    @property
+    def http_url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    @property
+    def ws_url(self) -> str:
+        return f"ws://{self.host}:{self.port}"
+
+    async def start(self):
+        app = web.Application()
+        app.router.add_get("/", self._handle_ws)
+        app.router.add_post("/", self._handle_rpc)
+        self._runner = web.AppRunner(app)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, self.host, self.port)
+        await site.start()
+        if self.port == 0:
+            self.port = site._server.sockets[0].getsockname()[1]
+        logger.info(f"RPC stand-in listening on {self.http_url}")
+
+    async def stop(self):
+        await self.disconnect_all()
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    async def disconnect_all(self):
+        """Drop every websocket client, e.g. to exercise reconnects"""
+        for ws in list(self._sockets):
+            await ws.close()
+        self._sockets.clear()
+        self._subscriptions.clear()
+
+    async def add_mint(self, mint: Optional[str] = None, authority: Optional[str] = None,
+                       notify: bool = True) -> str:
+        """Record a mint-creation transaction and notify subscribers; returns its signature"""
+        mint = mint or random_base58(44)
+        authority = authority or random_base58(44)
+        logs = [
+            f"Program {TOKEN_PROGRAM_ID} invoke [1]",
+            "Program log: Instruction: InitializeMint2",
+            f"Program {TOKEN_PROGRAM_ID} success"
+        ]
+        instruction = {
+            "programId": TOKEN_PROGRAM_ID,
+            "program": "spl-token",
+            "parsed": {
+                "type": "initializeMint2",
+                "info": {"mint": mint, "decimals": 6, "mintAuthority": authority}
+            }
+        }
+        signature = self.add_transaction(logs, [instruction], fee_payer=authority)
+        if notify:
+            await self._notify_logs(signature, logs)
+            await self._notify_account(mint, {
+                "decimals": 6,
+                "mintAuthority": authority,
+                "supply": "0",
+                "isInitialized": True
+            })
+        return signature
+
+    async def add_activity(self, notify: bool = True) -> str:
+        """Record a Token Program transaction that is not a mint"""
+        logs = [
+            f"Program {TOKEN_PROGRAM_ID} invoke [1]",
+            "Program log: Instruction: Transfer",
+            f"Program {TOKEN_PROGRAM_ID} success"
+        ]
+        signature = self.add_transaction(logs, [{
+            "programId": TOKEN_PROGRAM_ID,
+            "parsed": {"type": "transfer", "info": {}}
+        }])
+        if notify:
+            await self._notify_logs(signature, logs)
+        return signature
+
+    def add_transaction(self, logs: List[str], instructions: List[Dict],
+                        fee_payer: Optional[str] = None) -> str:
+        self.slot += 1
+        signature = random_base58(88)
+        self.signatures.append({
+            "signature": signature,
+            "slot": self.slot,
+            "err": None,
+            "memo": None,
+            "blockTime": 1700000000 + self.slot,
+            "confirmationStatus": "confirmed"
+        })
+        self.transactions[signature] = {
+            "slot": self.slot,
+            "blockTime": 1700000000 + self.slot,
+            "meta": {"err": None, "logMessages": logs, "innerInstructions": []},
+            "transaction": {
+                "signatures": [signature],
+                "message": {
+                    "accountKeys": [{"pubkey": fee_payer or random_base58(44), "signer": True}],
+                    "instructions": instructions
+                }
+            }
+        }
+        return signature
+
+    async def _handle_rpc(self, request: web.Request) -> web.Response:
+        body = await request.json()
+        if isinstance(body, list):
+            self.batch_sizes.append(len(body))
+            return web.json_response([self._dispatch(item) for item in body])
+        return web.json_response(self._dispatch(body))
+
+    def _dispatch(self, request: Dict) -> Dict:
+        method = request.get("method")
+        params = request.get("params") or []
+        self.requests.append(method)
+
+        if method == "getTransaction":
+            result = self.transactions.get(params[0])
+        elif method == "getSignaturesForAddress":
+            result = self._signatures_for(params[1] if len(params) > 1 else {})
+        elif method == "getSlot":
+            result = self.slot
+        else:
+            return {"jsonrpc": "2.0", "id": request.get("id"),
+                    "error": {"code": -32601, "message": f"Method not found: {method}"}}
+        return {"jsonrpc": "2.0", "id": request.get("id"), "result": result}
+
+    def _signatures_for(self, options: Dict) -> List[Dict]:
+        """Newest-first signatures honouring before/until/limit like a real node"""
+        entries = list(reversed(self.signatures))
+        index = {entry["signature"]: i for i, entry in enumerate(entries)}
+        start = index[options["before"]] + 1 if options.get("before") in index else 0
+        end = index[options["until"]] if options.get("until") in index else len(entries)
+        return entries[start:end][:options.get("limit", 1000)]
+
+    async def _handle_ws(self, request: web.Request) -> web.WebSocketResponse:
+        ws = web.WebSocketResponse()
+        await ws.prepare(request)
+        self._sockets.add(ws)
+        try:
+            async for message in ws:
+                if message.type != WSMsgType.TEXT:
+                    continue
+                data = json.loads(message.data)
+                method = data.get("method", "")
+                if method in ("logsSubscribe", "programSubscribe"):
+                    subscription_id = next(self._subscription_ids)
+                    self._subscriptions[subscription_id] = (ws, method)
+                    await ws.send_json({"jsonrpc": "2.0", "id": data.get("id"), "result": subscription_id})
+                elif method.endswith("Unsubscribe"):
+                    removed = self._subscriptions.pop((data.get("params") or [None])[0], None)
+                    await ws.send_json({"jsonrpc": "2.0", "id": data.get("id"), "result": removed is not None})
+        finally:
+            self._sockets.discard(ws)
+            for subscription_id, (socket, _) in list(self._subscriptions.items()):
+                if socket is ws:
+                    del self._subscriptions[subscription_id]
+        return ws
+
+    async def _publish(self, subscribe_method: str, notification: str, value: Dict):
+        for subscription_id, (ws, method) in list(self._subscriptions.items()):
+            if method != subscribe_method or ws.closed:
+                continue
+            await ws.send_json({
+                "jsonrpc": "2.0",
+                "method": notification,
+                "params": {
+                    "result": {"context": {"slot": self.slot}, "value": value},
+                    "subscription": subscription_id
+                }
+            })
+
+    async def _notify_logs(self, signature: str, logs: List[str]):
+        await self._publish("logsSubscribe", "logsNotification", {
+            "signature": signature,
+            "err": None,
+            "logs": logs
+        })
+
+    async def _notify_account(self, pubkey: str, info: Dict):
+        await self._publish("programSubscribe", "programNotification", {
+            "pubkey": pubkey,
+            "account": {
+                "owner": TOKEN_PROGRAM_ID,
+                "data": {"program": "spl-token", "parsed": {"type": "mint", "info": info}, "space": 82}
+            }
+        })
+
+async def _serve(port: int, mint_every: float):
+    server = RPCStandinServer(port=port)
+    await server.start()
+    print(f"HTTP {server.http_url}  WS {server.ws_url}")
+    try:
+        while True:
+            await asyncio.sleep(mint_every)
+            await server.add_activity()
+            print(f"Minted {await server.add_mint()}")
+    finally:
+        await server.stop()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Offline Solana RPC stand-in")
+    parser.add_argument("--port", type=int, default=8899)
+    parser.add_argument("--mint-every", type=float, default=5.0)
+    args = parser.parse_args()
+    asyncio.run(_serve(args.port, args.mint_every))
@@ -0,0 +1,58 @@
+import logging
+from pathlib import Path
+from typing import Dict
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+SENTIMENT_DTYPE = np.dtype([
+    ("timestamp", "<f8"),
+    ("score", "<f8"),
+    ("confidence", "<f8")
+])
+
+class SentimentHistory:
+    """Append-only log of the sentiment scores applied to each token
+
+    Each token gets one file of fixed-width (timestamp, score, confidence)
+    records under <root>/<address>.bin, written in time order, so replays
+    such as the backtester can look up the sentiment the agent saw at any
+    time.
+    """
+
+    def __init__(self, root: str = "data/sentiment"):
+        self.root = Path(root)
+
+    def _path(self, address: str) -> Path:
+        return self.root / f"{address}.bin"
+
+    def append(self, address: str, timestamp: float, score: float, confidence: float):
+        record = np.array([(timestamp, score, confidence)], dtype=SENTIMENT_DTYPE)
+        path = self._path(address)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "ab") as f:
+            f.write(record.tobytes())
+
+    def read(self, address: str) -> np.ndarray:
+        path = self._path(address)
+        if not path.exists():
+            return np.empty(0, dtype=SENTIMENT_DTYPE)
+        data = path.read_bytes()
+        # Ignore a torn record left by an interrupted append
+        count = len(data) // SENTIMENT_DTYPE.itemsize
+        return np.frombuffer(data, dtype=SENTIMENT_DTYPE, count=count).copy()
+
+    def at(self, address: str, times: np.ndarray, max_age: float) -> Dict[str, np.ndarray]:
+        """The latest score at or before each time, if at most `max_age` old
+
+        Returns the scores (0.0 where none applies) and a mask of the times
+        that had one.
+        """
+        history = self.read(address)
+        times = np.asarray(times, dtype=float)
+        positions = np.searchsorted(history["timestamp"], times, side="right") - 1
+        known = positions >= 0
+        known[known] = times[known] - history["timestamp"][positions[known]] <= max_age
+        scores = np.zeros(len(times))
+        scores[known] = history["score"][positions[known]]
+        return {"score": scores, "known": known}
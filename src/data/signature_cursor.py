@@ -0,0 +1,114 @@
+import logging
+import os
+import time
+from collections import OrderedDict
+from typing import Dict, Optional
+from utils.json_codec import dumps, loads
+
+logger = logging.getLogger(__name__)
+
+class BoundedLRUSet:
+    """Set that forgets its least recently used members beyond max_size"""
+
+    def __init__(self, max_size: int = 10000):
+        self.max_size = max_size
+        self._items: "OrderedDict[str, None]" = OrderedDict()
+
+    def __contains__(self, item: str) -> bool:
+        if item in self._items:
+            self._items.move_to_end(item)
+            return True
+        return False
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def add(self, item: str):
+        self._items[item] = None
+        self._items.move_to_end(item)
+        if len(self._items) > self.max_size:
+            self._items.popitem(last=False)
+
+class SignatureCursor:
+    """High-water mark and seen-signature LRU for one monitored address
+
+    The high-water mark is the newest processed signature; it is passed as
+    `until` to getSignaturesForAddress so each poll only returns newer
+    signatures, and it is persisted so restarts resume where they stopped.
+    A signature only counts as seen once it is advanced past, so one whose
+    transaction could not be read is offered again on the next poll.
+    """
+
+    def __init__(self, address: str, max_seen: int = 10000,
+                 persist_path: Optional[str] = None, persist_interval: float = 5):
+        self.address = address
+        self.persist_path = persist_path
+        self.persist_interval = persist_interval
+        self.seen = BoundedLRUSet(max_seen)
+        self.high_water: Optional[str] = None
+        self.high_water_slot = 0
+        self.skipped = 0
+        self._last_save = 0.0
+        self._dirty = False
+
+        if self.persist_path:
+            self.load()
+
+    def is_new(self, signature: str) -> bool:
+        """False if the signature was already processed; does not record it"""
+        if signature in self.seen:
+            self.skipped += 1
+            return False
+        return True
+
+    def advance(self, signature: str, slot: int = 0):
+        """Record a processed signature and move the high-water mark forward
+
+        Older slots never move the mark back.
+        """
+        self.seen.add(signature)
+        if slot and slot < self.high_water_slot:
+            return
+        self.high_water = signature
+        self.high_water_slot = max(self.high_water_slot, slot)
+        self._dirty = True
+        if self.persist_path and time.time() - self._last_save >= self.persist_interval:
+            self.save()
+
+    def _read_all(self) -> Dict:
+        try:
+            with open(self.persist_path, "rb") as f:
+                return loads(f.read())
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            logger.error(f"Failed to read cursors from {self.persist_path}: {e}")
+            return {}
+
+    def load(self):
+        state = self._read_all().get(self.address)
+        if state:
+            self.high_water = state.get("signature")
+            self.high_water_slot = state.get("slot", 0)
+            if self.high_water:
+                self.seen.add(self.high_water)
+            logger.info(f"Resuming {self.address} after {self.high_water} (slot {self.high_water_slot})")
+
+    def save(self):
+        """Atomically persist the high-water mark alongside other addresses' cursors"""
+        if not self.persist_path or not self._dirty:
+            return
+        cursors = self._read_all()
+        cursors[self.address] = {"signature": self.high_water, "slot": self.high_water_slot}
+        try:
+            directory = os.path.dirname(self.persist_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            tmp_path = f"{self.persist_path}.tmp"
+            with open(tmp_path, "wb") as f:
+                f.write(dumps(cursors))
+            os.replace(tmp_path, self.persist_path)
+            self._dirty = False
+            self._last_save = time.time()
+        except OSError as e:
+            logger.error(f"Failed to persist cursor to {self.persist_path}: {e}")
@@ -0,0 +1,225 @@
+import hashlib
+import logging
+import os
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+import numpy as np
+from models.transaction import TransactionRecord
+
+logger = logging.getLogger(__name__)
+
+TX_DTYPE = np.dtype([
+    ("sig_hash", "<u8"),
+    ("timestamp", "<f8"),
+    ("amount", "<f8"),
+    ("side", "u1"),
+    ("signature", "S88"),
+    ("address", "S44")
+])
+SIG_INDEX_DTYPE = np.dtype([("hash", "<u8"), ("row", "<u4")])
+TIME_INDEX_DTYPE = np.dtype([("timestamp", "<f8"), ("row", "<u4")])
+
+SIDES = {"buy": 0, "sell": 1}
+SIDE_NAMES = {value: key for key, value in SIDES.items()}
+
+def signature_hash(signature: str) -> int:
+    return int.from_bytes(hashlib.blake2b(signature.encode(), digest_size=8).digest(), "little")
+
+def to_records(rows: np.ndarray) -> List[TransactionRecord]:
+    """Convert stored rows to the records TransactionAnalyzer consumes"""
+    return [
+        TransactionRecord(
+            signature=row["signature"].decode(),
+            timestamp=datetime.fromtimestamp(row["timestamp"]),
+            type=SIDE_NAMES.get(int(row["side"]), "buy"),
+            amount=float(row["amount"]),
+            address=row["address"].decode()
+        )
+        for row in rows
+    ]
+
+class TransactionLog:
+    """Append-only binary transaction log per token with signature and time indexes
+
+    Each token directory holds fixed-width records in log.bin (append order),
+    plus two sorted index files that are memory-mapped for lookups:
+    sig.idx (signature hash -> row) for deduplicated appends, and ts.idx
+    (timestamp -> row) for "since" range scans. Appends merge their own sorted
+    entries into the indexes, and extend ts.idx in place when they are newer
+    than everything logged. Indexes are rebuilt from the log if an append was
+    interrupted before they were written. `prune` drops expired transactions.
+    """
+
+    def __init__(self, root: str = "data/transactions"):
+        self.root = Path(root)
+        self._maps: Dict[str, Tuple[int, np.ndarray, np.ndarray, np.ndarray]] = {}
+
+    def _paths(self, address: str) -> Tuple[Path, Path, Path]:
+        directory = self.root / address
+        return directory / "log.bin", directory / "sig.idx", directory / "ts.idx"
+
+    @staticmethod
+    def _map(path: Path, dtype: np.dtype) -> np.ndarray:
+        count = path.stat().st_size // dtype.itemsize if path.exists() else 0
+        if count == 0:
+            return np.empty(0, dtype=dtype)
+        return np.memmap(path, dtype=dtype, mode="r", shape=(count,))
+
+    def _open(self, address: str) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        log_path, sig_path, ts_path = self._paths(address)
+        size = log_path.stat().st_size if log_path.exists() else 0
+        cached = self._maps.get(address)
+        if cached is not None and cached[0] == size:
+            return cached[1], cached[2], cached[3]
+
+        if size % TX_DTYPE.itemsize:
+            logger.warning(f"Truncating torn record at the end of {log_path}")
+            with open(log_path, "r+b") as f:
+                f.truncate(size - size % TX_DTYPE.itemsize)
+            size -= size % TX_DTYPE.itemsize
+
+        log = self._map(log_path, TX_DTYPE)
+        sig_index = self._map(sig_path, SIG_INDEX_DTYPE)
+        ts_index = self._map(ts_path, TIME_INDEX_DTYPE)
+        if len(sig_index) != len(log) or len(ts_index) != len(log):
+            sig_index, ts_index = self._rebuild_indexes(address, log)
+
+        self._maps[address] = (size, log, sig_index, ts_index)
+        return log, sig_index, ts_index
+
+    def _rebuild_indexes(self, address: str, log: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        logger.info(f"Rebuilding transaction indexes for {address}")
+        rows = np.arange(len(log), dtype=np.uint32)
+        sig_index = np.empty(len(log), dtype=SIG_INDEX_DTYPE)
+        sig_index["hash"], sig_index["row"] = log["sig_hash"], rows
+        ts_index = np.empty(len(log), dtype=TIME_INDEX_DTYPE)
+        ts_index["timestamp"], ts_index["row"] = log["timestamp"], rows
+        sig_index = sig_index[np.argsort(sig_index["hash"], kind="stable")]
+        ts_index = ts_index[np.argsort(ts_index["timestamp"], kind="stable")]
+        _, sig_path, ts_path = self._paths(address)
+        self._write_index(sig_path, sig_index)
+        self._write_index(ts_path, ts_index)
+        return sig_index, ts_index
+
+    @staticmethod
+    def _write_index(path: Path, index: np.ndarray):
+        tmp_path = path.with_suffix(".tmp")
+        with open(tmp_path, "wb") as f:
+            f.write(np.ascontiguousarray(index).tobytes())
+        os.replace(tmp_path, path)
+
+    @staticmethod
+    def _merge(index: np.ndarray, entries: np.ndarray, key: str) -> np.ndarray:
+        """Merge sorted entries into a sorted index without re-sorting it"""
+        positions = np.searchsorted(index[key], entries[key], side="right")
+        return np.insert(index, positions, entries)
+
+    def _find(self, log: np.ndarray, sig_index: np.ndarray, hashes: np.ndarray, signatures: np.ndarray) -> np.ndarray:
+        """Boolean mask of which signatures are already stored"""
+        if len(sig_index) == 0:
+            return np.zeros(len(hashes), dtype=bool)
+        positions = np.searchsorted(sig_index["hash"], hashes)
+        positions = np.minimum(positions, len(sig_index) - 1)
+        matches = sig_index["hash"][positions] == hashes
+        # Confirm hash matches against the stored signature bytes
+        if matches.any():
+            rows = sig_index["row"][positions[matches]]
+            matches[matches] = log["signature"][rows] == signatures[matches]
+        return matches
+
+    def append(self, address: str, transactions: Iterable[TransactionRecord]) -> int:
+        """Append transactions not already in the log; returns how many were new"""
+        transactions = [tx for tx in transactions if tx.signature]
+        if not transactions:
+            return 0
+
+        batch = np.empty(len(transactions), dtype=TX_DTYPE)
+        batch["signature"] = [tx.signature.encode() for tx in transactions]
+        batch["sig_hash"] = [signature_hash(tx.signature) for tx in transactions]
+        batch["timestamp"] = [tx.timestamp.timestamp() for tx in transactions]
+        batch["amount"] = [tx.amount for tx in transactions]
+        batch["side"] = [SIDES.get(tx.type, 0) for tx in transactions]
+        batch["address"] = [(tx.address or "").encode()[:44] for tx in transactions]
+
+        # Drop duplicates within the batch, then against the log
+        _, first = np.unique(batch["signature"], return_index=True)
+        batch = batch[np.sort(first)]
+        log, sig_index, ts_index = self._open(address)
+        batch = batch[~self._find(log, sig_index, batch["sig_hash"], batch["signature"])]
+        if len(batch) == 0:
+            return 0
+
+        log_path, sig_path, ts_path = self._paths(address)
+        log_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(log_path, "ab") as f:
+            f.write(batch.tobytes())
+
+        rows = np.arange(len(log), len(log) + len(batch), dtype=np.uint32)
+        new_sigs = np.empty(len(batch), dtype=SIG_INDEX_DTYPE)
+        new_sigs["hash"], new_sigs["row"] = batch["sig_hash"], rows
+        new_times = np.empty(len(batch), dtype=TIME_INDEX_DTYPE)
+        new_times["timestamp"], new_times["row"] = batch["timestamp"], rows
+
+        new_sigs = new_sigs[np.argsort(new_sigs["hash"], kind="stable")]
+        new_times = new_times[np.argsort(new_times["timestamp"], kind="stable")]
+        self._write_index(sig_path, self._merge(sig_index, new_sigs, "hash"))
+        if len(ts_index) == 0 or new_times["timestamp"][0] >= ts_index["timestamp"][-1]:
+            with open(ts_path, "ab") as f:
+                f.write(new_times.tobytes())
+        else:
+            self._write_index(ts_path, self._merge(ts_index, new_times, "timestamp"))
+        self._maps.pop(address, None)
+        return len(batch)
+
+    def prune(self, address: str, before: float, min_fraction: float = 0.5) -> int:
+        """Drop transactions older than `before`; returns how many were dropped
+
+        The log is only rewritten once at least `min_fraction` of it has
+        expired, so compaction costs are spread over many appends.
+        """
+        log, _, ts_index = self._open(address)
+        expired = int(np.searchsorted(ts_index["timestamp"], before, side="left"))
+        if expired == 0 or expired < len(log) * min_fraction:
+            return 0
+
+        # Keep the surviving rows in append order
+        kept = np.array(log[np.sort(ts_index["row"][expired:])])
+        log_path, sig_path, ts_path = self._paths(address)
+        tmp_path = log_path.with_suffix(".tmp")
+        with open(tmp_path, "wb") as f:
+            f.write(kept.tobytes())
+        # The old indexes point at rows of the old log
+        sig_path.unlink(missing_ok=True)
+        ts_path.unlink(missing_ok=True)
+        os.replace(tmp_path, log_path)
+        self._maps.pop(address, None)
+        logger.debug(f"Pruned {expired} expired transactions for {address}")
+        return expired
+
+    def contains(self, address: str, signature: str) -> bool:
+        log, sig_index, _ = self._open(address)
+        found = self._find(log, sig_index, np.array([signature_hash(signature)], dtype=np.uint64),
+                           np.array([signature.encode()], dtype="S88"))
+        return bool(found[0])
+
+    def since(self, address: str, timestamp: float, until: Optional[float] = None) -> np.ndarray:
+        """Rows with timestamp >= start (and < until), in time order"""
+        log, _, ts_index = self._open(address)
+        lo = np.searchsorted(ts_index["timestamp"], timestamp, side="left")
+        hi = len(ts_index) if until is None else np.searchsorted(ts_index["timestamp"], until, side="left")
+        return log[ts_index["row"][lo:hi]]
+
+    def latest(self, address: str) -> Optional[np.void]:
+        """The most recent transaction by timestamp"""
+        log, _, ts_index = self._open(address)
+        if len(ts_index) == 0:
+            return None
+        return log[ts_index["row"][-1]]
+
+    def count(self, address: str) -> int:
+        return len(self._open(address)[0])
+
+    def release(self, address: str):
+        """Drop the memory maps held for a token"""
+        self._maps.pop(address, None)
@@ -14,9 +14,14 @@ class TradingAssistant:
             self.config["api_key"]
         )
         self.trading_agent = TradingAgent(self.config)
+        listener_config = self.config.get("listener", {})
         self.blockchain_listener = BlockchainListener(
             self.config["rpc_url"],
-            self.process_new_token
+            self.process_new_token,
+            mode=listener_config.get("mode", "poll"),
+            ws_url=listener_config.get("ws_url"),
+            subscription=listener_config.get("subscription", "logs"),
+            cursor_path=listener_config.get("cursor_path")
         )
 
     async def start(self):
@@ -33,7 +38,10 @@ class TradingAssistant:
             await self.trading_agent.process_new_token(token_data)
             
             # Get the analyzed token
-            token = self.trading_agent.active_tokens[token_data['address']]
+            token = self.trading_agent.active_tokens.get(token_data['address'])
+            if token is None:
+                print(f"Token {token_data['name']} was not admitted for tracking")
+                return
             
             # Log analysis results
             print(f"Analysis complete for {token.name}:")
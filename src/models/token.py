@@ -1,7 +1,21 @@
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, fields
 from datetime import datetime
 from typing import List, Dict, Optional
 from enum import Enum
+import time
+from utils.json_codec import dumps
+
+def _unchanged(fields: Dict, name: str, value) -> bool:
+    """Whether assigning value to a field would leave it as it is"""
+    if name not in fields:
+        return False
+    current = fields[name]
+    if current is value:
+        return True
+    try:
+        return type(current) is type(value) and bool(current == value)
+    except (TypeError, ValueError):
+        return False
 
 class TokenStatus(Enum):
     NEW = "new"
@@ -25,6 +39,16 @@ class TokenMetrics:
     natural_chart: bool = True
     social_sentiment: float = 0.0  # -1 to 1
 
+    def __setattr__(self, name, value):
+        unchanged = _unchanged(self.__dict__, name, value)
+        object.__setattr__(self, name, value)
+        owner = self.__dict__.get("_owner")
+        if owner is not None and not name.startswith("_") and not unchanged:
+            owner._changed()
+
+    def to_dict(self) -> Dict:
+        return {f.name: getattr(self, f.name) for f in fields(self)}
+
 @dataclass
 class Token:
     address: str
@@ -41,8 +65,12 @@ class Token:
     volume24hUSD: float = 0
     price: float = 0
     liquidity: float = 0
+    patterns: List[str] = field(default_factory=list)
+    version: int = 0
 
     def __init__(self, address: str, name: str, creator_address: str):
+        self._encoded: Optional[bytes] = None
+        self._encoded_version = -1
         self.address = address
         self.name = name
         self.creator_address = creator_address
@@ -50,6 +78,79 @@ class Token:
         self.description = ""
         self.logoURI = None
         self.metrics = TokenMetrics()
+        self.patterns = []
+        self.creation_time = datetime.now()
         self.risk_score = 0.0
         self.trading_signal = TradingSignal.WAIT
-        self.status = TokenStatus.NEW 
\ No newline at end of file
+        self.status = TokenStatus.NEW
+        self.version = 0
+
+    def __setattr__(self, name, value):
+        unchanged = _unchanged(self.__dict__, name, value)
+        object.__setattr__(self, name, value)
+        if name == "metrics":
+            object.__setattr__(value, "_owner", self)
+        if not name.startswith("_") and name not in ("version", "updated_at") and not unchanged:
+            self._changed()
+
+    def _changed(self):
+        """Bump the version on any public change, including metrics
+
+        Assigning a field the value it already has is not a change.
+        """
+        object.__setattr__(self, "version", self.__dict__.get("version", 0) + 1)
+        object.__setattr__(self, "updated_at", time.time())
+
+    def to_dict(self) -> Dict:
+        return {
+            "address": self.address,
+            "name": self.name,
+            "symbol": self.symbol,
+            "logoURI": self.logoURI,
+            "volume24hUSD": self.volume24hUSD,
+            "price": self.price,
+            "liquidity": self.liquidity,
+            "status": self.status.value,
+            "patterns": self.patterns,
+            "risk_score": self.risk_score,
+            "trading_signal": self.trading_signal.value,
+            "metrics": self.metrics.to_dict(),
+            "version": self.version,
+            "updated_at": self.updated_at
+        }
+
+    def to_state(self) -> Dict:
+        """to_dict() plus the fields needed to rebuild the token with from_state()"""
+        return dict(
+            self.to_dict(),
+            creator_address=self.creator_address,
+            description=self.description,
+            creation_time=self.creation_time.timestamp()
+        )
+
+    @classmethod
+    def from_state(cls, state: Dict) -> "Token":
+        token = cls(address=state["address"], name=state["name"], creator_address=state["creator_address"])
+        for name in ("symbol", "description", "logoURI", "volume24hUSD", "price", "liquidity", "patterns", "risk_score"):
+            if name in state:
+                setattr(token, name, state[name])
+        for metric, value in state.get("metrics", {}).items():
+            setattr(token.metrics, metric, value)
+        token.status = TokenStatus(state.get("status", TokenStatus.NEW.value))
+        token.trading_signal = TradingSignal(state.get("trading_signal", TradingSignal.WAIT.value))
+        if "creation_time" in state:
+            token.creation_time = datetime.fromtimestamp(state["creation_time"])
+        token.version = state.get("version", token.version)
+        token.updated_at = state.get("updated_at", token.updated_at)
+        return token
+
+    def encoded(self) -> bytes:
+        """JSON encoding of to_dict(), cached until the next mutation
+
+        Lists such as patterns must be replaced rather than mutated in place
+        to invalidate the cache.
+        """
+        if self._encoded_version != self.version:
+            self._encoded = dumps(self.to_dict())
+            self._encoded_version = self.version
+        return self._encoded
@@ -0,0 +1,63 @@
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+class TransactionRecord:
+    """Compact transaction record consumed by TransactionAnalyzer
+
+    Supports item access (tx['address']) so analyzers can treat it like the
+    dicts they were written against without the per-record dict overhead.
+    """
+    __slots__ = ("signature", "timestamp", "type", "amount", "address")
+
+    def __init__(self, signature: str, timestamp: datetime, type: str, amount: float, address: str):
+        self.signature = signature
+        self.timestamp = timestamp
+        self.type = type
+        self.amount = amount
+        self.address = address
+
+    def __getitem__(self, key: str) -> Any:
+        try:
+            return getattr(self, key)
+        except AttributeError:
+            raise KeyError(key)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return getattr(self, key, default)
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, TransactionRecord):
+            return NotImplemented
+        return self.to_dict() == other.to_dict()
+
+    def __repr__(self) -> str:
+        return f"TransactionRecord({self.signature!r}, {self.type}, {self.amount}, {self.address!r})"
+
+    def to_dict(self) -> Dict:
+        return {slot: getattr(self, slot) for slot in self.__slots__}
+
+    @classmethod
+    def from_birdeye(cls, item: Dict, token_address: Optional[str] = None) -> Optional["TransactionRecord"]:
+        """Build a record from a Birdeye token swap item, or None when it has no side
+
+        The amount is that of the token's leg of the swap: the leg whose
+        address is `token_address`, or else the one the side implies (a buy
+        receives the token in `to`, a sell gives it up in `from`).
+        """
+        side = item.get("side")
+        if side not in ("buy", "sell"):
+            return None
+        source, target = item.get("from") or {}, item.get("to") or {}
+        if token_address and source.get("address") == token_address:
+            leg = source
+        elif token_address and target.get("address") == token_address:
+            leg = target
+        else:
+            leg = target if side == "buy" else source
+        return cls(
+            signature=item.get("txHash", ""),
+            timestamp=datetime.fromtimestamp(item.get("blockUnixTime") or 0),
+            type=side,
+            amount=float(leg.get("uiAmount") or 0),
+            address=item.get("owner") or ""
+        )
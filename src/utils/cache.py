@@ -0,0 +1,269 @@
+import asyncio
+import logging
+import os
+import re
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Optional, Set
+from urllib.parse import urlencode
+from .json_codec import dumps, loads
+
+logger = logging.getLogger(__name__)
+
+INTERVAL_UNITS = {
+    "m": 60,
+    "H": 3600,
+    "D": 86400,
+    "W": 604800,
+    "M": 2592000
+}
+
+def interval_to_seconds(interval: str) -> int:
+    """Convert a Birdeye candle interval such as '5m' or '1H' to seconds"""
+    match = re.fullmatch(r"(\d+)([mHDWM])", interval)
+    if not match:
+        raise ValueError(f"Unknown candle interval: {interval}")
+    return int(match.group(1)) * INTERVAL_UNITS[match.group(2)]
+
+def candle_ttl(interval: str, now: Optional[float] = None, min_ttl: float = 5.0) -> float:
+    """Seconds until the current candle of the given interval closes"""
+    seconds = interval_to_seconds(interval)
+    now = time.time() if now is None else now
+    return max(min_ttl, seconds - (now % seconds))
+
+@dataclass
+class CacheEntry:
+    value: Any
+    stored_at: float
+    ttl: float
+    stale_ttl: float
+
+    def age(self, now: float) -> float:
+        return now - self.stored_at
+
+    def is_fresh(self, now: float) -> bool:
+        return self.age(now) < self.ttl
+
+    def is_usable(self, now: float) -> bool:
+        """Fresh, or stale but still inside the stale-while-revalidate window"""
+        return self.age(now) < self.ttl + self.stale_ttl
+
+class TTLCache:
+    """Size-bounded LRU cache with per-entry TTLs and optional JSON persistence"""
+
+    def __init__(self,
+                 max_entries: int = 1024,
+                 default_ttl: float = 300,
+                 stale_ttl: float = 0,
+                 persist_path: Optional[str] = None,
+                 persist_interval: float = 30):
+        self.max_entries = max_entries
+        self.default_ttl = default_ttl
+        self.stale_ttl = stale_ttl
+        self.persist_path = persist_path
+        self.persist_interval = persist_interval
+        self._entries: "OrderedDict[str, CacheEntry]" = OrderedDict()
+        self._dirty = False
+        self._last_save = 0.0
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        if self.persist_path:
+            self.load()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: str) -> bool:
+        entry = self._entries.get(key)
+        return entry is not None and entry.is_usable(time.time())
+
+    def get_entry(self, key: str) -> Optional[CacheEntry]:
+        """Return the entry if it is fresh or stale-but-usable, updating LRU order"""
+        entry = self._entries.get(key)
+        now = time.time()
+        if entry is None or not entry.is_usable(now):
+            if entry is not None:
+                del self._entries[key]
+                self._dirty = True
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        if entry.is_fresh(now):
+            self.hits += 1
+        else:
+            self.stale_hits += 1
+        return entry
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Return a fresh value, ignoring stale entries"""
+        entry = self.get_entry(key)
+        if entry is None or not entry.is_fresh(time.time()):
+            return default
+        return entry.value
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None, stale_ttl: Optional[float] = None):
+        self._entries[key] = CacheEntry(
+            value=value,
+            stored_at=time.time(),
+            ttl=self.default_ttl if ttl is None else ttl,
+            stale_ttl=self.stale_ttl if stale_ttl is None else stale_ttl
+        )
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+        self._dirty = True
+        self._maybe_save()
+
+    def pop(self, key: str, default: Any = None) -> Any:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return default
+        self._dirty = True
+        return entry.value
+
+    def remove_where(self, predicate: Callable[[str], bool]) -> int:
+        """Remove every entry whose key matches the predicate"""
+        keys = [key for key in self._entries if predicate(key)]
+        for key in keys:
+            del self._entries[key]
+        if keys:
+            self._dirty = True
+        return len(keys)
+
+    def clear(self):
+        self._entries.clear()
+        self._dirty = True
+
+    def stats(self) -> Dict:
+        lookups = self.hits + self.stale_hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": (self.hits + self.stale_hits) / lookups if lookups else 0.0
+        }
+
+    def _maybe_save(self):
+        if self.persist_path and time.time() - self._last_save >= self.persist_interval:
+            self.save()
+
+    def save(self):
+        """Atomically write all usable entries to the persist path"""
+        if not self.persist_path or not self._dirty:
+            return
+        now = time.time()
+        payload = {
+            key: [entry.value, entry.stored_at, entry.ttl, entry.stale_ttl]
+            for key, entry in self._entries.items()
+            if entry.is_usable(now)
+        }
+        try:
+            directory = os.path.dirname(self.persist_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            tmp_path = f"{self.persist_path}.tmp"
+            with open(tmp_path, "wb") as f:
+                f.write(dumps(payload))
+            os.replace(tmp_path, self.persist_path)
+            self._dirty = False
+            self._last_save = now
+        except (OSError, TypeError, ValueError) as e:
+            logger.error(f"Failed to persist cache to {self.persist_path}: {e}")
+
+    def load(self):
+        """Load persisted entries, dropping any that are no longer usable"""
+        try:
+            with open(self.persist_path, "rb") as f:
+                payload = loads(f.read())
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as e:
+            logger.error(f"Failed to load cache from {self.persist_path}: {e}")
+            return
+
+        now = time.time()
+        entries = sorted(payload.items(), key=lambda item: item[1][1])
+        for key, (value, stored_at, ttl, stale_ttl) in entries[-self.max_entries:]:
+            entry = CacheEntry(value=value, stored_at=stored_at, ttl=ttl, stale_ttl=stale_ttl)
+            if entry.is_usable(now):
+                self._entries[key] = entry
+        self._last_save = now
+        logger.info(f"Loaded {len(self._entries)} cached entries from {self.persist_path}")
+
+class ResponseCache:
+    """HTTP response cache keyed by endpoint and params with stale-while-revalidate"""
+
+    def __init__(self,
+                 max_entries: int = 1024,
+                 persist_path: Optional[str] = None,
+                 persist_interval: float = 30):
+        self.cache = TTLCache(
+            max_entries=max_entries,
+            persist_path=persist_path,
+            persist_interval=persist_interval
+        )
+        self._refreshing: Set[str] = set()
+        self._tasks: Set[asyncio.Task] = set()
+        self.background_refreshes = 0
+
+    @staticmethod
+    def make_key(url: str, params: Optional[Dict] = None) -> str:
+        if not params:
+            return url
+        return f"{url}?{urlencode(sorted(params.items()))}"
+
+    async def get(self,
+                  url: str,
+                  params: Optional[Dict],
+                  fetch: Callable[[], Awaitable[Optional[Any]]],
+                  ttl: float,
+                  stale_ttl: float = 0) -> Optional[Any]:
+        """Return a cached response, fetching on miss and refreshing stale entries in the background"""
+        key = self.make_key(url, params)
+        entry = self.cache.get_entry(key)
+
+        if entry is not None:
+            if not entry.is_fresh(time.time()) and key not in self._refreshing:
+                self._schedule_refresh(key, fetch, ttl, stale_ttl)
+            return entry.value
+
+        value = await fetch()
+        if value is not None:
+            self.cache.set(key, value, ttl=ttl, stale_ttl=stale_ttl)
+        return value
+
+    def _schedule_refresh(self, key: str, fetch: Callable[[], Awaitable[Optional[Any]]], ttl: float, stale_ttl: float):
+        self._refreshing.add(key)
+        self.background_refreshes += 1
+        task = asyncio.create_task(self._refresh(key, fetch, ttl, stale_ttl))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _refresh(self, key: str, fetch: Callable[[], Awaitable[Optional[Any]]], ttl: float, stale_ttl: float):
+        try:
+            value = await fetch()
+            if value is not None:
+                self.cache.set(key, value, ttl=ttl, stale_ttl=stale_ttl)
+        except Exception as e:
+            logger.error(f"Background refresh failed for {key}: {e}")
+        finally:
+            self._refreshing.discard(key)
+
+    def invalidate(self, predicate: Callable[[str], bool]) -> int:
+        return self.cache.remove_where(predicate)
+
+    def save(self):
+        self.cache.save()
+
+    def stats(self) -> Dict:
+        stats = self.cache.stats()
+        stats["background_refreshes"] = self.background_refreshes
+        return stats
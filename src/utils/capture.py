@@ -0,0 +1,197 @@
+import asyncio
+import base64
+import gzip
+import hashlib
+import logging
+import os
+import re
+import time
+from collections import defaultdict
+from typing import Any, Dict, List, Optional
+from urllib.parse import urlencode
+import aiohttp
+from .json_codec import dumps, loads
+
+logger = logging.getLogger(__name__)
+
+# Credentials that must never reach an archive: query parameters in URLs and
+# keys such as the OAuth bearer token in response bodies
+SECRET_PARAMS = ("api-key", "api_key", "apikey", "access_token")
+SECRET_FIELDS = ("access_token", "refresh_token", "id_token")
+REDACTED = "REDACTED"
+
+_SECRET_QUERY = re.compile(r"([?&](?:%s)=)[^&#]*" % "|".join(re.escape(name) for name in SECRET_PARAMS))
+_SECRET_FIELD = re.compile(r'("(?:%s)"\s*:\s*)"(?:[^"\\]|\\.)*"' % "|".join(SECRET_FIELDS))
+
+def redact_url(url: str) -> str:
+    return _SECRET_QUERY.sub(rf"\g<1>{REDACTED}", url)
+
+def redact_body(text: str) -> str:
+    return _SECRET_FIELD.sub(rf'\g<1>"{REDACTED}"', text)
+
+class CapturedResponse:
+    """Response body that has already been read, recorded or replayed"""
+
+    def __init__(self, status: int, body: bytes, elapsed: float = 0.0):
+        self.status = status
+        self.body = body
+        self.elapsed = elapsed
+
+    async def read(self) -> bytes:
+        return self.body
+
+    async def text(self) -> str:
+        return self.body.decode("utf-8", errors="replace")
+
+    async def json(self) -> Any:
+        return loads(self.body)
+
+class TrafficCapture:
+    """Record upstream HTTP responses to a gzip archive, or replay them offline
+
+    Modes:
+        off     pass requests straight through
+        record  pass requests through and append each response to the archive
+        replay  serve responses from the archive without touching the network
+
+    Responses are keyed by method, URL, query params and request body (never
+    headers, so credentials are not part of the key). API keys in the URL or
+    params and tokens in response bodies are redacted before anything is
+    written, so replayed token responses carry a placeholder. Repeated requests for the
+    same key replay in recorded order, repeating the last one once exhausted.
+    `latency_scale` replays each response after its recorded latency times the
+    scale; 0 disables the delay.
+    """
+
+    def __init__(self, mode: str = "off", path: Optional[str] = None, latency_scale: float = 0.0):
+        if mode not in ("off", "record", "replay"):
+            raise ValueError(f"Unknown capture mode: {mode}")
+        if mode != "off" and not path:
+            raise ValueError(f"Capture mode '{mode}' requires an archive path")
+
+        self.mode = mode
+        self.path = path
+        self.latency_scale = latency_scale
+        self.recorded = 0
+        self.replayed = 0
+        self.misses = 0
+        self._archive = None
+        self._responses: Dict[str, List[Dict]] = defaultdict(list)
+        self._positions: Dict[str, int] = defaultdict(int)
+
+        if mode == "replay":
+            self._load()
+
+    @classmethod
+    def from_env(cls) -> "TrafficCapture":
+        return cls(
+            mode=os.getenv("CAPTURE_MODE", "off"),
+            path=os.getenv("CAPTURE_PATH"),
+            latency_scale=float(os.getenv("CAPTURE_LATENCY_SCALE", "0"))
+        )
+
+    @staticmethod
+    def make_key(method: str, url: str, params: Optional[Dict] = None,
+                 json: Any = None, data: Any = None) -> str:
+        key = f"{method.upper()} {redact_url(url)}"
+        if params:
+            key += "?" + urlencode(sorted(
+                (name, REDACTED if name.lower() in SECRET_PARAMS else value) for name, value in params.items()
+            ))
+        if json is not None or data is not None:
+            body = dumps(json) if json is not None else dumps(data)
+            key += " #" + hashlib.sha1(body).hexdigest()
+        return key
+
+    async def request(self, session: aiohttp.ClientSession, method: str, url: str, *,
+                      params: Optional[Dict] = None, json: Any = None, data: Any = None,
+                      **kwargs) -> CapturedResponse:
+        """Perform (or replay) a request and return its fully-read response"""
+        key = self.make_key(method, url, params, json, data)
+        if self.mode == "replay":
+            return await self._replay(key)
+
+        start = time.perf_counter()
+        async with session.request(method, url, params=params, json=json, data=data, **kwargs) as response:
+            body = await response.read()
+            status = response.status
+        elapsed = time.perf_counter() - start
+
+        if self.mode == "record":
+            self._record(key, status, body, elapsed)
+        return CapturedResponse(status, body, elapsed)
+
+    async def _replay(self, key: str) -> CapturedResponse:
+        responses = self._responses.get(key)
+        if not responses:
+            self.misses += 1
+            logger.warning(f"No captured response for {key}")
+            return CapturedResponse(404, b'{"error": "not captured"}')
+
+        position = self._positions[key]
+        entry = responses[min(position, len(responses) - 1)]
+        self._positions[key] = position + 1
+        self.replayed += 1
+
+        if self.latency_scale > 0:
+            await asyncio.sleep(entry["elapsed"] * self.latency_scale)
+        return CapturedResponse(entry["status"], self._decode_body(entry), entry["elapsed"])
+
+    def _record(self, key: str, status: int, body: bytes, elapsed: float):
+        if self._archive is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            # Appending gzip members keeps earlier sessions readable as one stream
+            self._archive = gzip.open(self.path, "ab")
+
+        entry = {"key": key, "status": status, "elapsed": round(elapsed, 4)}
+        try:
+            entry["text"] = redact_body(body.decode("utf-8"))
+        except UnicodeDecodeError:
+            entry["b64"] = base64.b64encode(body).decode()
+        self._archive.write(dumps(entry) + b"\n")
+        self.recorded += 1
+        if self.recorded % 100 == 0:
+            self._archive.flush()
+
+    @staticmethod
+    def _decode_body(entry: Dict) -> bytes:
+        if "text" in entry:
+            return entry["text"].encode("utf-8")
+        return base64.b64decode(entry["b64"])
+
+    def _load(self):
+        try:
+            with gzip.open(self.path, "rb") as archive:
+                for line in archive:
+                    if line.strip():
+                        entry = loads(line)
+                        self._responses[entry["key"]].append(entry)
+        except FileNotFoundError:
+            logger.error(f"Capture archive not found: {self.path}")
+            return
+        except (OSError, EOFError, ValueError) as e:
+            # A recording cut short still replays everything before the damage
+            logger.error(f"Capture archive {self.path} is truncated: {e}")
+        total = sum(len(entries) for entries in self._responses.values())
+        logger.info(f"Loaded {total} captured responses for {len(self._responses)} requests from {self.path}")
+
+    def rewind(self):
+        """Restart replay from the first recorded response of every key"""
+        self._positions.clear()
+
+    def close(self):
+        if self._archive is not None:
+            self._archive.close()
+            self._archive = None
+
+    def stats(self) -> Dict:
+        return {
+            "mode": self.mode,
+            "recorded": self.recorded,
+            "replayed": self.replayed,
+            "misses": self.misses
+        }
+
+capture = TrafficCapture.from_env()
@@ -0,0 +1,90 @@
+import json
+import logging
+import os
+from typing import Any, Callable, Dict, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+class JSONCodec:
+    """A named pair of JSON decode/encode functions"""
+
+    def __init__(self, name: str, loads: Callable[[Union[bytes, str]], Any], dumps: Callable[[Any], bytes]):
+        self.name = name
+        self.loads = loads
+        self.dumps = dumps
+
+def _stdlib_codec() -> JSONCodec:
+    return JSONCodec(
+        "json",
+        json.loads,
+        lambda obj: json.dumps(obj, default=str, separators=(",", ":")).encode()
+    )
+
+def _orjson_codec() -> JSONCodec:
+    import orjson
+    return JSONCodec(
+        "orjson",
+        orjson.loads,
+        lambda obj: orjson.dumps(obj, default=str, option=orjson.OPT_NON_STR_KEYS)
+    )
+
+def _msgspec_codec() -> JSONCodec:
+    import msgspec
+    encoder = msgspec.json.Encoder(enc_hook=str)
+    return JSONCodec("msgspec", msgspec.json.decode, encoder.encode)
+
+def _ujson_codec() -> JSONCodec:
+    import ujson
+    return JSONCodec(
+        "ujson",
+        ujson.loads,
+        lambda obj: ujson.dumps(obj, default=str).encode()
+    )
+
+# Fastest first; the stdlib codec is always available
+CODEC_FACTORIES: Dict[str, Callable[[], JSONCodec]] = {
+    "orjson": _orjson_codec,
+    "msgspec": _msgspec_codec,
+    "ujson": _ujson_codec,
+    "json": _stdlib_codec
+}
+
+_codec: Optional[JSONCodec] = None
+
+def load_codec(name: Optional[str] = None) -> JSONCodec:
+    """Build the named codec, or the fastest one that is installed"""
+    if name:
+        if name not in CODEC_FACTORIES:
+            raise ValueError(f"Unknown JSON codec: {name}")
+        return CODEC_FACTORIES[name]()
+
+    for factory in CODEC_FACTORIES.values():
+        try:
+            return factory()
+        except ImportError:
+            continue
+    return _stdlib_codec()
+
+def get_codec() -> JSONCodec:
+    """Return the process-wide codec, honouring the JSON_CODEC environment variable"""
+    global _codec
+    if _codec is None:
+        _codec = load_codec(os.getenv("JSON_CODEC"))
+        logger.info(f"Using {_codec.name} for JSON decoding")
+    return _codec
+
+def set_codec(name: Optional[str]) -> JSONCodec:
+    """Switch the process-wide codec, e.g. for benchmarks"""
+    global _codec
+    _codec = load_codec(name)
+    return _codec
+
+def loads(data: Union[bytes, str]) -> Any:
+    return get_codec().loads(data)
+
+def dumps(obj: Any) -> bytes:
+    return get_codec().dumps(obj)
+
+async def read_json(response) -> Any:
+    """Decode an aiohttp response body with the active codec"""
+    return loads(await response.read())
@@ -1,7 +1,9 @@
 import asyncio
-from typing import Dict, Optional
+from typing import Dict, List, Optional, Tuple
 import aiohttp
 import logging
+from .json_codec import read_json
+from .capture import capture
 
 logger = logging.getLogger(__name__)
 
@@ -18,18 +20,20 @@ async def make_rpc_call(url: str, method: str, params: list, retries: int = 3, d
                     "params": params
                 }
                 logger.debug(f"Request data: {request_data}")
-                async with session.post(
+                response = await capture.request(
+                    session,
+                    "POST",
                     url,
                     json=request_data,
                     headers={"Content-Type": "application/json"}
-                ) as response:
-                    if response.status == 200:
-                        response_data = await response.json()
-                        logger.debug(f"Response data: {response_data}")
-                        return response_data
-                    else:
-                        error_text = await response.text()
-                        logger.error(f"RPC error (attempt {attempt + 1}/{retries}): {error_text}")
+                )
+                if response.status == 200:
+                    response_data = await read_json(response)
+                    logger.debug(f"Response data: {response_data}")
+                    return response_data
+                else:
+                    error_text = await response.text()
+                    logger.error(f"RPC error (attempt {attempt + 1}/{retries}): {error_text}")
         except Exception as e:
             logger.error(f"RPC call failed (attempt {attempt + 1}/{retries}): {e}")
         
@@ -37,4 +41,40 @@ async def make_rpc_call(url: str, method: str, params: list, retries: int = 3, d
             await asyncio.sleep(delay * (2 ** attempt))  # Exponential backoff
     
     logger.error(f"All {retries} attempts failed for method {method}")
-    return None 
\ No newline at end of file
+    return None
+
+async def make_rpc_batch(url: str, calls: List[Tuple[str, list]], retries: int = 3,
+                         delay: int = 1) -> Optional[List[Optional[Dict]]]:
+    """Send many RPC calls as one JSON-RPC batch; responses come back in call order"""
+    if not calls:
+        return []
+    logger.info(f"Making batched RPC call to {url} with {len(calls)} calls")
+    request_data = [
+        {"jsonrpc": "2.0", "id": i, "method": method, "params": params}
+        for i, (method, params) in enumerate(calls)
+    ]
+    for attempt in range(retries):
+        try:
+            async with aiohttp.ClientSession() as session:
+                response = await capture.request(
+                    session,
+                    "POST",
+                    url,
+                    json=request_data,
+                    headers={"Content-Type": "application/json"}
+                )
+                if response.status == 200:
+                    response_data = await read_json(response)
+                    # Batch responses may arrive in any order; match them up by id
+                    by_id = {item.get("id"): item for item in response_data if isinstance(item, dict)}
+                    return [by_id.get(i) for i in range(len(calls))]
+                error_text = await response.text()
+                logger.error(f"Batched RPC error (attempt {attempt + 1}/{retries}): {error_text}")
+        except Exception as e:
+            logger.error(f"Batched RPC call failed (attempt {attempt + 1}/{retries}): {e}")
+
+        if attempt < retries - 1:
+            await asyncio.sleep(delay * (2 ** attempt))  # Exponential backoff
+
+    logger.error(f"All {retries} attempts failed for a batch of {len(calls)} calls")
+    return None
@@ -0,0 +1,71 @@
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Dict, Hashable
+
+logger = logging.getLogger(__name__)
+
+class _Call:
+    """One shared in-flight call and the number of callers awaiting it"""
+    __slots__ = ("task", "waiters")
+
+    def __init__(self, task: asyncio.Task):
+        self.task = task
+        self.waiters = 0
+
+class SingleFlight:
+    """Coalesce concurrent identical requests into one in-flight call
+
+    The call runs in its own task, so it outlives a cancelled caller as long
+    as another caller still waits on it; it is cancelled only when every
+    caller has gone. All callers get the same result object, which they
+    must treat as read-only.
+    """
+
+    def __init__(self):
+        self._inflight: Dict[Hashable, _Call] = {}
+        self.calls = 0
+        self.deduplicated = 0
+
+    @property
+    def in_flight(self) -> int:
+        return len(self._inflight)
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """Run fn for key, or wait on the call already in flight for the same key"""
+        self.calls += 1
+        call = self._inflight.get(key)
+        if call is not None:
+            self.deduplicated += 1
+            logger.debug(f"Joining in-flight request for {key}")
+        else:
+            call = _Call(asyncio.ensure_future(fn()))
+            call.task.add_done_callback(lambda task: self._finish(key, call))
+            self._inflight[key] = call
+
+        call.waiters += 1
+        try:
+            # Shield so a cancelled caller does not cancel the shared call
+            return await asyncio.shield(call.task)
+        finally:
+            call.waiters -= 1
+            if not call.waiters and not call.task.done():
+                self._forget(key, call)
+                call.task.cancel()
+
+    def _forget(self, key: Hashable, call: _Call):
+        if self._inflight.get(key) is call:
+            del self._inflight[key]
+
+    def _finish(self, key: Hashable, call: _Call):
+        self._forget(key, call)
+        # Mark the exception as retrieved when nobody else was waiting on it
+        if not call.task.cancelled():
+            call.task.exception()
+
+    def stats(self) -> Dict:
+        return {
+            "calls": self.calls,
+            "deduplicated": self.deduplicated,
+            "in_flight": self.in_flight,
+            "dedup_rate": self.deduplicated / self.calls if self.calls else 0.0
+        }
@@ -7,6 +7,7 @@ import hmac
 import hashlib
 import time
 import urllib.parse
+from .capture import capture
 
 class TwitterClient:
     def __init__(self, api_key: str, api_secret: str):
@@ -76,12 +77,12 @@ class TwitterClient:
             'tweet.fields': 'created_at,public_metrics'
         }
         
-        async with session.get(f"{self.base_url}/tweets/search/recent", params=params) as response:
-            if response.status == 200:
-                data = await response.json()
-                return data.get('data', [])
-            else:
-                raise Exception(f"Twitter API error: {await response.text()}")
+        response = await capture.request(session, "GET", f"{self.base_url}/tweets/search/recent", params=params)
+        if response.status == 200:
+            data = await response.json()
+            return data.get('data', [])
+        else:
+            raise Exception(f"Twitter API error: {await response.text()}")
 
     def validate_media(self, media_data: bytes) -> bool:
         """Validate media using PIL instead of imghdr"""
@@ -24,6 +24,17 @@ def test_config() -> Dict:
         "min_confidence": 0.6
     }
 
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
 @pytest.fixture
 def client():
     return TestClient(app)
@@ -15,4 +15,25 @@ def test_get_tokens_endpoint(client):
 async def test_websocket_connection(client):
     with client.websocket_connect("/ws") as websocket:
         # Test connection is established
-        assert websocket.connected 
\ No newline at end of file
+        assert websocket.connected 
+
+def test_analyze_endpoint_analyzes_tracked_tokens(client, monkeypatch):
+    from src.api import server
+    from src.models.token import Token
+
+    analyzed = []
+    async def analyze_token(token):
+        analyzed.append(token)
+    monkeypatch.setattr(server.trading_agent, "analyze_token", analyze_token)
+
+    response = client.post("/tokens/analyze", params={"address": "untracked"})
+    assert response.status_code == 404
+
+    token = Token(address="tracked", name="Tracked", creator_address="creator")
+    server.trading_agent.active_tokens.admit(token)
+    try:
+        response = client.post("/tokens/analyze", params={"address": "tracked"})
+    finally:
+        server.trading_agent.active_tokens.remove("tracked")
+    assert response.status_code == 200
+    assert analyzed == [token]
@@ -0,0 +1,72 @@
+from datetime import datetime
+import numpy as np
+import pytest
+from src.agents.backtester import Backtester, BacktestConfig
+from src.data.candle_store import CandleStore
+from src.data.sentiment_history import SentimentHistory
+from src.data.transaction_log import TransactionLog
+from src.models.transaction import TransactionRecord
+
+START = 1700000000
+
+@pytest.fixture
+def history(tmp_path):
+    store = CandleStore(str(tmp_path / "candles"), "1H")
+    log = TransactionLog(str(tmp_path / "transactions"))
+    rng = np.random.default_rng(3)
+    for token in ("steady", "dumped"):
+        prices = 1 + np.cumsum(rng.normal(0, 0.01, 72))
+        if token == "dumped":
+            prices[40:] *= 0.3
+        store.append(token, [
+            {"unixTime": START + i * 3600, "value": float(price), "v": float(rng.uniform(100, 200))}
+            for i, price in enumerate(prices)
+        ])
+        log.append(token, [
+            TransactionRecord(f"{token}-{i}", datetime.fromtimestamp(START + i * 600), "buy", 1.0, f"wallet{i % 7}")
+            for i in range(300)
+        ])
+    return BacktestConfig(
+        candle_path=str(tmp_path / "candles"),
+        transaction_path=str(tmp_path / "transactions"),
+        sentiment_path=str(tmp_path / "sentiment")
+    )
+
+def test_replay_produces_one_sample_per_step(history):
+    backtester = Backtester(history)
+    samples = backtester.replay(workers=1)
+
+    # 72 candles, 24 candle window, 6 candle horizon
+    assert samples == 2 * (72 - 24 - 6 + 1)
+    assert backtester.token_days() == pytest.approx(samples / 24)
+
+def test_sweep_reports_signal_outcomes(history):
+    backtester = Backtester(history)
+    backtester.replay(workers=1)
+    strict, loose = backtester.sweep([{"risk_threshold": 101}, {"risk_threshold": 0}])
+
+    assert strict["signals"]["sell"]["count"] == 0
+    assert loose["signals"]["sell"]["count"] == loose["samples"]
+    assert loose["signals"]["sell"]["hit_rate"] is not None
+
+def test_stored_sentiment_lets_min_confidence_gate_buys(history):
+    sentiment = SentimentHistory(history.sentiment_path)
+    for i in range(0, 72, 2):
+        sentiment.append("steady", START + i * 3600, 0.8, 0.9)
+
+    backtester = Backtester(history)
+    backtester.replay(workers=1)
+    assert backtester.sentiment_samples > 0
+    default, gated = backtester.sweep([{"min_confidence": 0.0}, {"min_confidence": 1.1}])
+
+    assert default["signals"]["buy"]["count"] > 0
+    assert gated["signals"]["buy"]["count"] == 0
+
+def test_sentiment_history_looks_up_the_latest_recent_score(tmp_path):
+    sentiment = SentimentHistory(str(tmp_path))
+    sentiment.append("token", 100.0, 0.5, 0.9)
+    sentiment.append("token", 200.0, -0.4, 0.8)
+
+    found = sentiment.at("token", np.array([50.0, 150.0, 200.0, 5000.0]), max_age=1000)
+    assert found["score"].tolist() == [0.0, 0.5, -0.4, 0.0]
+    assert found["known"].tolist() == [False, True, True, False]
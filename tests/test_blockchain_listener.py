@@ -0,0 +1,167 @@
+import asyncio
+import pytest
+from src.data.blockchain_listener import BlockchainListener
+from src.data.rpc_standin import RPCStandinServer
+
+@pytest.fixture
+async def standin():
+    server = RPCStandinServer()
+    await server.start()
+    yield server
+    await server.stop()
+
+async def wait_for(condition, timeout: float = 5.0):
+    deadline = asyncio.get_running_loop().time() + timeout
+    while not condition():
+        if asyncio.get_running_loop().time() > deadline:
+            raise TimeoutError("condition not met")
+        await asyncio.sleep(0.01)
+
+async def start_listener(standin, events, **kwargs):
+    async def callback(token_data):
+        events.append(token_data)
+    
+    listener = BlockchainListener(standin.http_url, callback, mode="subscribe", **kwargs)
+    listener.reconnect_delay = 0.05
+    task = asyncio.create_task(listener.start_monitoring())
+    await wait_for(lambda: standin._subscriptions)
+    return listener, task
+
+async def test_logs_subscription_streams_new_mints(standin):
+    events = []
+    listener, task = await start_listener(standin, events)
+    
+    await standin.add_activity()
+    await standin.add_mint(mint="Mint111", authority="Auth111")
+    await wait_for(lambda: events)
+    
+    assert events[0]["address"] == "Mint111"
+    assert events[0]["creator_address"] == "Auth111"
+    # Non-mint activity never costs a getTransaction call
+    assert standin.requests.count("getTransaction") == 1
+    
+    await listener.stop()
+    await task
+
+async def test_reconnect_backfills_missed_mints(standin):
+    events = []
+    listener, task = await start_listener(standin, events)
+    
+    await standin.add_mint(mint="Before")
+    await wait_for(lambda: len(events) == 1)
+    
+    await standin.disconnect_all()
+    await standin.add_mint(mint="Missed", notify=False)
+    await wait_for(lambda: len(events) == 2)
+    
+    assert [event["address"] for event in events] == ["Before", "Missed"]
+    
+    await listener.stop()
+    await task
+
+async def test_program_subscription_reports_each_mint_once(standin):
+    events = []
+    listener, task = await start_listener(standin, events, subscription="program")
+    
+    await standin.add_mint(mint="MintA")
+    await standin._notify_account("MintA", {"decimals": 6, "supply": "100"})
+    await standin.add_mint(mint="MintB")
+    await wait_for(lambda: len(events) == 2)
+    
+    assert [event["address"] for event in events] == ["MintA", "MintB"]
+    
+    await listener.stop()
+    await task
+
+async def test_polling_fetches_only_new_signatures(standin, tmp_path):
+    events = []
+    
+    async def callback(token_data):
+        events.append(token_data)
+    
+    cursor_path = str(tmp_path / "cursor.json")
+    listener = BlockchainListener(standin.http_url, callback, cursor_path=cursor_path)
+    
+    await standin.add_mint(mint="MintA", notify=False)
+    await standin.add_activity(notify=False)
+    await listener._poll_once()
+    assert standin.requests.count("getTransaction") == 2
+    
+    # Nothing new: no transaction is fetched again
+    await listener._poll_once()
+    assert standin.requests.count("getTransaction") == 2
+    
+    # A restarted listener resumes from the persisted high-water mark
+    await standin.add_mint(mint="MintB", notify=False)
+    restarted = BlockchainListener(standin.http_url, callback, cursor_path=cursor_path)
+    await restarted._poll_once()
+    
+    assert [event["address"] for event in events] == ["MintA", "MintB"]
+    assert standin.requests.count("getTransaction") == 3
+
+async def test_truncated_backlog_logs_the_skipped_range(standin, caplog):
+    events = []
+
+    async def callback(token_data):
+        events.append(token_data)
+
+    listener = BlockchainListener(standin.http_url, callback)
+    first = await standin.add_activity(notify=False)
+    await listener._poll_once()
+
+    for _ in range(5):
+        await standin.add_activity(notify=False)
+    listener.page_size = 2
+    listener.max_backlog = 2
+    entries = await listener._fetch_new_signatures()
+
+    assert len(entries) == 2
+    assert listener.truncated_backlogs == 1
+    assert first in caplog.text and entries[-1]["signature"] in caplog.text
+
+async def test_polling_fetches_transactions_in_batches(standin):
+    events = []
+
+    async def callback(token_data):
+        events.append(token_data)
+
+    listener = BlockchainListener(standin.http_url, callback)
+    listener.fetch_batch_size = 4
+    listener.max_concurrent_fetches = 2
+    await standin.add_activity(notify=False)
+    await listener._poll_once()
+
+    standin.batch_sizes.clear()
+    mints = []
+    for i in range(10):
+        await standin.add_activity(notify=False)
+        mints.append(await standin.add_mint(mint=f"Mint{i}", notify=False))
+    await listener._poll_once()
+
+    assert [event["address"] for event in events] == [f"Mint{i}" for i in range(10)]
+    assert standin.batch_sizes == [4, 4, 4, 4, 4]
+    assert listener.cursor.high_water == mints[-1]
+
+async def test_failed_fetches_are_retried_on_the_next_poll(standin):
+    events = []
+
+    async def callback(token_data):
+        events.append(token_data)
+
+    listener = BlockchainListener(standin.http_url, callback)
+    fetch = listener._fetch_transactions
+    failures = [None]
+
+    async def flaky_fetch(entries):
+        if failures:
+            return failures.pop()
+        return await fetch(entries)
+
+    listener._fetch_transactions = flaky_fetch
+    await standin.add_mint(mint="MintA", notify=False)
+    await listener._poll_once()
+    assert events == []
+    assert listener.cursor.high_water is None
+
+    await listener._poll_once()
+    assert [event["address"] for event in events] == ["MintA"]
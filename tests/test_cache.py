@@ -0,0 +1,48 @@
+import asyncio
+import pytest
+from src.utils.cache import TTLCache, ResponseCache, interval_to_seconds, candle_ttl
+
+def test_interval_to_seconds():
+    assert interval_to_seconds("5m") == 300
+    assert interval_to_seconds("1H") == 3600
+    assert interval_to_seconds("1D") == 86400
+    with pytest.raises(ValueError):
+        interval_to_seconds("1h")
+
+def test_candle_ttl_expires_at_candle_close():
+    assert candle_ttl("1H", now=3600 * 10 + 600) == 3000
+    assert candle_ttl("1H", now=3600 * 11 - 1) == 5.0
+
+def test_lru_eviction():
+    cache = TTLCache(max_entries=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+    
+    assert "a" in cache
+    assert "b" not in cache
+    assert cache.evictions == 1
+
+def test_persistence_round_trip(tmp_path):
+    path = str(tmp_path / "cache.json")
+    cache = TTLCache(persist_path=path, persist_interval=0)
+    cache.set("key", {"items": [1, 2]}, ttl=60)
+    
+    restored = TTLCache(persist_path=path)
+    assert restored.get("key") == {"items": [1, 2]}
+
+async def test_stale_while_revalidate():
+    cache = ResponseCache()
+    calls = []
+    
+    async def fetch():
+        calls.append(1)
+        return {"n": len(calls)}
+    
+    assert await cache.get("url", {"a": 1}, fetch, ttl=0, stale_ttl=60) == {"n": 1}
+    # Stale entry is served immediately while a refresh runs in the background
+    assert await cache.get("url", {"a": 1}, fetch, ttl=0, stale_ttl=60) == {"n": 1}
+    await asyncio.sleep(0)
+    assert len(calls) == 2
+    assert cache.stats()["background_refreshes"] == 1
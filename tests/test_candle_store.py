@@ -0,0 +1,56 @@
+import numpy as np
+import pytest
+from src.data.candle_store import CandleStore
+
+def make_candles(start: int, count: int, step: int = 3600):
+    return [
+        {"unixTime": start + i * step, "o": 1.0 + i, "h": 2.0 + i, "l": 0.5 + i, "c": 1.5 + i, "v": 100.0 * i}
+        for i in range(count)
+    ]
+
+@pytest.fixture
+def store(tmp_path):
+    return CandleStore(str(tmp_path))
+
+def test_append_only_adds_the_missing_tail(store):
+    assert store.append("token", make_candles(0, 5)) == 5
+    assert store.append("token", make_candles(0, 8)) == 3
+    
+    frame = store.read("token")
+    assert list(frame.time) == [i * 3600 for i in range(8)]
+    assert store.last_time("token") == 7 * 3600
+
+def test_last_candle_is_updated_in_place(store):
+    store.append("token", make_candles(0, 3))
+    store.append("token", [{"unixTime": 2 * 3600, "c": 42.0, "v": 7.0}])
+    
+    frame = store.read("token")
+    assert len(frame) == 3
+    assert frame.close[-1] == 42.0
+    assert frame.volume[-1] == 7.0
+
+def test_range_reads_are_zero_copy_views(store):
+    store.append("token", make_candles(0, 10))
+    
+    frame = store.read("token", start=2 * 3600, end=5 * 3600)
+    assert list(frame.time) == [2 * 3600, 3 * 3600, 4 * 3600]
+    assert isinstance(frame.close.base, np.memmap) or isinstance(frame.close, np.memmap)
+    assert len(store.tail("token", 4)) == 4
+    assert len(store.read("missing")) == 0
+
+def test_torn_append_is_repaired(store, tmp_path):
+    store.append("token", make_candles(0, 3))
+    with open(tmp_path / "1H" / "token" / "close.bin", "ab") as f:
+        f.write(b"\x00" * 8)
+    
+    assert len(store.read("token")) == 3
+    store.append("token", make_candles(3 * 3600, 1))
+    assert list(store.read("token").close) == [1.5, 2.5, 3.5, 1.5]
+
+def test_tail_frames_are_unaffected_by_rewriting_the_last_candle(store):
+    store.append("token", make_candles(0, 3))
+    frame = store.tail("token", 2)
+    
+    store.append("token", [{"unixTime": 2 * 3600, "c": 42.0}])
+    assert frame.close[-1] == 3.5
+    assert store.tail("token", 2).close[-1] == 42.0
@@ -0,0 +1,78 @@
+import aiohttp
+import pytest
+from src.utils.capture import TrafficCapture
+from src.data.rpc_standin import RPCStandinServer
+
+async def test_record_then_replay_offline(tmp_path):
+    archive = str(tmp_path / "traffic.jsonl.gz")
+    server = RPCStandinServer()
+    await server.start()
+    
+    recorder = TrafficCapture(mode="record", path=archive)
+    async with aiohttp.ClientSession() as session:
+        for _ in range(2):
+            await server.add_mint(notify=False)
+            response = await recorder.request(session, "POST", server.http_url, json={
+                "jsonrpc": "2.0", "id": 1, "method": "getSlot", "params": []
+            })
+            assert response.status == 200
+    recorder.close()
+    await server.stop()
+    
+    replayer = TrafficCapture(mode="replay", path=archive)
+    async with aiohttp.ClientSession() as session:
+        slots = []
+        for _ in range(3):
+            response = await replayer.request(session, "POST", server.http_url, json={
+                "jsonrpc": "2.0", "id": 1, "method": "getSlot", "params": []
+            })
+            slots.append((await response.json())["result"])
+        missing = await replayer.request(session, "GET", server.http_url, params={"x": 1})
+    
+    # Replayed in recorded order, repeating the last response once exhausted
+    assert slots == [1001, 1002, 1002]
+    assert missing.status == 404
+    assert replayer.stats()["misses"] == 1
+
+def test_key_ignores_headers_and_param_order():
+    first = TrafficCapture.make_key("get", "https://api", {"a": 1, "b": 2})
+    second = TrafficCapture.make_key("GET", "https://api", {"b": 2, "a": 1})
+    assert first == second
+    
+    with pytest.raises(ValueError):
+        TrafficCapture(mode="replay")
+
+async def test_recorded_archive_holds_no_credentials(tmp_path):
+    import gzip
+    from aiohttp import web
+
+    async def oauth(request):
+        return web.json_response({"token_type": "bearer", "access_token": "AAAA-secret-bearer"})
+
+    app = web.Application()
+    app.router.add_post("/oauth2/token", oauth)
+    app.router.add_post("/rpc", oauth)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    base = f"http://127.0.0.1:{site._server.sockets[0].getsockname()[1]}"
+
+    archive = str(tmp_path / "traffic.jsonl.gz")
+    recorder = TrafficCapture(mode="record", path=archive)
+    async with aiohttp.ClientSession() as session:
+        await recorder.request(session, "POST", f"{base}/oauth2/token", data={"grant_type": "client_credentials"})
+        await recorder.request(session, "POST", f"{base}/rpc?api-key=helius-secret-key", json={"id": 1})
+    recorder.close()
+    await runner.cleanup()
+
+    with gzip.open(archive, "rb") as f:
+        contents = f.read()
+    assert b"AAAA-secret-bearer" not in contents
+    assert b"helius-secret-key" not in contents
+
+    # The redacted keys still replay
+    replayer = TrafficCapture(mode="replay", path=archive)
+    async with aiohttp.ClientSession() as session:
+        response = await replayer.request(session, "POST", f"{base}/rpc?api-key=helius-secret-key", json={"id": 1})
+    assert (await response.json())["access_token"] == "REDACTED"
@@ -0,0 +1,104 @@
+import json
+from datetime import datetime
+import pytest
+from src.data import decoders
+from src.data.decoders import decode_birdeye_transactions, decode_rpc_batch, decode_signatures
+from src.models.transaction import TransactionRecord
+from src.utils import json_codec
+
+TOKEN = "TokenMint"
+SOL = "So11111111111111111111111111111111111111112"
+
+def swap(side, owner="wallet", **extra):
+    item = {
+        "txHash": f"sig-{owner}",
+        "blockUnixTime": 1700000000,
+        "owner": owner,
+        "from": {"address": SOL, "uiAmount": 2.0},
+        "to": {"address": TOKEN, "uiAmount": 5000.0}
+    }
+    if side is not None:
+        item["side"] = side
+    item.update(extra)
+    return item
+
+def birdeye_body(items, success=True):
+    return json.dumps({"success": success, "data": {"items": items}}).encode()
+
+@pytest.fixture(params=list(json_codec.CODEC_FACTORIES))
+def codec(request, monkeypatch):
+    try:
+        selected = json_codec.load_codec(request.param)
+    except ImportError:
+        pytest.skip(f"{request.param} is not installed")
+    monkeypatch.setattr(decoders, "loads", selected.loads)
+    return selected
+
+def test_unknown_codec_is_rejected():
+    with pytest.raises(ValueError):
+        json_codec.load_codec("simdjson")
+
+class Mint:
+    def __str__(self):
+        return "mint"
+
+def test_codecs_encode_unknown_values_as_strings(codec):
+    encoded = codec.dumps({"mint": Mint(), "n": 1})
+    assert isinstance(encoded, bytes)
+    assert codec.loads(encoded) == {"mint": "mint", "n": 1}
+
+def test_environment_selects_the_codec(monkeypatch):
+    monkeypatch.setattr(json_codec, "_codec", None)
+    monkeypatch.setenv("JSON_CODEC", "json")
+    assert json_codec.get_codec().name == "json"
+
+def test_decode_signatures_skips_failed_transactions(codec):
+    body = json.dumps({"result": [
+        {"signature": "a", "err": None},
+        {"signature": "b", "err": {"InstructionError": [0, "Custom"]}},
+        {"signature": "c"}
+    ]}).encode()
+    assert decode_signatures(body) == ["a", "c"]
+    assert decode_signatures(body, skip_failed=False) == ["a", "b", "c"]
+
+def test_decode_rpc_batch_orders_results_by_id(codec):
+    body = json.dumps([
+        {"jsonrpc": "2.0", "id": 2, "result": "second"},
+        {"jsonrpc": "2.0", "id": 1, "result": "first"},
+        {"jsonrpc": "2.0", "id": 3, "error": {"code": -32000}}
+    ])
+    assert decode_rpc_batch(body) == ["first", "second", None]
+
+def test_birdeye_swaps_use_the_token_leg_and_skip_missing_sides(codec):
+    sell = swap("sell", owner="seller", **{
+        "from": {"address": TOKEN, "uiAmount": 700.0},
+        "to": {"address": SOL, "uiAmount": 0.3}
+    })
+    body = birdeye_body([swap("buy", owner="buyer"), sell, swap(None, owner="unknown")])
+
+    records = decode_birdeye_transactions(body, TOKEN)
+    assert [(record.address, record.type, record.amount) for record in records] == [
+        ("buyer", "buy", 5000.0),
+        ("seller", "sell", 700.0)
+    ]
+
+def test_birdeye_legs_follow_the_side_without_a_token_address(codec):
+    records = decode_birdeye_transactions(birdeye_body([swap("buy")]))
+    assert records[0].amount == 5000.0
+    assert decode_birdeye_transactions(birdeye_body([swap("buy")], success=False)) == []
+
+def test_record_behaves_like_the_dicts_analyzers_expect():
+    record = TransactionRecord.from_birdeye(swap("buy"), TOKEN)
+    assert record["type"] == "buy"
+    assert record.get("missing", "default") == "default"
+    with pytest.raises(KeyError):
+        record["missing"]
+    assert record.to_dict() == {
+        "signature": "sig-wallet",
+        "timestamp": datetime.fromtimestamp(1700000000),
+        "type": "buy",
+        "amount": 5000.0,
+        "address": "wallet"
+    }
+    assert record == TransactionRecord(**record.to_dict())
+    assert TransactionRecord.from_birdeye(swap("transfer")) is None
@@ -0,0 +1,78 @@
+import asyncio
+import time
+import pytest
+from src.agents.pipeline import Pipeline, Stage
+
+async def test_items_flow_through_every_stage():
+    published = []
+
+    async def double(item):
+        return item * 2
+
+    async def drop_odd(item):
+        return item if item % 4 == 0 else None
+
+    async def publish(item):
+        published.append(item)
+
+    pipeline = Pipeline([
+        Stage("double", double, workers=2),
+        Stage("filter", drop_odd, workers=2),
+        Stage("publish", publish)
+    ])
+    run = await pipeline.run(range(10))
+
+    assert sorted(published) == [0, 4, 8, 12, 16]
+    assert run["items"] == 10
+    assert run["stages"]["filter"]["dropped"] == 5
+    assert run["stages"]["publish"]["processed"] == 5
+
+async def test_workers_overlap_slow_items():
+    async def slow(item):
+        await asyncio.sleep(0.05)
+        return item
+
+    async def publish(item):
+        pass
+
+    pipeline = Pipeline([Stage("fetch", slow, workers=10), Stage("publish", publish)])
+    start = time.perf_counter()
+    await pipeline.run(range(10))
+
+    assert time.perf_counter() - start < 0.3
+
+async def test_errors_are_counted_without_stopping_the_run():
+    async def fail_on_three(item):
+        if item == 3:
+            raise RuntimeError("boom")
+        return item
+
+    async def publish(item):
+        pass
+
+    pipeline = Pipeline([Stage("fetch", fail_on_three), Stage("publish", publish)])
+    run = await pipeline.run(range(5))
+
+    assert run["stages"]["fetch"]["errors"] == 1
+    assert run["stages"]["publish"]["processed"] == 4
+
+async def test_full_queue_applies_backpressure():
+    release = asyncio.Event()
+
+    async def passthrough(item):
+        return item
+
+    async def blocked(item):
+        await release.wait()
+
+    pipeline = Pipeline([
+        Stage("fetch", passthrough, queue_size=1),
+        Stage("publish", blocked, queue_size=1)
+    ])
+    task = asyncio.create_task(pipeline.run(range(20)))
+    await asyncio.sleep(0.05)
+
+    assert pipeline.stages[0].metrics.processed <= 3
+    release.set()
+    run = await task
+    assert run["stages"]["publish"]["processed"] == 20
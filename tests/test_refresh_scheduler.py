@@ -0,0 +1,85 @@
+import asyncio
+import pytest
+from src.agents.refresh_scheduler import RefreshScheduler
+
+def test_hot_tokens_refresh_sooner_within_the_same_budget(clock):
+    scheduler = RefreshScheduler(base_interval=300, min_interval=5, max_interval=3600, clock=clock)
+    addresses = ["hot"] + [f"cold_{i}" for i in range(20)]
+    for address in addresses:
+        scheduler.add(address)
+        scheduler.observe(address, volume=1000, risk_score=50)
+
+    scheduler.observe("hot", volume=5000, risk_score=80)
+    for address in addresses[1:]:
+        scheduler.observe(address, volume=1000, risk_score=50)
+
+    intervals = {address: scheduler.interval(address) for address in addresses}
+    assert intervals["hot"] < 100
+    assert intervals["cold_0"] > 300
+    # Total refresh rate stays at one refresh per token per base interval
+    assert sum(1 / interval for interval in intervals.values()) == pytest.approx(len(addresses) / 300)
+
+def test_pop_due_returns_tokens_in_deadline_order(clock):
+    scheduler = RefreshScheduler(clock=clock)
+    scheduler.add("later", delay=20)
+    scheduler.add("sooner", delay=10)
+    scheduler.add("future", delay=500)
+
+    clock.now += 30
+    assert scheduler.pop_due() == ["sooner", "later"]
+    assert scheduler.pop_due() == []
+    assert not scheduler.is_due("sooner")
+
+def test_client_interest_pulls_deadline_forward(clock):
+    scheduler = RefreshScheduler(base_interval=300, clock=clock)
+    for address in ("watched", "ignored"):
+        scheduler.add(address)
+        scheduler.observe(address, volume=100, risk_score=10)
+    before = scheduler.next_deadline()
+
+    for _ in range(5):
+        scheduler.touch("watched")
+
+    assert scheduler.next_deadline() < before
+    clock.now = scheduler.next_deadline()
+    assert scheduler.pop_due() == ["watched"]
+
+def test_removed_tokens_are_not_returned(clock):
+    scheduler = RefreshScheduler(clock=clock)
+    scheduler.add("gone")
+    scheduler.remove("gone")
+    # A refresh that was in flight when the token left reports back late
+    scheduler.observe("gone", volume=100, risk_score=10)
+
+    assert scheduler.pop_due() == []
+    assert len(scheduler) == 0
+
+async def test_run_refreshes_due_tokens():
+    scheduler = RefreshScheduler()
+    refreshed = asyncio.Queue()
+
+    async def refresh(addresses):
+        await refreshed.put(addresses)
+
+    task = asyncio.create_task(scheduler.run(refresh))
+    scheduler.add("token", delay=0.01)
+    try:
+        assert await asyncio.wait_for(refreshed.get(), 1) == ["token"]
+    finally:
+        task.cancel()
+
+def test_volume_heat_fades_instead_of_resetting(clock):
+    scheduler = RefreshScheduler(base_interval=300, volume_half_life=600, clock=clock)
+    scheduler.add("token")
+    scheduler.observe("token", volume=1000, risk_score=50)
+    scheduler.observe("token", volume=3000, risk_score=50)
+    hot = scheduler.heat("token")
+
+    # Scheduled refreshes between discoveries see the same 24h volume
+    clock.now += 60
+    scheduler.observe("token", volume=3000, risk_score=50)
+    assert 1.0 < scheduler.heat("token") < hot
+    assert scheduler.heat("token") > 2.5
+
+    clock.now += 6000
+    assert scheduler.heat("token") == pytest.approx(1.0, abs=0.01)
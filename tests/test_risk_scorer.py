@@ -0,0 +1,45 @@
+import numpy as np
+import pytest
+from src.analyzers.risk_scorer import BatchRiskScorer, RiskInputs, SIGNALS, BUY, SELL, WAIT
+from src.models.token import TradingSignal
+
+def make_inputs():
+    return RiskInputs.from_rows([
+        {"sniper_count": 0, "bot_count": 0, "insider_count": 0, "natural_chart": True,
+         "pump_and_dump": 0, "wash_trading": 0, "sentiment": 0.8},
+        {"sniper_count": 5, "bot_count": 3, "insider_count": 2, "natural_chart": False,
+         "pump_and_dump": 1, "wash_trading": 0, "sentiment": -0.5},
+        {"sniper_count": 1, "bot_count": 0, "insider_count": 0, "natural_chart": True,
+         "pump_and_dump": 0, "wash_trading": 1, "sentiment": 0.0}
+    ])
+
+def test_equal_weights_match_unweighted_formula():
+    scorer = BatchRiskScorer({})
+    risk = scorer.score(make_inputs())
+
+    # 50 + 10 + 4.5 + 6 + 20 + 15 + 5 capped at 100; 50 + 2 + 10
+    assert risk.tolist() == [50.0, 100.0, 62.0]
+
+def test_weights_come_from_config():
+    scorer = BatchRiskScorer({"analysis": {"transaction_weight": 0.0, "chart_weight": 0.5, "sentiment_weight": 0.5}})
+    risk = scorer.score(make_inputs())
+
+    # Chart risk counts 1.5x, transaction risk is ignored
+    assert risk[2] == pytest.approx(50 + 10 * 1.5)
+
+def test_signals():
+    scorer = BatchRiskScorer({"risk_threshold": 70})
+    inputs = make_inputs()
+    signals = scorer.signals(scorer.score(inputs), inputs)
+
+    assert signals.tolist() == [BUY, SELL, WAIT]
+    assert SIGNALS[BUY].value == TradingSignal.BUY.value
+
+def test_threshold_change_rescores_without_new_inputs():
+    scorer = BatchRiskScorer({"risk_threshold": 70})
+    inputs = make_inputs()
+    scorer.update(risk_threshold=60)
+
+    assert scorer.signals(scorer.score(inputs), inputs).tolist() == [BUY, SELL, SELL]
+    with pytest.raises(ValueError):
+        scorer.update(unknown_weight=1)
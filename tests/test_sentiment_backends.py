@@ -0,0 +1,35 @@
+import json
+from pathlib import Path
+import pytest
+from src.agents.sentiment_agent import LexiconBackend, make_backend
+from src.analyzers.text_scorer import TextScorer
+
+CORPUS = Path(__file__).parent / "fixtures" / "sentiment_corpus.jsonl"
+
+def test_lexicon_scores_crypto_slang():
+    scores = LexiconBackend().score_batch([
+        "$BONK to the moon 🚀 lfg",
+        "rugged again, ngmi",
+        "not a scam",
+        "contract address please",
+    ])
+    assert scores[0][0] > 0.5
+    assert scores[1][0] < -0.5
+    assert scores[2][0] > 0
+    assert scores[3] == (0.0, 0.0)
+
+def test_lexicon_accuracy_on_fixture_corpus():
+    rows = [json.loads(line) for line in CORPUS.read_text(encoding="utf-8").splitlines()]
+    scores = LexiconBackend().score_batch([row["text"] for row in rows])
+    predicted = [1 if polarity >= 0.1 else -1 if polarity <= -0.1 else 0 for polarity, _ in scores]
+    accuracy = sum(p == row["label"] for p, row in zip(predicted, rows)) / len(rows)
+    assert accuracy >= 0.85
+
+async def test_text_scorer_runs_any_backend():
+    scorer = TextScorer(workers=0, score_batch=make_backend("lexicon").score_batch)
+    [(polarity, _)] = await scorer.score(["so bullish"])
+    assert polarity > 0.8
+
+def test_unknown_backend_is_rejected():
+    with pytest.raises(ValueError):
+        make_backend("vader")
@@ -0,0 +1,73 @@
+import time
+from src.agents.sentiment_agent import SentimentAnalyzer
+from src.analyzers.text_scorer import TextScorer
+from src.utils.cache import TTLCache
+
+def make_analyzer(path=None) -> SentimentAnalyzer:
+    cache = TTLCache(max_entries=2, default_ttl=300, stale_ttl=3600, persist_path=path)
+    return SentimentAnalyzer("key", "secret", scorer=TextScorer(workers=0), cache=cache)
+
+async def test_rate_limited_lookups_serve_stale_results():
+    analyzer = make_analyzer()
+    analyzer.sentiment_cache.set("TEST:Test", {"overall_sentiment": 0.4, "tweets": []})
+    analyzer.sentiment_cache.get_entry("TEST:Test").stored_at -= 400
+    analyzer.last_twitter_call = time.time()
+
+    result = await analyzer.analyze_sentiment("TEST", "Test")
+    assert result["overall_sentiment"] == 0.4
+    assert result["stale"]
+    assert result["cache_age"] >= 400
+
+    # Nothing cached means no answer, not a neutral score
+    assert await analyzer.analyze_sentiment("OTHER", "Other") is None
+
+async def test_failed_searches_return_only_cached_results(monkeypatch):
+    from src.agents import sentiment_agent
+
+    statuses = []
+
+    class FakeResponse:
+        def __init__(self, status):
+            self.status = status
+
+        async def text(self):
+            return "error"
+
+    async def fake_request(session, method, url, params=None, **kwargs):
+        return FakeResponse(statuses.pop(0))
+
+    async def fake_token():
+        return "token"
+
+    analyzer = make_analyzer()
+    analyzer.twitter_rate_limit = 0
+    analyzer._get_bearer_token = fake_token
+    monkeypatch.setattr(sentiment_agent.capture, "request", fake_request)
+    analyzer.sentiment_cache.set("TEST:Test", {"overall_sentiment": 0.4, "tweets": []})
+    analyzer.sentiment_cache.get_entry("TEST:Test").stored_at -= 400
+
+    for status in (429, 500):
+        statuses.append(status)
+        results = await analyzer.analyze_sentiment_batch([("a", "TEST", "Test"), ("b", "OTHER", "Other")])
+        assert set(results) == {"a"}
+        assert results["a"]["stale"]
+
+async def test_fresh_results_skip_the_search():
+    analyzer = make_analyzer()
+    analyzer.sentiment_cache.set("TEST:Test", {"overall_sentiment": -0.2, "tweets": []})
+
+    result = await analyzer.analyze_sentiment("TEST", "Test")
+    assert result["overall_sentiment"] == -0.2
+    assert not result["stale"]
+    assert analyzer.last_twitter_call == 0
+
+def test_cache_is_bounded_and_persisted(tmp_path):
+    path = str(tmp_path / "sentiment_cache.json")
+    analyzer = make_analyzer(path)
+    for symbol in ("A", "B", "C"):
+        analyzer.sentiment_cache.set(f"{symbol}:{symbol}", {"overall_sentiment": 0.1, "tweets": []})
+    analyzer.close()
+
+    restarted = make_analyzer(path)
+    assert restarted.cached_sentiment("A", "A") is None
+    assert restarted.cached_sentiment("C", "C")["overall_sentiment"] == 0.1
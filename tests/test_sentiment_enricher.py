@@ -0,0 +1,139 @@
+import asyncio
+import time
+import pytest
+from src.agents.sentiment_enricher import SentimentEnricher
+from src.models.token import Token
+
+class FakeAnalyzer:
+    def __init__(self, rate_limit: float = 0.0):
+        self.rate_limit = rate_limit
+        self.last_call = 0.0
+        self.calls = []
+
+    def quota_wait(self) -> float:
+        return max(0.0, self.last_call + self.rate_limit - time.time())
+
+    async def analyze_sentiment(self, symbol, name):
+        self.calls.append(name)
+        return {"overall_sentiment": 0.6, "tweets": []}
+
+    async def analyze_sentiment_batch(self, requests):
+        self.last_call = time.time()
+        return {key: await self.analyze_sentiment(symbol, name) for key, symbol, name in requests}
+
+def make_enricher(analyzer, tokens, results, batch_size=1):
+    async def on_result(token, sentiment):
+        results.append((token.address, sentiment["overall_sentiment"]))
+
+    return SentimentEnricher(analyzer, tokens.get, on_result, refresh_interval=60, batch_size=batch_size)
+
+def make_tokens(*addresses):
+    return {address: Token(address=address, name=address, creator_address="creator") for address in addresses}
+
+async def test_highest_priority_is_enriched_first():
+    analyzer = FakeAnalyzer()
+    tokens = make_tokens("low", "high", "mid")
+    results = []
+    enricher = make_enricher(analyzer, tokens, results)
+    enricher.submit("low", 0.1)
+    enricher.submit("high", 0.9)
+    enricher.submit("mid", 0.5)
+
+    task = asyncio.create_task(enricher.run())
+    await asyncio.sleep(0.05)
+    task.cancel()
+
+    assert analyzer.calls == ["high", "mid", "low"]
+    assert results[0] == ("high", 0.6)
+
+async def test_searches_wait_for_quota():
+    analyzer = FakeAnalyzer(rate_limit=10)
+    tokens = make_tokens("first", "second")
+    enricher = make_enricher(analyzer, tokens, [])
+    enricher.submit("first", 1)
+    enricher.submit("second", 0.5)
+
+    task = asyncio.create_task(enricher.run())
+    await asyncio.sleep(0.05)
+    task.cancel()
+
+    assert analyzer.calls == ["first"]
+    assert enricher.stats()["pending"] == 1
+
+async def test_recently_enriched_tokens_are_not_requeued():
+    analyzer = FakeAnalyzer()
+    tokens = make_tokens("token")
+    enricher = make_enricher(analyzer, tokens, [])
+    enricher.submit("token", 1)
+
+    task = asyncio.create_task(enricher.run())
+    await asyncio.sleep(0.05)
+    enricher.submit("token", 1)
+    assert len(enricher) == 0
+    enricher.submit("token", 1, force=True)
+    assert len(enricher) == 1
+    task.cancel()
+
+async def test_stale_results_stay_queued_for_refresh():
+    class StaleAnalyzer(FakeAnalyzer):
+        async def analyze_sentiment(self, symbol, name):
+            result = await super().analyze_sentiment(symbol, name)
+            return dict(result, stale=True, cache_age=600)
+
+    analyzer = StaleAnalyzer(rate_limit=10)
+    tokens = make_tokens("token")
+    results = []
+    enricher = make_enricher(analyzer, tokens, results)
+    enricher.submit("token", 1)
+
+    task = asyncio.create_task(enricher.run())
+    await asyncio.sleep(0.05)
+    task.cancel()
+
+    assert results == [("token", 0.6)]
+    assert len(enricher) == 1
+    assert enricher.stats()["stale"] == 1
+
+async def test_one_search_enriches_a_batch_and_requeues_the_rest():
+    class PackingAnalyzer(FakeAnalyzer):
+        async def analyze_sentiment_batch(self, requests):
+            # Only two tokens fit in the query
+            return await super().analyze_sentiment_batch(requests[:2])
+
+    analyzer = PackingAnalyzer(rate_limit=10)
+    tokens = make_tokens("a", "b", "c")
+    results = []
+    enricher = make_enricher(analyzer, tokens, results, batch_size=3)
+    enricher.submit("a", 0.9)
+    enricher.submit("b", 0.5)
+    enricher.submit("c", 0.7)
+
+    task = asyncio.create_task(enricher.run())
+    await asyncio.sleep(0.05)
+    task.cancel()
+
+    assert [address for address, _ in results] == ["a", "c"]
+    assert enricher.stats()["searches"] == 1
+    assert len(enricher) == 1
+
+async def test_unanswered_searches_keep_sentiment_and_back_off():
+    class FailingAnalyzer(FakeAnalyzer):
+        async def analyze_sentiment_batch(self, requests):
+            self.calls.append(len(requests))
+            return {}
+
+    analyzer = FailingAnalyzer()
+    tokens = make_tokens("a", "b")
+    enricher = SentimentEnricher(analyzer, tokens.get, None, refresh_interval=60, batch_size=2, retry_delay=0.2)
+    enricher.submit("a", 0.5)
+    enricher.submit("b", 0.4)
+
+    task = asyncio.create_task(enricher.run())
+    await asyncio.sleep(0.1)
+    task.cancel()
+
+    # One attempt, nothing applied, both tokens still queued for a retry
+    assert analyzer.calls == [2]
+    assert enricher.stats()["unanswered"] == 1
+    assert enricher.stats()["pending"] == 2
+    assert enricher.stats()["searches"] == 0
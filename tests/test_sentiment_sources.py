@@ -0,0 +1,132 @@
+import time
+import pytest
+from src.agents.sentiment_sources import FixtureSource, SourceAggregator, merge_results
+from src.analyzers.text_scorer import TextScorer
+
+def constant_scorer(polarity):
+    return TextScorer(workers=0, score_batch=lambda texts: [(polarity, 0.5)] * len(texts))
+
+def test_merge_weighs_sources_by_confidence():
+    merged = merge_results({
+        "twitter": {"score": 0.8, "confidence": 0.75, "sample_size": 30},
+        "news": {"score": -0.4, "confidence": 0.25, "sample_size": 5},
+        "telegram": None
+    })
+    assert merged["score"] == pytest.approx(0.5)
+    # Independent evidence: 1 - (1 - 0.75) * (1 - 0.25)
+    assert merged["confidence"] == pytest.approx(0.8125)
+    assert merged["sample_size"] == 35
+    assert merged["sources"]["telegram"] is None
+
+def test_merge_without_answers_is_neutral():
+    merged = merge_results({"news": None, "telegram": {"score": 0.9, "confidence": 0.0}})
+    assert merged["score"] == 0.0
+    assert merged["confidence"] == 0.0
+
+async def test_sources_are_queried_concurrently_and_slow_ones_are_dropped():
+    posts = {"BONK": ["bonk"] * 25}
+    fast = [FixtureSource(posts, constant_scorer(0.6), name=f"fast{i}", delay=0.1, deadline=1.0) for i in range(3)]
+    slow = FixtureSource(posts, constant_scorer(-0.9), name="slow", delay=5.0, deadline=0.2)
+    aggregator = SourceAggregator(fast + [slow])
+
+    start = time.perf_counter()
+    merged = (await aggregator.analyze({"bonk": ["BONK"]}))["bonk"]
+    elapsed = time.perf_counter() - start
+
+    # Bounded by the slowest deadline, not the sum of the delays
+    assert elapsed < 0.5
+    assert merged["sources"]["slow"] is None
+    assert merged["score"] == pytest.approx(0.6)
+    assert merged["sample_size"] == 75
+    assert aggregator.stats()["slow"]["timeouts"] == 1
+
+async def test_rate_limited_sources_are_skipped():
+    posts = {"WIF": ["wif"]}
+    limited = FixtureSource(posts, constant_scorer(0.5), name="limited", min_interval=60)
+    other = FixtureSource(posts, constant_scorer(-0.5), name="other")
+    aggregator = SourceAggregator([limited, other])
+
+    assert (await aggregator.analyze({"wif": ["WIF"]}))["wif"]["sources"]["limited"] is not None
+    second = (await aggregator.analyze({"wif": ["WIF"]}))["wif"]
+    assert second["sources"]["limited"] is None
+    assert second["score"] == pytest.approx(-0.5)
+    assert limited.stats()["rate_limited"] == 1
+    assert other.stats()["queries"] == 2
+
+async def test_a_rate_limited_source_answers_for_every_token_in_a_batch():
+    posts = {"BONK": ["bonk"] * 4, "WIF": ["wif"] * 2, "POPCAT": ["popcat"]}
+    limited = FixtureSource(posts, constant_scorer(0.5), name="limited", min_interval=60)
+    aggregator = SourceAggregator([limited])
+
+    merged = await aggregator.analyze({symbol: [symbol] for symbol in posts})
+    assert {key: result["sample_size"] for key, result in merged.items()} == {"BONK": 4, "WIF": 2, "POPCAT": 1}
+    assert limited.stats()["queries"] == 1
+    assert limited.stats()["rate_limited"] == 0
+
+async def test_batched_search_blends_in_other_sources(monkeypatch, tmp_path):
+    from src.agents import sentiment_agent
+    from src.agents.sentiment_agent import SentimentAnalyzer
+
+    class FakeResponse:
+        status = 200
+
+        async def json(self):
+            return {"data": [{"id": "1", "text": "BONK is great"}]}
+
+    async def fake_request(session, method, url, params=None, **kwargs):
+        return FakeResponse()
+
+    async def fake_token():
+        return "token"
+
+    fixture = tmp_path / "posts.json"
+    fixture.write_text('{"BONK": ' + str(["bonk news"] * 50).replace("'", '"') + "}")
+    analyzer = SentimentAnalyzer(
+        "key", "secret", scorer=constant_scorer(-1.0),
+        source_config={"fixture": {"path": str(fixture)}}
+    )
+    analyzer._get_bearer_token = fake_token
+    monkeypatch.setattr(sentiment_agent.capture, "request", fake_request)
+
+    result = await analyzer.analyze_sentiment("BONK", "Bonk")
+    # One tweet carries confidence 1/50 next to the fixture's full confidence
+    assert result["tweet_count"] == 1
+    assert result["sources"]["fixture"]["sample_size"] == 50
+    assert result["overall_sentiment"] == pytest.approx(-1.0)
+    assert result["confidence"] == pytest.approx(1.0)
+    assert set(analyzer.sources.stats()) == {"news", "telegram", "fixture"}
+
+def fixture_analyzer(tmp_path, **kwargs):
+    from src.agents.sentiment_agent import SentimentAnalyzer
+
+    fixture = tmp_path / "posts.json"
+    fixture.write_text('{"BONK": ' + str(["bonk news"] * 50).replace("'", '"') + "}")
+    return SentimentAnalyzer(
+        "key", "secret", scorer=constant_scorer(0.5),
+        source_config={"fixture": {"path": str(fixture)}}, **kwargs
+    )
+
+async def test_other_sources_answer_while_twitter_is_locked_out(tmp_path):
+    analyzer = fixture_analyzer(tmp_path)
+    analyzer.last_twitter_call = time.time()
+
+    results = await analyzer.analyze_sentiment_batch([("bonk", "BONK", "Bonk"), ("wif", "WIF", "dogwifhat")])
+    # Only the token a source answered for gets a result; the other can be retried
+    assert set(results) == {"bonk"}
+    assert results["bonk"]["sources"]["fixture"]["sample_size"] == 50
+    assert results["bonk"]["overall_sentiment"] == pytest.approx(0.5)
+
+async def test_a_slow_twitter_search_is_cut_off_at_its_deadline(tmp_path):
+    import asyncio
+
+    analyzer = fixture_analyzer(tmp_path, twitter_deadline=0.1)
+
+    async def slow_search(pending, current_time):
+        await asyncio.sleep(5)
+
+    analyzer._search_twitter = slow_search
+    start = time.perf_counter()
+    results = await analyzer.analyze_sentiment_batch([("bonk", "BONK", "Bonk")])
+
+    assert time.perf_counter() - start < 1.0
+    assert results["bonk"]["sources"]["fixture"]["sample_size"] == 50
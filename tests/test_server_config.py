@@ -0,0 +1,55 @@
+import json
+from src.api import server
+from src.models.token import Token
+
+def read_config_json():
+    with open(server.CONFIG_PATH) as f:
+        return json.load(f)
+
+def test_server_agent_uses_config_json_monitoring():
+    monitoring = read_config_json()["monitoring"]
+    registry = server.trading_agent.active_tokens
+    assert registry.min_liquidity == monitoring["min_liquidity"]
+    assert registry.ttl == monitoring["token_ttl_hours"] * 3600
+
+def test_environment_overrides_secrets_and_paths(monkeypatch):
+    monkeypatch.setenv("BIRDEYE_API_KEY", "birdeye-from-env")
+    monkeypatch.setenv("HTTP_CACHE_PATH", "/tmp/cache-from-env.json")
+    config = server.build_agent_config()
+    assert config["birdeye_api_key"] == "birdeye-from-env"
+    assert config["cache"]["path"] == "/tmp/cache-from-env.json"
+    # Other cache settings still come from config.json
+    assert config["cache"]["max_entries"] == read_config_json()["cache"]["max_entries"]
+
+def test_placeholder_credentials_are_treated_as_unset(monkeypatch):
+    # As load_config returns config.json when the environment sets no credentials
+    file_config = read_config_json()
+    monkeypatch.setattr(server, "load_config", lambda path: dict(file_config))
+    monkeypatch.delenv("BIRDEYE_API_KEY", raising=False)
+    config = server.build_agent_config()
+    for key in server.CREDENTIAL_KEYS:
+        assert config[key] is None
+
+    file_config["twitter_api_key"] = "twitter-from-env"
+    assert server.build_agent_config()["twitter_api_key"] == "twitter-from-env"
+
+def test_mirror_config_scales_max_tokens_and_keeps_other_monitoring_keys():
+    config = {"monitoring": {"max_tokens": 500, "min_liquidity": 10000, "token_ttl_hours": 12}}
+    mirrored = server.mirror_config(config, 4)
+    assert mirrored["monitoring"] == {"max_tokens": 2000, "min_liquidity": 10000, "token_ttl_hours": 12}
+    assert config["monitoring"]["max_tokens"] == 500
+
+def test_server_agent_scores_with_config_json_analysis_weights():
+    config = read_config_json()
+    scorer = server.trading_agent.scorer
+    assert scorer.transaction_weight == config["analysis"]["transaction_weight"]
+    assert scorer.chart_weight == config["analysis"]["chart_weight"]
+    assert scorer.sentiment_weight == config["analysis"]["sentiment_weight"]
+    assert scorer.risk_threshold == config["risk_threshold"]
+
+def test_token_models_describe_the_encoded_tokens():
+    token = Token(address="addr", name="Test", creator_address="creator")
+    token.patterns = ["pump_and_dump"]
+    token.metrics.sniper_count = 2
+    # The endpoints return Token.encoded() directly, so the documented model must match it
+    server.TokenResponse(**json.loads(token.encoded()))
@@ -0,0 +1,138 @@
+import asyncio
+import queue
+from collections import Counter
+import pytest
+from src.agents.sharding import HashRing, QueuePublisher, ShardedWorkers
+
+def test_ring_spreads_addresses_evenly():
+    ring = HashRing(4)
+    counts = Counter(ring.shard_for(f"token{i}") for i in range(4000))
+
+    assert set(counts) == {0, 1, 2, 3}
+    assert min(counts.values()) > 600
+
+def test_adding_a_shard_moves_few_addresses():
+    before, after = HashRing(4), HashRing(5)
+    addresses = [f"token{i}" for i in range(2000)]
+    moved = sum(before.shard_for(address) != after.shard_for(address) for address in addresses)
+
+    # Only addresses taken over by the new shard should move
+    assert all(after.shard_for(address) == 4
+               for address in addresses if before.shard_for(address) != after.shard_for(address))
+    assert moved < len(addresses) / 3
+
+def test_shard_workers_score_sentiment_without_a_process_pool():
+    from src.agents.sharding import shard_config
+    config = shard_config({"sentiment": {"scoring_workers": 4, "cache_path": "data/sentiment.json"}}, 2)
+    assert config["sentiment"]["scoring_workers"] == 0
+    assert config["sentiment"]["cache_path"] == "data/sentiment.json.shard2"
+
+class RecordingPublisher:
+    def __init__(self):
+        self.updates = []
+        self.alerts = []
+
+    async def broadcast_token_update(self, data):
+        self.updates.append(data)
+
+    async def broadcast_pattern_alert(self, data):
+        self.alerts.append(data)
+
+class MirrorAgent:
+    def __init__(self):
+        self.applied = []
+
+    def apply_remote_update(self, data):
+        self.applied.append(data["address"])
+
+async def test_relay_mirrors_results_and_forwards_broadcasts():
+    workers = ShardedWorkers({}, shards=2)
+    workers.channel = queue.Queue()
+    worker_side = QueuePublisher(workers.channel, shard=1)
+    await worker_side.broadcast_token_update({"address": "a", "status": "analyzing"})
+    await worker_side.broadcast_token_update({"address": "a", "status": "approved", "risk_score": 40})
+    await worker_side.broadcast_pattern_alert({"token_address": "a", "pattern": {"type": "wash_trading"}})
+
+    agent, publisher = MirrorAgent(), RecordingPublisher()
+    task = asyncio.create_task(workers.relay(agent, publisher, poll_timeout=0.01))
+    await asyncio.sleep(0.1)
+    task.cancel()
+
+    assert agent.applied == ["a"]
+    assert len(publisher.updates) == 2
+    assert publisher.alerts[0]["pattern"]["type"] == "wash_trading"
+
+async def test_relay_drops_tokens_evicted_by_the_shards():
+    from src.agents.token_registry import TokenRegistry
+    from src.models.token import Token
+
+    workers = ShardedWorkers({}, shards=2)
+    workers.channel = queue.Queue()
+    shard_registry = TokenRegistry()
+    shard_registry.on_evict(QueuePublisher(workers.channel, shard=0).forward_eviction)
+    shard_registry.admit(Token(address="a", name="A", creator_address="c"))
+
+    agent = MirrorAgent()
+    agent.active_tokens = TokenRegistry()
+    agent.active_tokens.admit(Token(address="a", name="A", creator_address="c"))
+    shard_registry.remove("a")
+
+    task = asyncio.create_task(workers.relay(agent, RecordingPublisher(), poll_timeout=0.01))
+    await asyncio.sleep(0.1)
+    task.cancel()
+
+    assert "a" not in agent.active_tokens
+    assert workers.stats()["received"] == 1
+
+class DiscoveringAgent:
+    def __init__(self, addresses):
+        self.addresses = addresses
+        self.discoveries = 0
+
+    async def discover_live_tokens(self):
+        self.discoveries += 1
+        return [{"address": address} for address in self.addresses]
+
+def drain(inbox):
+    messages = []
+    while not inbox.empty():
+        messages.append(inbox.get_nowait())
+    return messages
+
+async def test_tokens_are_discovered_once_and_routed_to_their_owners():
+    workers = ShardedWorkers({}, shards=3)
+    workers.inboxes = [queue.Queue() for _ in range(3)]
+    addresses = [f"token{i}" for i in range(30)]
+    agent = DiscoveringAgent(addresses)
+
+    await workers.discover_once(agent)
+
+    assert agent.discoveries == 1
+    for shard, inbox in enumerate(workers.inboxes):
+        [(kind, batch)] = drain(inbox)
+        assert kind == "tokens"
+        assert [token["address"] for token in batch] == [
+            address for address in addresses if workers.ring.shard_for(address) == shard
+        ]
+    assert workers.stats()["dispatched"] == 30
+
+async def test_interest_reaches_the_owning_shard():
+    from src.agents.sharding import apply_message
+
+    workers = ShardedWorkers({}, shards=3)
+    workers.inboxes = [queue.Queue() for _ in range(3)]
+    workers.note_interest("token7")
+
+    owner = workers.ring.shard_for("token7")
+    assert [len(drain(inbox)) for inbox in workers.inboxes] == [int(shard == owner) for shard in range(3)]
+
+    class InterestedAgent:
+        def __init__(self):
+            self.noted = []
+
+        def note_interest(self, address):
+            self.noted.append(address)
+
+    agent = InterestedAgent()
+    await apply_message(agent, "interest", "token7")
+    assert agent.noted == ["token7"]
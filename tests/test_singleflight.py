@@ -0,0 +1,78 @@
+import asyncio
+import pytest
+from src.utils.singleflight import SingleFlight
+
+async def test_concurrent_calls_share_one_request():
+    flight = SingleFlight()
+    calls = []
+    
+    async def fetch():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return {"items": [1]}
+    
+    results = await asyncio.gather(*[flight.do("token", fetch) for _ in range(5)])
+    
+    assert len(calls) == 1
+    assert all(result == {"items": [1]} for result in results)
+    assert flight.stats()["deduplicated"] == 4
+    assert flight.in_flight == 0
+
+async def test_errors_propagate_to_all_waiters():
+    flight = SingleFlight()
+    
+    async def fetch():
+        await asyncio.sleep(0.01)
+        raise RuntimeError("upstream down")
+    
+    results = await asyncio.gather(*[flight.do("token", fetch) for _ in range(3)], return_exceptions=True)
+    
+    assert all(isinstance(result, RuntimeError) for result in results)
+
+async def test_sequential_calls_are_not_deduplicated():
+    flight = SingleFlight()
+    
+    async def fetch():
+        return 1
+    
+    await flight.do("token", fetch)
+    await flight.do("token", fetch)
+    
+    assert flight.deduplicated == 0
+
+async def test_cancelled_first_caller_does_not_cancel_the_others():
+    flight = SingleFlight()
+    
+    async def fetch():
+        await asyncio.sleep(0.05)
+        return "data"
+    
+    first = asyncio.create_task(flight.do("token", fetch))
+    await asyncio.sleep(0)
+    second = asyncio.create_task(flight.do("token", fetch))
+    await asyncio.sleep(0.01)
+    first.cancel()
+    
+    assert await second == "data"
+    assert first.cancelled()
+    assert flight.in_flight == 0
+
+async def test_call_is_cancelled_once_every_caller_has_gone():
+    flight = SingleFlight()
+    cancelled = asyncio.Event()
+    
+    async def fetch():
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+    
+    callers = [asyncio.create_task(flight.do("token", fetch)) for _ in range(2)]
+    await asyncio.sleep(0.01)
+    for caller in callers:
+        caller.cancel()
+    await asyncio.gather(*callers, return_exceptions=True)
+    
+    await asyncio.wait_for(cancelled.wait(), 1.0)
+    assert flight.in_flight == 0
@@ -0,0 +1,79 @@
+import json
+import pytest
+from src.agents.trading_agent import TradingAgent
+
+@pytest.fixture
+def make_agent(test_config, tmp_path):
+    def make():
+        agent = TradingAgent(dict(
+            test_config,
+            birdeye_api_key="test_birdeye_key",
+            candles={"path": str(tmp_path / "candles")},
+            transactions={"path": str(tmp_path / "transactions")},
+            snapshot={"path": str(tmp_path / "agent_snapshot.json")}
+        ))
+
+        async def fetch_transactions(token):
+            return []
+
+        async def fetch_price_history(token, since=None):
+            return [{"unixTime": 1700000000, "value": 1.5}]
+
+        agent._fetch_transactions = fetch_transactions
+        agent._fetch_price_history = fetch_price_history
+        return agent
+    return make
+
+async def test_restart_restores_tokens_and_analysis_state(make_agent, sample_token):
+    agent = make_agent()
+    await agent.pipeline.run([{
+        "address": sample_token.address,
+        "name": sample_token.name,
+        "creator_address": sample_token.creator_address,
+        "symbol": "TEST"
+    }])
+    token = agent.active_tokens[sample_token.address]
+    assert agent.snapshot.save()
+
+    restarted = make_agent()
+    assert restarted.snapshot.load() == 1
+    restored = restarted.active_tokens[sample_token.address]
+    assert restored.symbol == "TEST"
+    assert restored.risk_score == token.risk_score
+    assert restored.trading_signal.value == token.trading_signal.value
+    assert restored.encoded() == token.encoded()
+    assert sample_token.address in restarted.scheduler
+
+    # The restored fingerprint lets the first refresh skip unchanged inputs
+    await restarted._refresh_tokens([sample_token.address])
+    assert restarted.get_stats()["fingerprint"]["skipped"] == 1
+
+def test_unreadable_or_stale_snapshots_are_ignored(make_agent, tmp_path):
+    path = tmp_path / "agent_snapshot.json"
+    agent = make_agent()
+    assert agent.snapshot.load() == 0
+
+    path.write_text("{not json")
+    assert agent.snapshot.load() == 0
+
+    path.write_text(json.dumps({"format": 1, "saved_at": 0, "tokens": []}))
+    assert agent.snapshot.load() == 0
+    assert len(agent.active_tokens) == 0
+
+async def test_tokens_without_registry_state_are_skipped(make_agent, sample_token):
+    agent = make_agent()
+    await agent.pipeline.run([{
+        "address": sample_token.address,
+        "name": sample_token.name,
+        "creator_address": sample_token.creator_address
+    }])
+    assert agent.snapshot.save()
+
+    payload = json.loads(open(agent.snapshot.path).read())
+    broken = dict(payload["tokens"][0], address="other")
+    del broken["registry"]
+    payload["tokens"].insert(0, broken)
+
+    restarted = make_agent()
+    assert restarted.snapshot.restore(payload) == 1
+    assert sample_token.address in restarted.active_tokens
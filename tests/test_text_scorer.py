@@ -0,0 +1,46 @@
+from src.analyzers.text_scorer import TextScorer
+
+async def test_duplicate_and_repeated_texts_are_scored_once():
+    scorer = TextScorer(workers=0, batch_size=2)
+    texts = ["great project", "terrible rug pull", "great project", "neutral"]
+
+    scores = await scorer.score(texts)
+    assert len(scores) == 4
+    assert scores[0] == scores[2]
+    assert scores[0][0] > 0 > scores[1][0]
+    assert scorer.stats()["misses"] == 3
+    assert scorer.stats()["batches"] == 2
+
+    assert await scorer.score(["terrible rug pull"]) == [scores[1]]
+    assert scorer.stats()["misses"] == 3
+
+async def test_cache_is_bounded():
+    scorer = TextScorer(workers=0, max_cached=2)
+    scores = await scorer.score(["one", "two", "three"])
+    assert len(scores) == 3
+    assert scorer.stats()["cached"] == 2
+
+async def test_process_pool_scores_match_inline():
+    pooled = TextScorer(workers=1)
+    try:
+        texts = ["to the moon, amazing gains", "awful scam"]
+        assert await pooled.score(texts) == await TextScorer(workers=0).score(texts)
+    finally:
+        pooled.close()
+
+def _score_in_daemon(results):
+    import asyncio
+    scorer = TextScorer(workers=1)
+    results.put(asyncio.run(scorer.score(["amazing gains"])))
+
+def test_daemonic_process_falls_back_to_threads():
+    import multiprocessing
+    context = multiprocessing.get_context("spawn")
+    results = context.Queue()
+    process = context.Process(target=_score_in_daemon, args=(results,), daemon=True)
+    process.start()
+    try:
+        scores = results.get(timeout=60)
+    finally:
+        process.join(10)
+    assert scores[0][0] > 0
@@ -0,0 +1,50 @@
+import json
+from src.models.token import Token, TokenMetrics
+
+def make_token() -> Token:
+    return Token(address="addr", name="Test", creator_address="creator")
+
+def test_mutations_bump_version():
+    token = make_token()
+    version = token.version
+
+    token.risk_score = 42.0
+    assert token.version == version + 1
+
+    token.metrics.sniper_count = 3
+    assert token.version == version + 2
+
+    token.metrics = TokenMetrics()
+    token.metrics.bot_buyer_count = 1
+    assert token.version == version + 4
+
+def test_encoding_is_cached_until_changed():
+    token = make_token()
+    encoded = token.encoded()
+    assert token.encoded() is encoded
+
+    token.patterns = ["pump_and_dump"]
+    reencoded = token.encoded()
+    assert reencoded is not encoded
+
+    data = json.loads(reencoded)
+    assert data["patterns"] == ["pump_and_dump"]
+    assert data["version"] == token.version
+    assert data["status"] == "new"
+    assert data["metrics"]["sniper_count"] == 0
+
+def test_reassigning_the_same_values_keeps_the_encoding():
+    token = make_token()
+    token.symbol = "TEST"
+    token.patterns = ["wash_trading"]
+    token.metrics.sniper_count = 2
+    encoded = token.encoded()
+
+    token.symbol = "TEST"
+    token.patterns = ["wash_trading"]
+    token.metrics.sniper_count = 2
+    token.metrics = TokenMetrics(sniper_count=2)
+    assert token.encoded() is encoded
+
+    token.price = 1  # int replacing the float default is a change
+    assert token.encoded() is not encoded
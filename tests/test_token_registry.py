@@ -0,0 +1,53 @@
+import pytest
+from src.agents.token_registry import TokenRegistry
+from src.models.token import Token
+
+def make_token(address: str, risk_score: float = 0.0) -> Token:
+    token = Token(address=address, name=address, creator_address="creator")
+    token.risk_score = risk_score
+    return token
+
+def test_rejects_tokens_below_min_liquidity():
+    registry = TokenRegistry(max_tokens=10, min_liquidity=10000)
+
+    assert not registry.admit(make_token("poor"), liquidity=500)
+    assert registry.admit(make_token("rich"), liquidity=50000)
+    assert registry.admit(make_token("unknown"))
+
+    assert "poor" not in registry
+    assert registry.stats()["rejected"] == 1
+    assert len(registry) == 2
+
+def test_capacity_evicts_idle_and_risky_tokens_first(clock):
+    registry = TokenRegistry(max_tokens=3, ttl=3600, evict_fraction=0, clock=clock)
+    released = []
+    registry.on_evict(lambda address, token: released.append(address))
+
+    registry.admit(make_token("idle"))
+    clock.now += 3000
+    registry.admit(make_token("risky", risk_score=95))
+    registry.admit(make_token("busy"))
+    for _ in range(5):
+        registry.touch("busy")
+
+    registry.admit(make_token("new"))
+    assert released == ["idle"]
+
+    registry.admit(make_token("newer"))
+    assert released == ["idle", "risky"]
+    assert set(registry) == {"busy", "new", "newer"}
+    assert registry.stats()["evicted"] == 2
+
+def test_sweep_removes_expired_tokens(clock):
+    registry = TokenRegistry(ttl=60, clock=clock)
+    released = []
+    registry.on_evict(lambda address, token: released.append(address))
+
+    registry.admit(make_token("stale"))
+    clock.now += 30
+    registry.admit(make_token("fresh"))
+    clock.now += 45
+
+    assert registry.sweep() == 1
+    assert released == ["stale"]
+    assert list(registry) == ["fresh"]
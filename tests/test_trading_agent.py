@@ -1,5 +1,6 @@
 import pytest
 from src.models.token import Token, TokenStatus, TradingSignal
+from src.agents.trading_agent import TradingAgent
 
 async def test_process_new_token(trading_agent, sample_token):
     token_data = {
@@ -36,4 +37,109 @@ async def test_risk_score_calculation(trading_agent):
     )
     
     assert 0 <= risk_score <= 100
-    assert risk_score > 50  # Should be high risk given the inputs 
\ No newline at end of file
+    assert risk_score > 50  # Should be high risk given the inputs 
+
+
+@pytest.fixture
+def offline_agent(test_config, tmp_path):
+    config = dict(
+        test_config,
+        birdeye_api_key="test_birdeye_key",
+        candles={"path": str(tmp_path / "candles")},
+        transactions={"path": str(tmp_path / "transactions")}
+    )
+    agent = TradingAgent(config)
+    candles = []
+    
+    async def fetch_transactions(token):
+        return []
+    
+    async def fetch_price_history(token, since=None):
+        return list(candles)
+    
+    agent._fetch_transactions = fetch_transactions
+    agent._fetch_price_history = fetch_price_history
+    agent.candles = candles
+    return agent
+
+async def test_unchanged_inputs_skip_reanalysis(offline_agent, sample_token):
+    token_data = {
+        "address": sample_token.address,
+        "name": sample_token.name,
+        "creator_address": sample_token.creator_address
+    }
+    
+    await offline_agent.pipeline.run([token_data])
+    await offline_agent._refresh_tokens([sample_token.address])
+    assert offline_agent.get_stats()["fingerprint"]["skipped"] == 1
+    assert offline_agent.refresh_pipeline.last_run["stages"]["publish"]["processed"] == 0
+    
+    offline_agent.candles.append({"unixTime": 1700000000, "value": 1.5})
+    await offline_agent._refresh_tokens([sample_token.address])
+    assert offline_agent.get_stats()["fingerprint"]["skipped"] == 1
+    assert offline_agent.refresh_pipeline.last_run["stages"]["publish"]["processed"] == 1
+
+async def test_rediscovered_tokens_wait_for_their_deadline(offline_agent, sample_token):
+    token_data = {
+        "address": sample_token.address,
+        "name": sample_token.name,
+        "creator_address": sample_token.creator_address
+    }
+    
+    await offline_agent.pipeline.run([token_data])
+    await offline_agent.pipeline.run([token_data])
+    
+    assert offline_agent.pipeline.last_run["stages"]["discover"]["dropped"] == 1
+    assert sample_token.address in offline_agent.scheduler
+
+async def test_price_history_pages_through_a_gap(offline_agent, sample_token):
+    import time
+    hour = 3600
+    current_open = int(time.time()) // hour * hour
+    calls = []
+
+    async def fetch_price_history(token, since=None):
+        # Upstream returns at most a day of candles per request
+        calls.append(since)
+        start = current_open - 100 * hour if since is None else since
+        return [{"unixTime": t, "value": 1.0} for t in range(start, min(start + 24 * hour, current_open + 1), hour)]
+
+    offline_agent._fetch_price_history = fetch_price_history
+    frame = await offline_agent._get_price_history(sample_token)
+
+    assert int(frame.time[-1]) == current_open
+    assert len(frame) == offline_agent.price_window
+    assert len(calls) == 5
+
+async def test_volume_heat_follows_the_trending_volume(offline_agent, sample_token):
+    token_data = {
+        "address": sample_token.address,
+        "name": sample_token.name,
+        "creator_address": sample_token.creator_address,
+        "volume24hUSD": 1000.0
+    }
+    offline_agent.candles.append({"unixTime": 1700000000, "value": 1.5})
+    await offline_agent.pipeline.run([token_data])
+    assert offline_agent.scheduler._states[sample_token.address].volume == 1000.0
+
+    offline_agent.active_tokens[sample_token.address].volume24hUSD = 3000.0
+    await offline_agent._refresh_tokens([sample_token.address])
+    assert offline_agent.scheduler._states[sample_token.address].volume_change == 2.0
+
+async def test_tokens_evicted_mid_refresh_are_not_rescheduled(offline_agent, sample_token):
+    token_data = {
+        "address": sample_token.address,
+        "name": sample_token.name,
+        "creator_address": sample_token.creator_address
+    }
+    fetch_price_history = offline_agent._fetch_price_history
+
+    async def evicting_fetch(token, since=None):
+        offline_agent.active_tokens.remove(token.address)
+        return await fetch_price_history(token, since)
+
+    offline_agent._fetch_price_history = evicting_fetch
+    await offline_agent.pipeline.run([token_data])
+
+    assert sample_token.address not in offline_agent.scheduler
+    assert offline_agent.sentiment_enricher.stats()["pending"] == 0
@@ -0,0 +1,76 @@
+from datetime import datetime, timedelta
+import pytest
+from src.data.transaction_log import TransactionLog, to_records
+from src.models.transaction import TransactionRecord
+
+BASE_TIME = datetime(2025, 1, 15, 12, 0, 0)
+
+def make_tx(i: int, side: str = "buy") -> TransactionRecord:
+    return TransactionRecord(
+        signature=f"sig{i}",
+        timestamp=BASE_TIME + timedelta(minutes=i),
+        type=side,
+        amount=float(i),
+        address=f"wallet{i % 3}"
+    )
+
+@pytest.fixture
+def log(tmp_path):
+    return TransactionLog(str(tmp_path))
+
+def test_appends_are_deduplicated(log):
+    assert log.append("token", [make_tx(1), make_tx(2), make_tx(2)]) == 2
+    assert log.append("token", [make_tx(2), make_tx(3)]) == 1
+    
+    assert log.count("token") == 3
+    assert log.contains("token", "sig3")
+    assert not log.contains("token", "sig4")
+
+def test_since_scans_in_time_order(log):
+    # Appended out of time order
+    log.append("token", [make_tx(5, "sell"), make_tx(1)])
+    log.append("token", [make_tx(3)])
+    
+    rows = log.since("token", (BASE_TIME + timedelta(minutes=2)).timestamp())
+    records = to_records(rows)
+    
+    assert [record.signature for record in records] == ["sig3", "sig5"]
+    assert records[-1]["type"] == "sell"
+    assert records[-1]["timestamp"] == BASE_TIME + timedelta(minutes=5)
+    assert log.latest("token")["signature"] == b"sig5"
+
+def test_indexes_rebuilt_after_interrupted_append(log, tmp_path):
+    log.append("token", [make_tx(1), make_tx(2)])
+    (tmp_path / "token" / "ts.idx").write_bytes(b"")
+    
+    reopened = TransactionLog(str(tmp_path))
+    assert len(reopened.since("token", 0)) == 2
+    assert reopened.append("token", [make_tx(1)]) == 0
+
+def test_appends_keep_the_indexes_sorted(log, tmp_path):
+    log.append("token", [make_tx(i) for i in (4, 8, 2)])
+    log.append("token", [make_tx(i) for i in (9, 12)])  # Newer than everything: extends ts.idx
+    log.append("token", [make_tx(i) for i in (1, 6, 10)])
+    
+    rows = log.since("token", 0)
+    assert [row["signature"] for row in rows] == [f"sig{i}".encode() for i in (1, 2, 4, 6, 8, 9, 10, 12)]
+    assert all(log.contains("token", f"sig{i}") for i in (1, 2, 4, 6, 8, 9, 10, 12))
+    
+    # Same indexes as a full rebuild from the log
+    merged = [(tmp_path / "token" / name).read_bytes() for name in ("sig.idx", "ts.idx")]
+    (tmp_path / "token" / "ts.idx").write_bytes(b"")
+    TransactionLog(str(tmp_path)).count("token")
+    assert [(tmp_path / "token" / name).read_bytes() for name in ("sig.idx", "ts.idx")] == merged
+
+def test_prune_compacts_once_enough_has_expired(log):
+    log.append("token", [make_tx(i) for i in range(10)])
+    
+    # Fewer than half the rows have expired
+    assert log.prune("token", (BASE_TIME + timedelta(minutes=3)).timestamp()) == 0
+    assert log.count("token") == 10
+    
+    assert log.prune("token", (BASE_TIME + timedelta(minutes=6)).timestamp()) == 6
+    assert log.count("token") == 4
+    assert [record.signature for record in to_records(log.since("token", 0))] == ["sig6", "sig7", "sig8", "sig9"]
+    assert not log.contains("token", "sig1")
+    assert log.append("token", [make_tx(7), make_tx(10)]) == 1
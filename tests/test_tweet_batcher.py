@@ -0,0 +1,74 @@
+from src.agents.tweet_batcher import SearchTerm, TweetBatcher
+
+def test_pack_fills_the_query_up_to_the_limit():
+    terms = [SearchTerm(f"addr{i}", f"TOK{i}", f"Token Number {i}") for i in range(50)]
+    batcher = TweetBatcher(max_length=200)
+
+    query, included = batcher.pack(terms)
+    assert len(query) <= 200
+    assert 1 < len(included) < 50
+    assert query.startswith('((TOK0 OR "Token Number 0") OR (TOK1')
+    # The retweet filter applies to the whole disjunction, not the last clause
+    assert query.endswith(") -is:retweet")
+
+def test_clauses_too_long_to_search_alone_are_narrowed_or_left_out():
+    long_name = "A Very Long Token Name " * 10
+    terms = [SearchTerm("a", "LONG", long_name), SearchTerm("b", "X" * 200, "x"), SearchTerm("c", "BONK", "Bonk")]
+    batcher = TweetBatcher(max_length=100)
+
+    query, included = batcher.pack(terms)
+    assert len(query) <= 100
+    assert query == "((LONG) OR (BONK)) -is:retweet"
+    assert [(term.key, term.name) for term in included] == [("a", long_name), ("c", "Bonk")]
+    assert batcher.pack([terms[1]]) == ("", [])
+
+def test_terms_that_look_like_operators_are_quoted():
+    assert SearchTerm("a", "-RUG", "rug:pull").clause == '("-RUG" OR "rug:pull")'
+    assert SearchTerm("b", "OR", "Coin (Sol)").clause == '("OR" OR "Coin (Sol)")'
+    assert SearchTerm("c", "BONK", "Bonk").clause == "(BONK)"
+
+def test_route_sends_tweets_to_every_mentioned_token():
+    terms = [SearchTerm("a", "BONK", "Bonk"), SearchTerm("b", "WIF", "dogwifhat"), SearchTerm("c", "POPCAT", "Popcat")]
+    tweets = [
+        {"text": "$BONK is pumping"},
+        {"text": "dogwifhat and bonk both green today"},
+        {"text": "nothing about wifi here"},
+    ]
+
+    routed = TweetBatcher().route(tweets, terms)
+    assert routed == {"a": [0, 1], "b": [1], "c": []}
+
+async def test_analyzer_splits_one_search_across_tokens(monkeypatch):
+    from src.agents import sentiment_agent
+    from src.agents.sentiment_agent import SentimentAnalyzer
+    from src.analyzers.text_scorer import TextScorer
+
+    queries = []
+
+    class FakeResponse:
+        status = 200
+
+        async def json(self):
+            return {"data": [
+                {"text": "BONK is great"},
+                {"text": "dogwifhat is a terrible scam"},
+            ]}
+
+    async def fake_request(session, method, url, params=None, **kwargs):
+        queries.append(params["query"])
+        return FakeResponse()
+
+    async def fake_token():
+        return "token"
+
+    analyzer = SentimentAnalyzer("key", "secret", scorer=TextScorer(workers=0))
+    analyzer._get_bearer_token = fake_token
+    monkeypatch.setattr(sentiment_agent.capture, "request", fake_request)
+
+    results = await analyzer.analyze_sentiment_batch([("a", "BONK", "Bonk"), ("b", "WIF", "dogwifhat")])
+    assert len(queries) == 1
+    assert results["a"]["overall_sentiment"] > 0 > results["b"]["overall_sentiment"]
+    assert [tweet["text"] for tweet in results["b"]["tweets"]] == ["dogwifhat is a terrible scam"]
+    # Both results are cached, so asking again does not search
+    assert (await analyzer.analyze_sentiment("WIF", "dogwifhat"))["overall_sentiment"] < 0
+    assert len(queries) == 1
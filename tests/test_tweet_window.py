@@ -0,0 +1,119 @@
+from datetime import datetime, timezone
+from src.agents.sentiment_agent import SentimentAnalyzer
+from src.agents.tweet_window import TweetWindow, recency_weight
+from src.analyzers.text_scorer import TextScorer
+from src.utils.cache import TTLCache
+
+NOW = 1700000000.0
+
+def tweet(identifier: int, hours_ago: float) -> dict:
+    created = datetime.fromtimestamp(NOW - hours_ago * 3600, timezone.utc)
+    return {"id": str(identifier), "created_at": created.isoformat().replace("+00:00", "Z")}
+
+def test_recent_tweets_weigh_more():
+    window = TweetWindow(hours=24)
+    window.add(tweet(1, 10), -1.0, NOW)
+    window.add(tweet(2, 0), 1.0, NOW)
+
+    assert window.score(NOW) > 0
+    assert len(window) == 2
+    assert window.since_id == 2
+    assert recency_weight(3600) == 0.5
+
+def test_old_buckets_expire_and_state_round_trips():
+    window = TweetWindow(hours=2)
+    window.add(tweet(1, 5), -1.0, NOW)
+    window.add(tweet(2, 0.5), 0.5, NOW)
+    assert window.score(NOW) == 0.5
+    assert len(window) == 1
+
+    restored = TweetWindow.from_state(window.to_state(), hours=2)
+    assert restored.score(NOW) == 0.5
+    assert [tweet["sentiment"] for tweet in restored.recent(NOW)] == [0.5]
+    assert not restored.is_new(tweet(2, 0))
+    assert restored.is_new(tweet(3, 0))
+
+def test_recent_tweets_are_bounded_and_newest_first():
+    window = TweetWindow(hours=24, max_recent=3)
+    for identifier in range(5):
+        window.add(dict(tweet(identifier, 5 - identifier), text=f"tweet {identifier}"), 0.1, NOW)
+
+    assert [item["text"] for item in window.recent(NOW)] == ["tweet 4", "tweet 3", "tweet 2"]
+    assert len(window) == 5
+
+async def test_refreshes_fetch_and_score_only_new_tweets(monkeypatch):
+    from src.agents import sentiment_agent
+
+    pages = [
+        [{"id": "10", "text": "BONK is great"}],
+        [{"id": "11", "text": "BONK is terrible"}, {"id": "10", "text": "BONK is great"}],
+    ]
+    requests = []
+
+    class FakeResponse:
+        status = 200
+
+        async def json(self):
+            return {"data": pages[len(requests) - 1]}
+
+    async def fake_request(session, method, url, params=None, **kwargs):
+        requests.append(params)
+        return FakeResponse()
+
+    async def fake_token():
+        return "token"
+
+    scorer = TextScorer(workers=0)
+    analyzer = SentimentAnalyzer("key", "secret", scorer=scorer, cache=TTLCache(default_ttl=0))
+    analyzer.twitter_rate_limit = 0
+    analyzer._get_bearer_token = fake_token
+    monkeypatch.setattr(sentiment_agent.capture, "request", fake_request)
+
+    first = await analyzer.analyze_sentiment("BONK", "Bonk")
+    second = await analyzer.analyze_sentiment("BONK", "Bonk")
+
+    assert "since_id" not in requests[0]
+    assert requests[1]["since_id"] == "10"
+    # The window's tweets, not just this refresh's new ones
+    assert [tweet["text"] for tweet in second["tweets"]] == ["BONK is terrible", "BONK is great"]
+    assert second["tweet_count"] == 2
+    assert second["overall_sentiment"] < first["overall_sentiment"]
+    assert scorer.stats()["misses"] == 2
+
+async def test_batched_search_pages_until_the_cursor(monkeypatch):
+    from src.agents import sentiment_agent
+
+    pages = [
+        {"data": [{"id": "30", "text": "BONK is great"}], "meta": {"next_token": "page2"}},
+        {"data": [{"id": "20", "text": "dogwifhat is terrible"}], "meta": {}},
+    ]
+    requests = []
+
+    class FakeResponse:
+        status = 200
+
+        def __init__(self, body):
+            self.body = body
+
+        async def json(self):
+            return self.body
+
+    async def fake_request(session, method, url, params=None, **kwargs):
+        requests.append(params)
+        return FakeResponse(pages[len(requests) - 1])
+
+    async def fake_token():
+        return "token"
+
+    analyzer = SentimentAnalyzer("key", "secret", scorer=TextScorer(workers=0))
+    analyzer._get_bearer_token = fake_token
+    monkeypatch.setattr(sentiment_agent.capture, "request", fake_request)
+
+    results = await analyzer.analyze_sentiment_batch([("a", "BONK", "Bonk"), ("b", "WIF", "dogwifhat")])
+
+    assert len(requests) == 2
+    assert "start_time" in requests[0] and "next_token" not in requests[0]
+    assert requests[1]["next_token"] == "page2"
+    assert results["a"]["tweet_count"] == 1
+    assert results["b"]["tweet_count"] == 1
+    assert analyzer.truncated_searches == 0
@@ -0,0 +1,118 @@
+import asyncio
+import json
+import time
+import pytest
+from src.api.websocket import WebSocketManager
+
+class FakeWebSocket:
+    def __init__(self, delay: float = 0.0, fail: bool = False):
+        self.delay = delay
+        self.fail = fail
+        self.sent = []
+        self.closed_with = None
+        self.unblocked = asyncio.Event()
+        if not delay:
+            self.unblocked.set()
+
+    async def accept(self):
+        pass
+
+    async def send_text(self, text):
+        if self.fail:
+            raise RuntimeError("connection reset")
+        await self.unblocked.wait()
+        self.sent.append(text)
+
+    async def close(self, code=1000):
+        self.closed_with = code
+
+def token_bytes(address, risk_score):
+    return json.dumps({"address": address, "risk_score": risk_score}, separators=(",", ":")).encode()
+
+async def settle():
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+async def test_slow_client_does_not_hold_up_broadcasts_or_others():
+    manager = WebSocketManager(queue_size=100, overflow="drop_oldest")
+    slow, fast = FakeWebSocket(delay=1.0), FakeWebSocket()
+    await manager.connect(slow)
+    await manager.connect(fast)
+
+    start = time.perf_counter()
+    for i in range(10):
+        await manager.broadcast({"n": i})
+    assert time.perf_counter() - start < 0.1
+
+    await settle()
+    assert [json.loads(text)["n"] for text in fast.sent] == list(range(10))
+    assert slow.sent == []
+    assert manager.stats()["queued"] > 0
+
+async def test_drop_oldest_keeps_the_newest_messages():
+    manager = WebSocketManager(queue_size=3, overflow="drop_oldest")
+    client = FakeWebSocket(delay=1.0)
+    await manager.connect(client)
+    await settle()  # The writer is idle, waiting on the queue
+
+    for i in range(6):
+        await manager.broadcast({"n": i})
+    client.unblocked.set()
+    await settle()
+
+    assert [json.loads(text)["n"] for text in client.sent] == [3, 4, 5]
+    assert manager.stats()["dropped"] == 3
+
+async def test_coalesce_sends_the_latest_update_per_token_in_order():
+    manager = WebSocketManager(queue_size=10, overflow="coalesce")
+    client = FakeWebSocket(delay=1.0)
+    await manager.connect(client)
+
+    await manager.broadcast_token_update(token_bytes("a", 1))
+    await manager.broadcast_token_update(token_bytes("b", 1))
+    await manager.broadcast_token_update({"address": "a", "status": "analyzing"})
+    await manager.broadcast_token_update(token_bytes("a", 2))
+    client.unblocked.set()
+    await settle()
+
+    received = [json.loads(text)["data"] for text in client.sent]
+    assert received == [{"address": "b", "risk_score": 1}, {"address": "a", "risk_score": 2}]
+    assert manager.stats()["coalesced"] == 2
+
+async def test_disconnect_policy_closes_a_client_that_falls_behind():
+    manager = WebSocketManager(queue_size=2, overflow="disconnect")
+    slow, fast = FakeWebSocket(delay=1.0), FakeWebSocket()
+    await manager.connect(slow)
+    await manager.connect(fast)
+    await settle()
+
+    # The slow client's writer blocks sending the first message, two more fill its queue
+    for i in range(4):
+        await manager.broadcast({"n": i})
+        await settle()
+    slow.unblocked.set()
+    await settle()
+
+    assert slow.closed_with == 1013
+    assert manager.active_connections == {fast}
+    assert len(fast.sent) == 4
+    # The endpoint's own disconnect after the close is a no-op
+    manager.disconnect(slow)
+    assert manager.stats()["disconnected"] == 1
+
+async def test_failed_sends_drop_the_client_and_new_clients_get_the_last_update():
+    manager = WebSocketManager()
+    broken = FakeWebSocket(fail=True)
+    await manager.connect(broken)
+    await manager.broadcast({"n": 1})
+    await settle()
+    assert manager.active_connections == set()
+
+    late = FakeWebSocket()
+    await manager.connect(late)
+    await settle()
+    assert [json.loads(text)["n"] for text in late.sent] == [1]
+
+def test_unknown_overflow_policy_is_rejected():
+    with pytest.raises(ValueError):
+        WebSocketManager(overflow="block")